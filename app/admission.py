@@ -0,0 +1,185 @@
+"""
+    Admission control: per-endpoint concurrency limits with a bounded wait queue.
+
+    ADMISSION_LIMITS (e.g. "future-value=64,required-rate=64") caps the
+    requests in flight per endpoint path; GET and POST share the limit.
+    Requests over the limit wait in FIFO order for at most
+    ADMISSION_QUEUE_TIMEOUT_SECONDS. A request is shed with
+    ADMISSION_REJECT_STATUS and a Retry-After header, without waiting, when the
+    queue already holds ADMISSION_QUEUE_SIZE requests or when its expected wait
+    (queue position / limit x recent service time) would miss the deadline;
+    otherwise when the deadline passes while it waits. Shedding early keeps
+    the latency of admitted requests bounded under overload instead of
+    letting every request queue behind the backlog.
+
+    Limits and queue sizes are totals for the server: with WEB_CONCURRENCY
+    worker processes each worker enforces an even share, at least 1 (a queue
+    size of 0 stays 0).
+"""
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+from . import metrics
+from .config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Weight of the latest request in the service time moving average
+SERVICE_TIME_ALPHA = 0.1
+
+_REJECT_BODY = b'{"detail":"Server is overloaded, retry later"}'
+
+
+def parse_limits(spec: str) -> dict[str, int]:
+    limits = {}
+    for item in spec.split(","):
+        if "=" in item:
+            endpoint, limit = item.split("=", 1)
+            if int(limit) > 0:
+                limits[endpoint.strip().strip("/")] = int(limit)
+    return limits
+
+
+def worker_share(total: int) -> int:
+    """One worker process's share of a server-wide limit; at least 1 unless the limit is 0."""
+    if total <= 0:
+        return 0
+    return max(1, total // max(1, settings.WEB_CONCURRENCY))
+
+
+class _Route:
+    """Stands in for the route of a shed request, which never reaches the router."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+
+class AdmissionLimiter:
+    """Concurrency limit with a FIFO wait queue for one endpoint; used from a single event loop."""
+
+    def __init__(self, endpoint: str, limit: int, queue_size: int, timeout: float):
+        self.endpoint = endpoint
+        self.route = _Route("/" + endpoint)
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.in_flight = 0
+        # Moving average of the seconds a request holds a slot
+        self.service_time = 0.0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    def expected_wait(self, position: int) -> float:
+        """Seconds until a slot frees up for the request at `position` (1-based) in the queue."""
+        return position / self.limit * self.service_time
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.expected_wait(len(self._waiters) + 1)))
+
+    async def acquire(self) -> Optional[str]:
+        """Take a slot, waiting if needed; returns the shed reason when the request is rejected."""
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            metrics.admission_in_flight.set(self.in_flight, self.endpoint)
+            return None
+        if len(self._waiters) >= self.queue_size:
+            return "queue_full"
+        if self.expected_wait(len(self._waiters) + 1) > self.timeout:
+            return "deadline"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        metrics.admission_queue_depth.set(len(self._waiters), self.endpoint)
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over in the same loop iteration the timeout fired
+                return None
+            self._discard(waiter)
+            return "timeout"
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the client went away
+                self.release(None)
+            else:
+                self._discard(waiter)
+            raise
+        return None
+
+    def release(self, seconds: Optional[float]) -> None:
+        """Free a slot, handing it straight to the longest-waiting request if there is one."""
+        if seconds is not None:
+            self.service_time += SERVICE_TIME_ALPHA * (seconds - self.service_time)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                metrics.admission_queue_depth.set(len(self._waiters), self.endpoint)
+                return
+        self.in_flight -= 1
+        metrics.admission_in_flight.set(self.in_flight, self.endpoint)
+        metrics.admission_queue_depth.set(0, self.endpoint)
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        metrics.admission_queue_depth.set(len(self._waiters), self.endpoint)
+
+
+def admission_enabled() -> bool:
+    return bool(parse_limits(settings.ADMISSION_LIMITS))
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware applying the configured per-endpoint limits."""
+
+    def __init__(self, app: Any):
+        self.app = app
+        self.limiters = {
+            "/" + endpoint: AdmissionLimiter(
+                endpoint,
+                worker_share(limit),
+                worker_share(settings.ADMISSION_QUEUE_SIZE),
+                settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+            )
+            for endpoint, limit in parse_limits(settings.ADMISSION_LIMITS).items()
+        }
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        limiter = self.limiters.get(scope["path"]) if scope["type"] == "http" else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        reason = await limiter.acquire()
+        if reason is not None:
+            metrics.admission_shed.inc(limiter.endpoint, reason)
+            # Label the rejection with its route in the request metrics
+            scope.setdefault("route", limiter.route)
+            await self._reject(send, limiter.retry_after())
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.perf_counter() - started)
+
+    @staticmethod
+    async def _reject(send: Callable, retry_after: int) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": settings.ADMISSION_REJECT_STATUS,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(_REJECT_BODY)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": _REJECT_BODY})
@@ -0,0 +1,147 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Hashable, Optional, Protocol, TypeVar
+
+from .config.settings import settings
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    size: int = 0
+    max_size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4)}
+
+
+class Cache(Protocol):
+    """Interface for pluggable cache backends."""
+
+    def get(self, key: Hashable, default: Any = None) -> Any: ...
+
+    def set(self, key: Hashable, value: Any) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> CacheStats: ...
+
+
+class LRUCache:
+    """Thread-safe LRU cache with an optional per-entry TTL.
+
+    ttl_seconds <= 0 disables expiry. Expired entries are dropped lazily on lookup.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float = 0, clock: Callable[[], float] = time.monotonic):
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than 0")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats(max_size=max_size)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at and expires_at <= self._clock():
+                del self._entries[key]
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = self._clock() + self.ttl_seconds if self.ttl_seconds > 0 else 0.0
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(**{**asdict(self._stats), "size": len(self._entries)})
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def canonicalize(value: Any) -> Any:
+    """Normalize a numeric argument so equal inputs share a cache key.
+
+    Integral floats become ints (10000.0 -> 10000) and -0.0 becomes 0.
+    """
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def cache_key(*args: Any) -> tuple:
+    return tuple(canonicalize(arg) for arg in args)
+
+
+def memoize(cache: Optional[Cache]) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Cache a pure function's results by its canonicalized positional arguments.
+
+    Passing cache=None returns the function unchanged. Exceptions are not cached.
+    """
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        if cache is None:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args: Any) -> T:
+            key = cache_key(*args)
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(*args)
+                cache.set(key, value)
+            return value
+
+        wrapper.cache = cache  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+# Registry of the named caches in use, exposed through /cache/stats
+caches: dict[str, Cache] = {}
+
+
+def get_cache(name: str) -> Optional[Cache]:
+    """Return the named cache from settings, or None when caching is disabled."""
+    if not settings.CACHE_ENABLED:
+        return None
+    if name not in caches:
+        caches[name] = LRUCache(settings.CACHE_MAX_SIZE, settings.CACHE_TTL_SECONDS)
+    return caches[name]
@@ -0,0 +1,289 @@
+"""
+    Bulk calculation from the command line: cli-calculator (or python -m app.cli)
+
+    cli-calculator future-value scenarios.csv -o results.csv
+    cli-calculator required-rate scenarios.ndjson --workers 8 > rates.ndjson
+
+    Input is read in blocks of whole lines (--chunk-bytes), so memory stays
+    bounded however large the file is. Blocks are parsed and evaluated with the
+    vectorized batch functions on a pool of worker processes, a few blocks per
+    worker in flight at a time, and the results are written in input order.
+    Output rows are identified by their 1-based input line number; blank lines
+    are skipped.
+"""
+import argparse
+import contextlib
+import functools
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Callable, ContextManager, Iterator, NamedTuple, Optional, Sequence, TextIO
+
+from .services import BatchResult, calculate_future_value_batch, calculate_required_rate_batch
+from .streaming import FUTURE_VALUE_COLUMNS, REQUIRED_RATE_COLUMNS, Row, csv_row_parser, parse_ndjson_row
+
+# Blocks of about 25k rows: large enough to amortize a vectorized pass and the
+# hand-off to a worker, small enough to keep every worker busy
+DEFAULT_CHUNK_BYTES = 1 << 20
+# Blocks queued or running per worker; bounds memory while hiding hand-off latency
+IN_FLIGHT_PER_WORKER = 2
+
+FORMATS = ("csv", "ndjson")
+SUFFIX_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+class Calculation(NamedTuple):
+    columns: tuple[str, ...]
+    field: str
+    batch: Callable[..., BatchResult]
+
+
+CALCULATIONS = {
+    "future-value": Calculation(FUTURE_VALUE_COLUMNS, "future_value", calculate_future_value_batch),
+    "required-rate": Calculation(REQUIRED_RATE_COLUMNS, "rate", calculate_required_rate_batch),
+}
+
+
+class Chunk(NamedTuple):
+    """A block of whole input lines; `line` is the line number of its first line."""
+    line: int
+    data: bytes
+
+
+class ChunkResult(NamedTuple):
+    output: bytes
+    rows: int
+    errors: int
+    size: int
+
+
+def read_chunks(stream: BinaryIO, chunk_bytes: int, line: int = 1) -> Iterator[Chunk]:
+    """Split a byte stream into blocks of about chunk_bytes that end on a line boundary."""
+    pending = b""
+    while True:
+        block = stream.read(chunk_bytes)
+        if not block:
+            break
+        block = pending + block if pending else block
+        cut = block.rfind(b"\n") + 1
+        if cut == 0:
+            # No line ends in this block yet
+            pending = block
+            continue
+        data, pending = block[:cut], block[cut:]
+        yield Chunk(line, data)
+        line += data.count(b"\n")
+    if pending:
+        yield Chunk(line, pending)
+
+
+@functools.lru_cache(maxsize=None)
+def _row_parser(calculation: str, fmt: str, header: Optional[bytes]) -> Callable[[bytes], Row]:
+    columns = CALCULATIONS[calculation].columns
+    if fmt == "csv":
+        return csv_row_parser(header or b"", columns)
+    return functools.partial(parse_ndjson_row, columns=columns)
+
+
+def _format_csv(line: int, field: str, value: Optional[float], error: Optional[str]) -> str:
+    if error is not None:
+        return f'{line},,"{error.replace(chr(34), chr(34) * 2)}"\n'
+    return f"{line},{value!r},\n"
+
+
+def _format_ndjson(line: int, field: str, value: Optional[float], error: Optional[str]) -> str:
+    if error is not None:
+        return f'{{"line":{line},"error":{json.dumps(error)}}}\n'
+    # repr of a finite float is valid JSON
+    return f'{{"line":{line},"{field}":{value!r}}}\n'
+
+
+def csv_header(calculation: str) -> bytes:
+    return f"line,{CALCULATIONS[calculation].field},error\n".encode()
+
+
+def process_chunk(calculation: str, input_format: str, output_format: str, header: Optional[bytes], chunk: Chunk) -> ChunkResult:
+    """Parse, evaluate and format one block of input lines.
+
+    Runs in a worker process, so it only takes picklable arguments.
+    """
+    spec = CALCULATIONS[calculation]
+    parse = _row_parser(calculation, input_format, header)
+    columns: list[list] = [[], [], [], []]
+    # (line number, batch row), or (line number, parse error)
+    entries: list[tuple[int, object]] = []
+    for number, line in enumerate(chunk.data.split(b"\n"), chunk.line):
+        if not line.strip():
+            continue
+        try:
+            parsed = parse(line.rstrip(b"\r"))
+        except (ValueError, OverflowError) as e:
+            entries.append((number, f"Invalid row: {e}"))
+            continue
+        entries.append((number, len(columns[0])))
+        for column, value in zip(columns, parsed):
+            column.append(value)
+
+    result = spec.batch(*columns) if columns[0] else BatchResult([], {})
+    write = _format_csv if output_format == "csv" else _format_ndjson
+    out = []
+    errors = 0
+    for number, entry in entries:
+        if isinstance(entry, str):
+            error: Optional[str] = entry
+            value = None
+        else:
+            error = result.errors.get(entry)  # type: ignore[call-overload]
+            value = result.values[entry]  # type: ignore[index]
+        errors += error is not None
+        out.append(write(number, spec.field, value, error))
+    return ChunkResult("".join(out).encode(), len(entries), errors, len(chunk.data))
+
+
+class Progress:
+    """Rows, row errors and throughput so far; redrawn on `stream` at most every `interval` seconds."""
+
+    def __init__(self, stream: Optional[TextIO] = None, interval: float = 0.5):
+        self.stream = stream
+        self.interval = interval
+        self.started = time.perf_counter()
+        self._next_report = self.started + interval
+        self.rows = self.errors = self.bytes = 0
+
+    def update(self, result: ChunkResult) -> None:
+        self.rows += result.rows
+        self.errors += result.errors
+        self.bytes += result.size
+        if self.stream is not None and time.perf_counter() >= self._next_report:
+            self.stream.write(f"\r{self.status()}")
+            self.stream.flush()
+            self._next_report = time.perf_counter() + self.interval
+
+    def status(self) -> str:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return (
+            f"{self.rows:,} rows ({self.errors:,} errors) in {elapsed:.1f}s: "
+            f"{self.rows / elapsed:,.0f} rows/s, {self.bytes / elapsed / (1 << 20):.1f} MiB/s"
+        )
+
+
+def calculate_file(
+    calculation: str,
+    source: BinaryIO,
+    sink: BinaryIO,
+    input_format: str,
+    output_format: str,
+    workers: int,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    progress: Optional[Progress] = None,
+) -> Progress:
+    """Evaluate every row of `source` and write the results to `sink` in input order.
+
+    workers=0 evaluates the blocks in this process.
+    """
+    progress = progress or Progress()
+    header = None
+    first_line = 1
+    if input_format == "csv":
+        header = source.readline().rstrip(b"\r\n")
+        if not header.strip():
+            raise ValueError("Invalid input: CSV input is empty")
+        # Fail on a bad header here rather than in every worker
+        _row_parser(calculation, input_format, header)
+        first_line = 2
+    if output_format == "csv":
+        sink.write(csv_header(calculation))
+
+    def emit(result: ChunkResult) -> None:
+        sink.write(result.output)
+        progress.update(result)
+
+    chunks = read_chunks(source, chunk_bytes, first_line)
+    task = functools.partial(process_chunk, calculation, input_format, output_format, header)
+    if workers == 0:
+        for chunk in chunks:
+            emit(task(chunk))
+        return progress
+
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    pending: deque[Future] = deque()
+    try:
+        for chunk in chunks:
+            pending.append(pool.submit(task, chunk))
+            if len(pending) >= IN_FLIGHT_PER_WORKER * workers:
+                emit(pending.popleft().result())
+        while pending:
+            emit(pending.popleft().result())
+    finally:
+        pool.shutdown(cancel_futures=True)
+    return progress
+
+
+def default_workers() -> int:
+    from .server import available_cpus
+
+    return max(1, math.floor(available_cpus()))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cli-calculator",
+        description="Evaluate a CSV or NDJSON file of scenarios across all available CPUs.",
+    )
+    parser.add_argument("calculation", choices=sorted(CALCULATIONS), help="columns P,R,N,T (future-value) or FV,P,N,T (required-rate)")
+    parser.add_argument("input", help="scenario file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="results file (default: stdout)")
+    parser.add_argument("-f", "--format", choices=FORMATS, help="input format (default: from the file extension)")
+    parser.add_argument("--output-format", choices=FORMATS, help="output format (default: the input format)")
+    parser.add_argument("-w", "--workers", type=int, help="worker processes; 0 runs in this process (default: available CPUs)")
+    parser.add_argument("--chunk-bytes", type=int, default=DEFAULT_CHUNK_BYTES, help="input bytes per work unit (default: %(default)s)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not report progress and throughput on stderr")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    input_format = args.format or SUFFIX_FORMATS.get(Path(args.input).suffix.lower())
+    if input_format is None:
+        parser.error("cannot tell the input format from the file name; pass --format")
+    if args.workers is not None and args.workers < 0:
+        parser.error("--workers must be 0 or more")
+    if args.chunk_bytes <= 0:
+        parser.error("--chunk-bytes must be positive")
+    workers = default_workers() if args.workers is None else args.workers
+
+    live = not args.quiet and sys.stderr.isatty()
+    progress = Progress(sys.stderr if live else None)
+    try:
+        with _open(args.input, "rb", sys.stdin.buffer) as source, _open(args.output, "wb", sys.stdout.buffer) as sink:
+            calculate_file(
+                args.calculation, source, sink, input_format, args.output_format or input_format,
+                workers, args.chunk_bytes, progress,
+            )
+    except (OSError, ValueError) as e:
+        if isinstance(e, BrokenPipeError):
+            # Output closed early (e.g. piped into head); keep the exit flush quiet
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
+        parser.exit(1, f"{parser.prog}: error: {e}\n")
+    if not args.quiet:
+        sys.stderr.write(("\r" if live else "") + progress.status() + "\n")
+    return 0
+
+
+def _open(path: str, mode: str, standard: BinaryIO) -> ContextManager[BinaryIO]:
+    """Open `path`, or wrap the standard stream for "-" without closing it."""
+    if path == "-":
+        return contextlib.nullcontext(standard)
+    return open(path, mode)  # type: ignore[return-value]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
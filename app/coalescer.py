@@ -0,0 +1,93 @@
+"""
+    Request coalescing: evaluate concurrent scalar calculations as one batch.
+
+    Calls with identical (canonicalized) arguments that are still pending or
+    running share one future (singleflight). Distinct calls arriving within
+    COALESCE_WINDOW_SECONDS of the first pending one, up to COALESCE_MAX_BATCH,
+    are evaluated together with a single vectorized batch function call on
+    the compute executor.
+"""
+import asyncio
+import logging
+from typing import Any, Callable, Optional
+
+from . import metrics
+from .cache import cache_key
+from .config.settings import settings
+from .executor import run_compute
+from .services import BatchResult
+
+logger = logging.getLogger(__name__)
+
+
+class Coalescer:
+    """Coalesces submit() calls into calls of `batch_func(*columns) -> BatchResult`.
+
+    Bound to the event loop of the first pending call; the server runs one
+    loop per worker process.
+    """
+
+    def __init__(self, name: str, batch_func: Callable[..., BatchResult]):
+        self.name = name
+        self.batch_func = batch_func
+        # Calls not yet dispatched, and every call whose result is not yet delivered
+        self._pending: dict[tuple, asyncio.Future] = {}
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def submit(self, *args: Any) -> Any:
+        """Return batch_func's value for this row, or raise ValueError with its row error."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # State left by another (e.g. closed) loop can never complete here
+            self._pending, self._inflight, self._timer, self._loop = {}, {}, None, loop
+
+        key = cache_key(*args)
+        future = self._inflight.get(key)
+        if future is not None:
+            metrics.coalesced_requests.inc(self.name, "shared")
+            # shield: a cancelled caller must not cancel the result others are waiting on
+            return await asyncio.shield(future)
+
+        future = loop.create_future()
+        self._inflight[key] = future
+        self._pending[key] = future
+        metrics.coalesced_requests.inc(self.name, "batched")
+        if len(self._pending) >= settings.COALESCE_MAX_BATCH:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(settings.COALESCE_WINDOW_SECONDS, self._dispatch)
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[tuple, asyncio.Future]) -> None:
+        metrics.coalesced_batch_size.observe(len(batch), self.name)
+        try:
+            result = await run_compute(self.batch_func, *zip(*batch))
+        except Exception as e:
+            logger.error("Coalesced %s batch of %d rows failed: %s", self.name, len(batch), e)
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for i, future in enumerate(batch.values()):
+                if future.done():
+                    continue
+                if i in result.errors:
+                    future.set_exception(ValueError(result.errors[i]))
+                else:
+                    future.set_result(result.values[i])
+        finally:
+            for key in batch:
+                self._inflight.pop(key, None)
@@ -1,8 +1,16 @@
+import atexit
+import functools
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
+import random
 from pathlib import Path
 from datetime import datetime
+from typing import IO, Optional
+
+from .settings import settings
 
 """
     Custom formatter that includes microseconds.
@@ -22,13 +30,54 @@ class MirosecondFormatter(logging.Formatter):
             t = datetime(*ct[:6])
             return t.strftime('%Y-%m-%d %H:%M:%S.%f')
 
+# Log slot of this process and the lock file that holds it, kept open for the process lifetime
+_slot: Optional[int] = None
+_slot_lock: Optional[IO] = None
+
+"""
+    Lowest log slot not held by another live process.
+    A slot is claimed with an exclusive lock on <log_dir>/.slot-<n>.lock, which
+    the OS releases when the process exits, so a recycled worker's replacement
+    takes over its files instead of starting new ones. Without flock (Windows)
+    the process id is used.
+"""
+def worker_slot(log_dir: Path) -> int:
+    global _slot, _slot_lock
+    if _slot is not None:
+        return _slot
+    try:
+        import fcntl
+    except ImportError:
+        return os.getpid()
+    slot = 0
+    while True:
+        lock = open(log_dir / f".slot-{slot}.lock", "w")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            slot += 1
+            continue
+        _slot, _slot_lock = slot, lock
+        return slot
+
+"""
+    Log file path; per-worker names (app.<slot>.log) keep multiple
+    workers from writing to and rotating the same file, and stay the same
+    when workers are recycled, so backupCount still caps the files kept.
+"""
+def log_file(log_dir: Path, name: str) -> Path:
+    if settings.LOG_FILE_PER_PROCESS:
+        return log_dir / f"{name}.{worker_slot(log_dir)}.log"
+    return log_dir / f"{name}.log"
+
 """
 Get logging configuration based on environment.
 """
 def get_logging_config(environments: str = "development") -> dict:
     # Create logs directory if it doesn't exist
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+    log_dir = Path(settings.LOGS_DIR)
+    log_dir.mkdir(parents=True, exist_ok=True)
 
     if environments == "production":
         return {
@@ -52,7 +101,7 @@ def get_logging_config(environments: str = "development") -> dict:
                 },
                 'file': {
                     'class': 'logging.handlers.RotatingFileHandler',
-                    'filename': log_dir / 'app.log',
+                    'filename': log_file(log_dir, 'app'),
                     'maxBytes': 10485760, # 10MB
                     'backupCount': 5,
                     'level': 'INFO',
@@ -60,7 +109,7 @@ def get_logging_config(environments: str = "development") -> dict:
                 },
                 'error_file': {
                     'class': 'logging.handlers.RotatingFileHandler',
-                    'filename': log_dir / 'error.log',
+                    'filename': log_file(log_dir, 'error'),
                     'maxBytes': 10485760, # 10MB
                     'backupCount': 5,
                     'level': 'ERROR',
@@ -71,7 +120,7 @@ def get_logging_config(environments: str = "development") -> dict:
                 'app': {
                     'handlers': ['console', 'file', 'error_file'],
                     'level': 'INFO',
-                    'propogate': False
+                    'propagate': False
                 }
             },
             'root': {
@@ -103,7 +152,7 @@ def get_logging_config(environments: str = "development") -> dict:
                 },
                 'file': {
                     'class': 'logging.handlers.RotatingFileHandler',
-                    'filename': log_dir / 'app.log',
+                    'filename': log_file(log_dir, 'app'),
                     'maxBytes': 10485760, # 10MB
                     'level': 'DEBUG',
                     'formatter': 'detailed'
@@ -113,7 +162,7 @@ def get_logging_config(environments: str = "development") -> dict:
                 'app': {
                     'handlers': ['console', 'file'],
                     'level': 'DEBUG',
-                    'propogate': False
+                    'propagate': False
                 }
             },
             'root': {
@@ -122,20 +171,73 @@ def get_logging_config(environments: str = "development") -> dict:
             }
         }
 
+# Listeners draining the log queues, stopped (and flushed) at exit
+_listeners: list[logging.handlers.QueueListener] = []
+
+"""
+    Move the configured handlers of each logger behind a queue.
+    The request thread only enqueues records; formatting and file I/O
+    (including rotation) run on a background listener thread per logger.
+"""
+def install_queue_handlers(loggers: list[logging.Logger]) -> list[logging.handlers.QueueListener]:
+    started = []
+    for logger in loggers:
+        handlers = list(logger.handlers)
+        if not handlers:
+            continue
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        listener.start()
+        started.append(listener)
+    _listeners.extend(started)
+    return started
+
+def stop_queue_listeners() -> None:
+    while _listeners:
+        _listeners.pop().stop()
+
+atexit.register(stop_queue_listeners)
+
+"""
+    Parse per-endpoint sampling rates, e.g. "future-value=0.1,required-rate=0.5".
+"""
+@functools.lru_cache(maxsize=8)
+def parse_sample_rates(spec: str) -> dict[str, float]:
+    rates = {}
+    for item in spec.split(","):
+        if "=" in item:
+            key, rate = item.split("=", 1)
+            rates[key.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+"""
+    Decide whether to emit the success-path info logs for one request to `endpoint`.
+    Endpoints without a configured rate are always logged; error logs are never sampled.
+"""
+def sample_success_log(endpoint: str) -> bool:
+    rate = parse_sample_rates(settings.LOG_SAMPLE_RATES).get(endpoint, 1.0)
+    return rate >= 1.0 or random.random() < rate
+
 """
     Setup logging configuration.
 """
-def setup_logging(environment: str = None):
+def setup_logging(environment: Optional[str] = None):
     if environment is None:
         environment = os.getenv('ENVIRONMENT', 'development')
     
+    # Drain and stop listeners from a previous setup before dictConfig closes their handlers
+    stop_queue_listeners()
     config = get_logging_config(environment)
     logging.config.dictConfig(config)
 
+    if settings.LOG_QUEUE_ENABLED:
+        install_queue_handlers([logging.getLogger('app'), logging.getLogger()])
+
     #Get logger for this module
     logger = logging.getLogger(__name__)
-    
-    # Use print for setup message to avoid formatter issues
-    print(f"Logging configured for {environment} environment")
+    logger.info("Logging configured for %s environment", environment)
 
     return logger
\ No newline at end of file
@@ -7,14 +7,112 @@ class Settings:
 
     # Logging
     LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'DEBUG' if ENVIRONMENT == 'development' else 'INFO')
+    # Hand log records to a background thread instead of writing them on the request path
+    LOG_QUEUE_ENABLED: bool = os.getenv('LOG_QUEUE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    # Fraction of successful requests whose info logs are kept, per endpoint,
+    # e.g. "future-value=0.1,required-rate=0.5"; unlisted endpoints log every request
+    LOG_SAMPLE_RATES: str = os.getenv('LOG_SAMPLE_RATES', '')
+    # Suffix log file names with a worker slot (0, 1, ...) that a recycled worker's replacement
+    # reuses; set by app.server for multi-worker runs
+    LOG_FILE_PER_PROCESS: bool = os.getenv('LOG_FILE_PER_PROCESS', 'false').lower() in ('1', 'true', 'yes')
+
+    # Production server (python -m app.server)
+    HOST: str = os.getenv('HOST', '0.0.0.0')
+    PORT: int = int(os.getenv('PORT', '8000'))
+    # Worker processes; 0 sizes the pool from the CPU quota / affinity
+    WEB_CONCURRENCY: int = int(os.getenv('WEB_CONCURRENCY', '0'))
+    # Recycle a worker after this many requests (0 disables), staggered by up to the jitter
+    WORKER_MAX_REQUESTS: int = int(os.getenv('WORKER_MAX_REQUESTS', '50000'))
+    WORKER_MAX_REQUESTS_JITTER: int = int(os.getenv('WORKER_MAX_REQUESTS_JITTER', '5000'))
+    # Longer than the usual 60s load balancer idle timeout so the proxy closes first
+    KEEP_ALIVE_TIMEOUT: int = int(os.getenv('KEEP_ALIVE_TIMEOUT', '65'))
+    BACKLOG: int = int(os.getenv('BACKLOG', '2048'))
+    ACCESS_LOG: bool = os.getenv('ACCESS_LOG', 'false').lower() in ('1', 'true', 'yes')
 
     # API Settings
     API_TITLE: str = "Compound Interest Calculator"
     API_DESCRIPTION: str = "Calculate the future value of an investment or the required interest rate to reach a future value"
 
+    # Request handling
+    # Artificial delay for /future-value, awaited with asyncio.sleep; 0 disables it
+    FUTURE_VALUE_DELAY_SECONDS: float = float(os.getenv('FUTURE_VALUE_DELAY_SECONDS', '0'))
+    # Threads used for batch calculations; scalar calculations always run inline
+    COMPUTE_EXECUTOR_WORKERS: int = int(os.getenv('COMPUTE_EXECUTOR_WORKERS', str(min(4, os.cpu_count() or 1))))
+    # Rows evaluated per vectorized pass by the streaming endpoints
+    STREAM_CHUNK_ROWS: int = int(os.getenv('STREAM_CHUNK_ROWS', '10000'))
+    # Longest input line the streaming endpoints buffer; longer lines become row errors
+    STREAM_MAX_LINE_BYTES: int = int(os.getenv('STREAM_MAX_LINE_BYTES', '65536'))
+    # Largest page of /future-value/schedule points
+    SCHEDULE_MAX_POINTS: int = int(os.getenv('SCHEDULE_MAX_POINTS', '10000'))
+
+    # Coalesce concurrent float-precision /future-value and /required-rate calls:
+    # identical in-flight calls share one result, distinct ones arriving within
+    # the window (up to the max batch) are evaluated as one vectorized batch
+    COALESCE_ENABLED: bool = os.getenv('COALESCE_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    COALESCE_WINDOW_SECONDS: float = float(os.getenv('COALESCE_WINDOW_SECONDS', '0.001'))
+    COALESCE_MAX_BATCH: int = int(os.getenv('COALESCE_MAX_BATCH', '256'))
+
+    # Largest number of cells (product of the axis lengths) of /future-value/grid
+    GRID_MAX_CELLS: int = int(os.getenv('GRID_MAX_CELLS', '1000000'))
+
+    # Variable-rate schedules (/rate-schedules, /future-value/variable-rate)
+    RATE_SCHEDULE_MAX_SEGMENTS: int = int(os.getenv('RATE_SCHEDULE_MAX_SEGMENTS', '1200'))
+    RATE_SCHEDULE_MAX_HORIZONS: int = int(os.getenv('RATE_SCHEDULE_MAX_HORIZONS', '10000'))
+    # Built schedule indexes kept per process by ID (least recently used are dropped first and
+    # rebuilt from the ID when used again), whether or not CACHE_ENABLED
+    RATE_SCHEDULE_CACHE_SIZE: int = int(os.getenv('RATE_SCHEDULE_CACHE_SIZE', '1024'))
+
+    # Monte Carlo simulation (/future-value/simulate)
+    # Worker processes for large simulations; 0 keeps every simulation on the compute threads,
+    # -1 shares the available CPUs among the server's worker processes (WEB_CONCURRENCY)
+    SIMULATION_WORKERS: int = int(os.getenv('SIMULATION_WORKERS', '-1'))
+    # Paths per chunk; every chunk draws from its own child seed, so results do not depend on the worker count
+    SIMULATION_CHUNK_PATHS: int = int(os.getenv('SIMULATION_CHUNK_PATHS', '10000'))
+    # Simulations with fewer paths run on the compute threads instead of the process pool
+    SIMULATION_PARALLEL_MIN_PATHS: int = int(os.getenv('SIMULATION_PARALLEL_MIN_PATHS', '100000'))
+    SIMULATION_MAX_PATHS: int = int(os.getenv('SIMULATION_MAX_PATHS', '1000000'))
+    # Largest number of compounding periods (N * T) per path; daily over 100 years by default
+    SIMULATION_MAX_PERIODS: int = int(os.getenv('SIMULATION_MAX_PERIODS', '36500'))
+    # No new chunks are started after this long, and running chunks are abandoned
+    # between period blocks; the response reports the paths completed
+    SIMULATION_TIME_BUDGET_SECONDS: float = float(os.getenv('SIMULATION_TIME_BUDGET_SECONDS', '10'))
+
+    # Per-request profiling: cProfile stats and phase timings written to LOGS_DIR/profiles.
+    # The middleware is only installed when a sample rate or token is set
+    PROFILE_SAMPLE_RATE: float = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+    # Requests sending "X-Profile: <token>" are always profiled; empty disables the header
+    PROFILE_TOKEN: str = os.getenv('PROFILE_TOKEN', '')
+
+    # Admission control: "endpoint=limit,..." caps the requests in flight per endpoint path
+    # (e.g. "future-value=64,required-rate=64"); empty leaves the layer uninstalled.
+    # Limits and the queue size are server-wide, split evenly across WEB_CONCURRENCY workers
+    ADMISSION_LIMITS: str = os.getenv('ADMISSION_LIMITS', '')
+    # Requests over the limit wait in a FIFO queue of this size, for at most the timeout;
+    # the rest are rejected at once with the reject status (503, or 429) and Retry-After
+    ADMISSION_QUEUE_SIZE: int = int(os.getenv('ADMISSION_QUEUE_SIZE', '128'))
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv('ADMISSION_QUEUE_TIMEOUT_SECONDS', '0.5'))
+    ADMISSION_REJECT_STATUS: int = int(os.getenv('ADMISSION_REJECT_STATUS', '503'))
+
+    # Cache-Control max-age of GET /future-value and /required-rate responses; results
+    # are pure functions of the query, so shared caches may keep them for a long time
+    HTTP_CACHE_MAX_AGE_SECONDS: int = int(os.getenv('HTTP_CACHE_MAX_AGE_SECONDS', '31536000'))
+
+    # Memoization of /future-value and /required-rate results
+    CACHE_ENABLED: bool = os.getenv('CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    CACHE_MAX_SIZE: int = int(os.getenv('CACHE_MAX_SIZE', '10000'))
+    CACHE_TTL_SECONDS: float = float(os.getenv('CACHE_TTL_SECONDS', '3600'))
+
+    # Precomputed growth factors for common (R, N, T) combinations, built at startup
+    GROWTH_INDEX_ENABLED: bool = os.getenv('GROWTH_INDEX_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    # JSON file written by GrowthFactorIndex.save(); when set, the grid below is ignored
+    GROWTH_INDEX_FILE: str = os.getenv('GROWTH_INDEX_FILE', '')
+    GROWTH_INDEX_RATES: str = os.getenv('GROWTH_INDEX_RATES', '0.0025:0.2:0.0025')
+    GROWTH_INDEX_PERIODS: str = os.getenv('GROWTH_INDEX_PERIODS', '1,2,4,12,52,365')
+    GROWTH_INDEX_TERMS: str = os.getenv('GROWTH_INDEX_TERMS', '1:50')
+
     # File paths
     BASE_DIR: Path = Path(__file__).parent.parent.parent
-    LOGS_DIR: Path = BASE_DIR / "logs"
+    LOGS_DIR: Path = Path(os.getenv('LOGS_DIR', str(BASE_DIR / "logs")))
 
 # Global settings instance
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,77 @@
+import asyncio
+import functools
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from .config.settings import settings
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> Optional[ThreadPoolExecutor]:
+    """Return the shared compute executor, or None when COMPUTE_EXECUTOR_WORKERS is 0."""
+    global _executor
+    if settings.COMPUTE_EXECUTOR_WORKERS <= 0:
+        return None
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.COMPUTE_EXECUTOR_WORKERS,
+            thread_name_prefix="compute",
+        )
+    return _executor
+
+
+async def run_compute(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a calculation on the bounded compute executor without blocking the event loop.
+
+    Falls back to calling func inline when the executor is disabled.
+    """
+    executor = get_executor()
+    if executor is None:
+        return func(*args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+def simulation_workers() -> int:
+    """SIMULATION_WORKERS, or by default this server worker's share of the available CPUs.
+
+    Every server worker process has its own pool, so sizing each one to all
+    CPUs would start about CPUs squared simulation processes.
+    """
+    if settings.SIMULATION_WORKERS >= 0:
+        return settings.SIMULATION_WORKERS
+    from .server import available_cpus
+
+    return max(1, math.floor(available_cpus() / max(1, settings.WEB_CONCURRENCY)))
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the shared simulation process pool, or None when SIMULATION_WORKERS is 0."""
+    global _process_pool
+    workers = simulation_workers()
+    if workers <= 0:
+        return None
+    if _process_pool is None:
+        # spawn rather than fork: the server process runs threads (compute
+        # executor, log listeners) that must not be copied mid-operation
+        _process_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+def shutdown_executor() -> None:
+    global _executor, _process_pool
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=True, cancel_futures=True)
+        _process_pool = None
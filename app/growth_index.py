@@ -0,0 +1,106 @@
+import bisect
+import json
+import logging
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from .config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Grid rates are quantized to this many decimal places
+RATE_DECIMALS = 6
+
+
+def parse_grid(spec: str, cast: type = float) -> list:
+    """Parse 'start:stop:step' (inclusive), 'start:stop' (step 1) or 'a,b,c' into values."""
+    if ":" not in spec:
+        return [cast(value) for value in spec.split(",") if value.strip()]
+    parts = [float(part) for part in spec.split(":")]
+    start, stop = parts[0], parts[1]
+    step = parts[2] if len(parts) > 2 else 1.0
+    count = int(round((stop - start) / step)) + 1
+    values = [start + i * step for i in range(count)]
+    if cast is float:
+        return [round(value, RATE_DECIMALS) for value in values]
+    return [cast(round(value)) for value in values]
+
+
+class GrowthFactorIndex:
+    """Precomputed growth factors (1 + R/N) ** (N*T) for a grid of (R, N, T).
+
+    Grid rates are quantized to RATE_DECIMALS when the index is built, so a
+    request hits the table only when its R is exactly a grid rate. The stored
+    factor is computed with the same expression as calculate_future_value,
+    which keeps P * factor bit-identical to the direct formula.
+    """
+
+    def __init__(self, entries: Iterable[tuple[float, int, int, float]]):
+        # (R, N, T) -> factor; read directly by calculate_future_value
+        self.factors: dict[tuple[float, int, int], float] = {}
+        by_term: dict[tuple[int, int], list[tuple[float, float]]] = {}
+        for R, N, T, factor in entries:
+            self.factors[(R, N, T)] = factor
+            by_term.setdefault((N, T), []).append((factor, R))
+        # Per (N, T), factors sorted ascending (growth is monotonic in R) for bisection
+        self._sorted: dict[tuple[int, int], tuple[list[float], list[float]]] = {}
+        for key, pairs in by_term.items():
+            pairs.sort()
+            self._sorted[key] = ([f for f, _ in pairs], [r for _, r in pairs])
+
+    @classmethod
+    def build(cls, rates: Iterable[float], periods: Iterable[int], terms: Iterable[int]) -> "GrowthFactorIndex":
+        rates = [round(R, RATE_DECIMALS) for R in rates]
+        periods, terms = list(periods), list(terms)
+        return cls((R, N, T, (1 + R / N) ** (N * T)) for R in rates for N in periods for T in terms)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "GrowthFactorIndex":
+        """Load an index written by save(): a JSON list of [R, N, T, factor] rows."""
+        with open(path) as f:
+            return cls((float(R), int(N), int(T), float(factor)) for R, N, T, factor in json.load(f))
+
+    def save(self, path: Union[str, Path]) -> None:
+        with open(path, "w") as f:
+            json.dump([[R, N, T, factor] for (R, N, T), factor in self.factors.items()], f)
+
+    def __len__(self) -> int:
+        return len(self.factors)
+
+    def growth_factor(self, R: float, N: int, T: int) -> Optional[float]:
+        """Return the stored factor for an exact grid hit, otherwise None."""
+        return self.factors.get((R, N, T))
+
+    def nearest_rate(self, growth: float, N: int, T: int) -> Optional[float]:
+        """Binary-search the grid for the rate whose growth factor is closest to `growth`.
+
+        Returns None when (N, T) is not on the grid. Intended as a starting
+        guess for solvers, not as an exact answer.
+        """
+        table = self._sorted.get((N, T))
+        if table is None:
+            return None
+        factors, rates = table
+        i = bisect.bisect_left(factors, growth)
+        if i == 0:
+            return rates[0]
+        if i == len(factors):
+            return rates[-1]
+        return rates[i] if factors[i] - growth < growth - factors[i - 1] else rates[i - 1]
+
+
+def load_growth_index() -> Optional[GrowthFactorIndex]:
+    """Build or load the growth-factor index configured in settings."""
+    if not settings.GROWTH_INDEX_ENABLED:
+        return None
+    if settings.GROWTH_INDEX_FILE:
+        index = GrowthFactorIndex.load(settings.GROWTH_INDEX_FILE)
+        logger.info("Loaded growth-factor index with %d entries from %s", len(index), settings.GROWTH_INDEX_FILE)
+        return index
+    index = GrowthFactorIndex.build(
+        parse_grid(settings.GROWTH_INDEX_RATES, float),
+        parse_grid(settings.GROWTH_INDEX_PERIODS, int),
+        parse_grid(settings.GROWTH_INDEX_TERMS, int),
+    )
+    logger.info("Built growth-factor index with %d entries", len(index))
+    return index
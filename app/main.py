@@ -1,30 +1,83 @@
+"""
+    Application factory.
+
+    Importing this module has no side effects: FastAPI, the routers and numpy
+    are imported when the app is created, and logging (including creating the
+    logs directory) is configured in the lifespan startup hook.
+
+    uvicorn app.main:app               # module attribute, built on first access
+    uvicorn --factory app.main:create_app
+"""
 import logging
-from fastapi import FastAPI, Request
-from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
-from .routers import router
-from .config.logging_config import setup_logging
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
 from .config.settings import settings
 
-# Setup logging base on environment
-setup_logging(settings.ENVIRONMENT)
+if TYPE_CHECKING:
+    from fastapi import FastAPI
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(
-    title=settings.API_TITLE, 
-    description=settings.API_DESCRIPTION
-)
-
-# Add validation error handler
-@app.exception_handler(RequestValidationError)
-async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    """Convert 422 validation errors to 400 Bad Request."""
-    logger.error(f"Validation error: {exc.errors()}")
-    return JSONResponse(
-        status_code=400,
-        content={"detail": "Invalid input data", "errors": exc.errors()}
+
+@asynccontextmanager
+async def lifespan(app: "FastAPI") -> AsyncIterator[None]:
+    from .config.logging_config import setup_logging
+    from .executor import shutdown_executor
+    from .growth_index import load_growth_index
+    from .services import set_growth_index
+
+    # Setup logging base on environment
+    setup_logging(settings.ENVIRONMENT)
+    set_growth_index(load_growth_index())
+    yield
+    shutdown_executor()
+    set_growth_index(None)
+
+
+def create_app() -> "FastAPI":
+    from fastapi import FastAPI, Request
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.exceptions import RequestValidationError
+    from fastapi.responses import JSONResponse
+
+    from .admission import AdmissionMiddleware, admission_enabled
+    from .metrics import MetricsMiddleware, route_label, validation_failures
+    from .profiling import ProfilingMiddleware, profiling_enabled
+    from .routers import router
+
+    app = FastAPI(
+        title=settings.API_TITLE,
+        description=settings.API_DESCRIPTION,
+        lifespan=lifespan
     )
 
+    if admission_enabled():
+        # Inside the metrics middleware, so request latencies include the queue wait
+        app.add_middleware(AdmissionMiddleware)
+    app.add_middleware(MetricsMiddleware)
+    if profiling_enabled():
+        # Outermost, so the profile and the total cover the whole request
+        app.add_middleware(ProfilingMiddleware)
+
+    # Add validation error handler
+    @app.exception_handler(RequestValidationError)
+    async def validation_exception_handler(request: Request, exc: RequestValidationError):
+        """Convert 422 validation errors to 400 Bad Request."""
+        validation_failures.inc(route_label(request.scope))
+        logger.error("Validation error: %s", exc.errors())
+        return JSONResponse(
+            status_code=400,
+            content={"detail": "Invalid input data", "errors": jsonable_encoder(exc.errors())}
+        )
+
+    app.include_router(router)
+    return app
+
 
-app.include_router(router)
\ No newline at end of file
+def __getattr__(name: str) -> Any:
+    # Build the module-level `app` lazily so `import app.main` stays cheap
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,218 @@
+import bisect
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from .config.settings import settings
+
+# Latency buckets in seconds (upper bounds); +Inf is implicit
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _with_label(sample: str, label: str) -> str:
+    """Add a label to one sample line; comment lines are returned unchanged."""
+    if sample.startswith("#"):
+        return sample
+    # Metric names contain neither braces nor spaces, so the first of them ends the name
+    brace, space = sample.find("{"), sample.index(" ")
+    if 0 <= brace < space:
+        return f"{sample[:brace + 1]}{label},{sample[brace + 1:]}"
+    return f"{sample[:space]}{{{label}}}{sample[space:]}"
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(f"{self.name}{_labels(self.labelnames, labels)} {value:g}" for labels, value in items)
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(f"{self.name}{_labels(self.labelnames, labels)} {value:g}" for labels, value in items)
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (non-cumulative, last is +Inf), sum]
+        self._series: dict[LabelValues, list[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][i] += 1
+            series[1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                bucket_labels = _labels(self.labelnames, labels, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {total:.9g}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: list[Any] = []
+
+    def register(self, metric: Any) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        if settings.WEB_CONCURRENCY > 1:
+            # Every worker process keeps its own metrics and a scrape reaches one
+            # of them; the worker label keeps their series apart
+            label = f'worker="{os.getpid()}"'
+            lines = [_with_label(line, label) for line in lines]
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route and status code", ("method", "route", "status")
+))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route")
+))
+validation_failures = registry.register(Counter(
+    "validation_failures_total", "Requests rejected by input validation (400)", ("route",)
+))
+service_errors = registry.register(Counter(
+    "service_errors_total", "Requests whose calculation raised an error", ("route",)
+))
+coalesced_requests = registry.register(Counter(
+    "coalesced_requests_total",
+    "Requests through the coalescer: shared an in-flight result, or joined a batch",
+    ("endpoint", "outcome"),
+))
+coalesced_batch_size = registry.register(Histogram(
+    "coalesced_batch_size", "Distinct rows per coalesced batch", ("endpoint",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024),
+))
+admission_in_flight = registry.register(Gauge(
+    "admission_in_flight", "Requests admitted and not yet finished, per limited endpoint", ("endpoint",)
+))
+admission_queue_depth = registry.register(Gauge(
+    "admission_queue_depth", "Requests waiting for an admission slot, per limited endpoint", ("endpoint",)
+))
+admission_shed = registry.register(Counter(
+    "admission_shed_total",
+    "Requests rejected by admission control: queue full, expected wait past the deadline, or timed out waiting",
+    ("endpoint", "reason"),
+))
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def route_label(scope: dict) -> str:
+    """Route template for a request (e.g. '/future-value'); 'unmatched' when no route handled it."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware that times every HTTP request with a monotonic clock."""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status: Optional[int] = None
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = route_label(scope)
+            http_request_duration.observe(time.perf_counter() - started, scope["method"], route)
+            http_requests.inc(scope["method"], route, str(status or 500))
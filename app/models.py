@@ -1,19 +1,248 @@
-from pydantic import BaseModel, Field
+from typing import Annotated, Literal, Optional, Union
+
+from pydantic import BaseModel, Field, model_validator
+
+from .config.settings import settings
+
+# "float" is the fast binary floating-point path; "decimal" computes with exact
+# decimal arithmetic and rounds half-up, for cent-exact reporting
+Precision = Literal["float", "decimal"]
 
 class FutureValueRequest(BaseModel):
     P: float = Field(..., gt=0, description="Principal amount")
     R: float = Field(..., gt=0, description="Annual interest rate (decimal)")
     N: int = Field(..., gt=0,description="Compounding periods per year")
     T: int = Field(..., gt=0, description="Total time in years")
+    precision: Precision = Field("float", description="Arithmetic mode: float (fast) or decimal (cent-exact)")
 
 class FutureValueResponse(BaseModel):
     message: str = Field(..., description="Message indicating the future value")
 
+class FutureValueResult(BaseModel):
+    future_value: float = Field(..., description="Future value, rounded to cents")
+    inputs: FutureValueRequest = Field(..., description="The request inputs")
+
 class RequiredRateRequest(BaseModel):
     FV: float = Field(..., gt=0, description="Future value")
     P: float = Field(..., gt=0, description="Principal amount")
     N: int = Field(..., gt=0, description="Compounding periods per year")
     T: int = Field(..., gt=0, description="Total time in years")
+    precision: Precision = Field("float", description="Arithmetic mode: float (fast) or decimal (exact, 6 places)")
 
 class RequiredRateResponse(BaseModel):
-    message: str = Field(..., description="Message indicating the required interest rate")
\ No newline at end of file
+    message: str = Field(..., description="Message indicating the required interest rate")
+
+class RequiredRateResult(BaseModel):
+    rate: float = Field(..., description="Required annual interest rate (decimal, 6 places)")
+    inputs: RequiredRateRequest = Field(..., description="The request inputs")
+
+SolveFor = Literal["FV", "P", "R", "T", "PMT"]
+
+class GoalSeekRequest(BaseModel):
+    solve_for: SolveFor = Field(..., description="Variable to solve for; its own value is ignored")
+    FV: Optional[float] = Field(None, gt=0, description="Future value")
+    P: Optional[float] = Field(None, gt=0, description="Principal amount")
+    R: Optional[float] = Field(None, ge=0, description="Annual interest rate (decimal)")
+    N: int = Field(..., gt=0, description="Compounding periods per year")
+    T: Optional[float] = Field(None, gt=0, description="Total time in years")
+    PMT: float = Field(0, ge=0, description="Contribution added at the end of every compounding period")
+
+    @model_validator(mode="after")
+    def check_inputs(self) -> "GoalSeekRequest":
+        missing = [name for name in ("FV", "P", "R", "T") if name != self.solve_for and getattr(self, name) is None]
+        if missing:
+            raise ValueError(f"{', '.join(missing)} must be provided when solving for {self.solve_for}")
+        return self
+
+class GoalSeekResponse(BaseModel):
+    solve_for: SolveFor = Field(..., description="Variable that was solved for")
+    value: float = Field(..., description="Solved value (R and T to 6 decimal places, amounts to cents)")
+    status: str = Field(..., description="closed_form, converged or not_converged")
+    iterations: int = Field(..., description="Newton iterations used, 0 for closed-form solutions")
+
+class BatchRowError(BaseModel):
+    index: int = Field(..., description="Zero-based row index in the request arrays")
+    detail: str = Field(..., description="Why the row could not be calculated")
+
+class FutureValueBatchRequest(BaseModel):
+    P: list[float] = Field(..., description="Principal amounts")
+    R: list[float] = Field(..., description="Annual interest rates (decimal)")
+    N: list[int] = Field(..., description="Compounding periods per year")
+    T: list[int] = Field(..., description="Total times in years")
+
+    @model_validator(mode="after")
+    def check_lengths(self) -> "FutureValueBatchRequest":
+        if not len(self.P) == len(self.R) == len(self.N) == len(self.T):
+            raise ValueError("P, R, N, and T must have the same length")
+        return self
+
+class FutureValueBatchResponse(BaseModel):
+    future_values: list[Optional[float]] = Field(..., description="Future value per row, null for rows listed in errors")
+    errors: list[BatchRowError] = Field(default_factory=list, description="Rows that could not be calculated")
+
+class RequiredRateBatchRequest(BaseModel):
+    FV: list[float] = Field(..., description="Future values")
+    P: list[float] = Field(..., description="Principal amounts")
+    N: list[int] = Field(..., description="Compounding periods per year")
+    T: list[int] = Field(..., description="Total times in years")
+
+    @model_validator(mode="after")
+    def check_lengths(self) -> "RequiredRateBatchRequest":
+        if not len(self.FV) == len(self.P) == len(self.N) == len(self.T):
+            raise ValueError("FV, P, N, and T must have the same length")
+        return self
+
+class RequiredRateBatchResponse(BaseModel):
+    required_rates: list[Optional[float]] = Field(..., description="Required interest rate per row, null for rows listed in errors")
+    errors: list[BatchRowError] = Field(default_factory=list, description="Rows that could not be calculated")
+
+class SimulationRequest(BaseModel):
+    P: float = Field(..., gt=0, description="Principal amount")
+    R: float = Field(..., ge=0, description="Mean annual interest rate (decimal)")
+    volatility: float = Field(..., ge=0, description="Annual standard deviation of the interest rate (decimal)")
+    N: int = Field(..., gt=0, description="Compounding periods per year")
+    T: int = Field(..., gt=0, description="Total time in years")
+    PMT: float = Field(0, ge=0, description="Contribution added at the end of every compounding period")
+    paths: int = Field(10000, gt=0, le=settings.SIMULATION_MAX_PATHS, description="Number of simulated paths")
+    seed: Optional[int] = Field(None, ge=0, description="Random seed; the same seed and inputs give the same result")
+    percentiles: list[float] = Field([10, 50, 90], min_length=1, description="Percentiles (0-100) of the outcome to report")
+
+    @model_validator(mode="after")
+    def check_inputs(self) -> "SimulationRequest":
+        if not all(0 <= q <= 100 for q in self.percentiles):
+            raise ValueError("percentiles must be between 0 and 100")
+        if self.N * self.T > settings.SIMULATION_MAX_PERIODS:
+            raise ValueError(f"N * T is {self.N * self.T} periods; at most {settings.SIMULATION_MAX_PERIODS} are allowed")
+        return self
+
+class PercentileValue(BaseModel):
+    percentile: float = Field(..., description="Percentile (0-100)")
+    value: float = Field(..., description="Future value at that percentile")
+
+class SimulationResponse(BaseModel):
+    paths: int = Field(..., description="Number of paths simulated")
+    truncated: bool = Field(..., description="True when the time budget ran out before all requested paths were simulated")
+    seed: int = Field(..., description="Seed used; pass it back to reproduce the result")
+    percentiles: list[PercentileValue] = Field(..., description="Requested percentiles of the future value")
+    mean: float = Field(..., description="Mean future value")
+    minimum: float = Field(..., description="Smallest simulated future value")
+    maximum: float = Field(..., description="Largest simulated future value")
+
+class BalanceScheduleRequest(FutureValueRequest):
+    offset: int = Field(0, ge=0, description="First compounding period to return (0 is the principal)")
+    limit: int = Field(1000, gt=0, le=settings.SCHEDULE_MAX_POINTS, description="Maximum number of points to return")
+    stride: int = Field(1, gt=0, description="Return every stride-th period")
+
+class BalanceScheduleResponse(BaseModel):
+    periods: list[int] = Field(..., description="Compounding period of each balance")
+    balances: list[float] = Field(..., description="Balance after each listed period")
+    total_periods: int = Field(..., description="Number of compounding periods in the term (N * T)")
+    next_offset: Optional[int] = Field(None, description="offset for the next page, null on the last page")
+
+
+class GoalSeekBatchRequest(BaseModel):
+    solve_for: SolveFor = Field(..., description="Variable to solve for in every row; omit its column")
+    FV: Optional[list[float]] = Field(None, description="Future values")
+    P: Optional[list[float]] = Field(None, description="Principal amounts")
+    R: Optional[list[float]] = Field(None, description="Annual interest rates (decimal)")
+    N: list[int] = Field(..., description="Compounding periods per year")
+    T: Optional[list[float]] = Field(None, description="Total times in years")
+    PMT: Optional[list[float]] = Field(None, description="Per-period contributions, 0 when omitted")
+
+    @model_validator(mode="after")
+    def check_columns(self) -> "GoalSeekBatchRequest":
+        columns = {name: getattr(self, name) for name in ("FV", "P", "R", "N", "T", "PMT") if name != self.solve_for}
+        missing = [name for name, col in columns.items() if col is None and name != "PMT"]
+        if missing:
+            raise ValueError(f"{', '.join(missing)} must be provided when solving for {self.solve_for}")
+        if len({len(col) for col in columns.values() if col is not None}) > 1:
+            raise ValueError(f"{', '.join(columns)} must have the same length")
+        return self
+
+class GoalSeekBatchResponse(BaseModel):
+    solve_for: SolveFor = Field(..., description="Variable that was solved for")
+    values: list[Optional[float]] = Field(..., description="Solved value per row, null for rows listed in errors")
+    status: list[str] = Field(..., description="Per-row status: closed_form, converged, not_converged, no_solution or invalid")
+    iterations: list[int] = Field(..., description="Newton iterations used per row, 0 for closed-form solutions")
+    errors: list[BatchRowError] = Field(default_factory=list, description="Rows that could not be solved")
+
+class GridRange(BaseModel):
+    start: float = Field(..., description="First value")
+    stop: float = Field(..., description="Last value (inclusive)")
+    num: int = Field(..., gt=0, le=settings.GRID_MAX_CELLS, description="Number of evenly spaced values")
+
+# A single value, an explicit list of values, or an evenly spaced range
+GridAxis = Union[float, Annotated[list[float], Field(min_length=1)], GridRange]
+
+def axis_length(axis: GridAxis) -> int:
+    if isinstance(axis, GridRange):
+        return axis.num
+    return len(axis) if isinstance(axis, list) else 1
+
+class FutureValueGridRequest(BaseModel):
+    P: GridAxis = Field(..., description="Principal amount(s)")
+    R: GridAxis = Field(..., description="Annual interest rate(s) (decimal)")
+    N: GridAxis = Field(..., description="Compounding periods per year (whole numbers)")
+    T: GridAxis = Field(..., description="Total time(s) in years (whole numbers)")
+    sensitivities: bool = Field(False, description="Also return dFV/dR and dFV/dT for every cell")
+    encoding: Literal["json", "base64"] = Field(
+        "json", description="json: nested lists; base64: little-endian values of dtype in row-major order"
+    )
+    dtype: Literal["float64", "float32"] = Field("float64", description="Element type of base64 arrays; float32 halves the size")
+
+    @model_validator(mode="after")
+    def check_cells(self) -> "FutureValueGridRequest":
+        cells = axis_length(self.P) * axis_length(self.R) * axis_length(self.N) * axis_length(self.T)
+        if cells > settings.GRID_MAX_CELLS:
+            raise ValueError(f"grid has {cells} cells; at most {settings.GRID_MAX_CELLS} are allowed")
+        return self
+
+class FutureValueGridResponse(BaseModel):
+    dims: list[str] = Field(..., description="Inputs given as lists or ranges, in P, R, N, T order; the grid's dimensions")
+    shape: list[int] = Field(..., description="Length of each dimension")
+    axes: dict[str, list[float]] = Field(..., description="Values of every input")
+    encoding: Literal["json", "base64"] = Field(..., description="Encoding of the grid arrays")
+    dtype: Literal["float64", "float32"] = Field(..., description="Element type of base64 arrays")
+    future_value: Union[list, str] = Field(..., description="Future value of every cell, rounded to cents")
+    dFV_dR: Optional[Union[list, str]] = Field(None, description="Sensitivity to the rate, when requested")
+    dFV_dT: Optional[Union[list, str]] = Field(None, description="Sensitivity to the term, when requested")
+    overflow_cells: int = Field(..., description="Cells whose future value is not finite (null in json)")
+
+class RateSegment(BaseModel):
+    rate: float = Field(..., ge=0, description="Annual interest rate (decimal) for this segment")
+    years: float = Field(..., gt=0, description="Length of the segment in years")
+
+class RateScheduleRequest(BaseModel):
+    segments: list[RateSegment] = Field(
+        ..., min_length=1, max_length=settings.RATE_SCHEDULE_MAX_SEGMENTS, description="Consecutive rate segments, starting at year 0"
+    )
+    compounding: Union[Literal["continuous"], Annotated[int, Field(gt=0)]] = Field(
+        ..., description="Compounding periods per year, or continuous"
+    )
+
+class RateScheduleResponse(BaseModel):
+    schedule_id: str = Field(..., description="ID to pass as schedule_id; it encodes the schedule, so equal schedules get the same ID")
+    segments: int = Field(..., description="Number of segments")
+    term: float = Field(..., description="Total length of the schedule in years")
+    growth: float = Field(..., description="Growth factor over the whole term")
+
+class VariableRateRequest(BaseModel):
+    P: float = Field(..., gt=0, description="Principal amount")
+    schedule_id: Optional[str] = Field(None, description="ID returned by /rate-schedules")
+    schedule: Optional[RateScheduleRequest] = Field(None, description="Inline schedule; it is registered too")
+    start: float = Field(0, ge=0, description="Time in years at which P is invested")
+    horizons: Optional[list[float]] = Field(
+        None, min_length=1, max_length=settings.RATE_SCHEDULE_MAX_HORIZONS, description="Times in years to value P at; the end of the schedule when omitted"
+    )
+
+    @model_validator(mode="after")
+    def check_schedule(self) -> "VariableRateRequest":
+        if (self.schedule_id is None) == (self.schedule is None):
+            raise ValueError("exactly one of schedule_id and schedule must be provided")
+        return self
+
+class VariableRateResponse(BaseModel):
+    schedule_id: str = Field(..., description="ID of the schedule used")
+    start: float = Field(..., description="Time in years at which P is invested")
+    horizons: list[float] = Field(..., description="Times in years the future values are given for")
+    future_values: list[float] = Field(..., description="Future value at each horizon, rounded to cents")
@@ -0,0 +1,180 @@
+"""
+    Opt-in per-request profiling.
+
+    A request is profiled when it sends "X-Profile: <PROFILE_TOKEN>" or is
+    picked by PROFILE_SAMPLE_RATE. Its cProfile stats are written to
+    LOGS_DIR/profiles/<time>-<pid>-<n>-<route>.prof (pstats format: python -m
+    pstats, snakeviz, ...), and its phase timings to a .json file of the same
+    name and a Server-Timing response header:
+
+    validation     body read, routing and request model validation
+    compute        the calculation (or the cached message lookup)
+    delay          FUTURE_VALUE_DELAY_SECONDS
+    logging        the endpoint's info logs
+    serialization  response model validation and rendering
+    total          until the response body was sent
+
+    The middleware is only installed when profiling is configured, and phase
+    markers cost one context variable lookup on requests that are not
+    profiled. cProfile sees the whole event loop thread, so work interleaved
+    from concurrent requests shows up too; one request per process is
+    profiled at a time.
+"""
+import asyncio
+import cProfile
+import hmac
+import itertools
+import json
+import logging
+import os
+import random
+import re
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Optional
+
+from .config.settings import settings
+from .metrics import route_label
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+
+class PhaseTimings:
+    """Seconds spent per phase of one profiled request, plus each phase's first start and last end."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.seconds: dict[str, float] = {}
+        self.spans: dict[str, list[float]] = {}
+
+    def add(self, name: str, start: float, end: float) -> None:
+        self.seconds[name] = self.seconds.get(name, 0.0) + end - start
+        span = self.spans.setdefault(name, [start, end])
+        span[1] = end
+
+    def summary(self, response_started: Optional[float], finished: float) -> dict[str, float]:
+        phases = dict(self.seconds)
+        if phases.pop("handler", None) is not None:
+            start, end = self.spans["handler"]
+            phases["validation"] = start - self.started
+            if response_started is not None:
+                phases["serialization"] = max(response_started - end, 0.0)
+        phases["total"] = finished - self.started
+        return {name: round(seconds * 1000, 3) for name, seconds in phases.items()}
+
+
+_timings: ContextVar[Optional[PhaseTimings]] = ContextVar("profile_timings", default=None)
+
+
+class _Phase:
+    __slots__ = ("name", "timings", "start")
+
+    def __init__(self, name: str, timings: PhaseTimings):
+        self.name = name
+        self.timings = timings
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.timings.add(self.name, self.start, time.perf_counter())
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(name: str) -> ContextManager[None]:
+    """Context manager adding the time spent in its block to `name` when the current request is profiled."""
+    timings = _timings.get()
+    return _NO_PHASE if timings is None else _Phase(name, timings)
+
+
+def profiling_enabled() -> bool:
+    return settings.PROFILE_SAMPLE_RATE > 0 or bool(settings.PROFILE_TOKEN)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles requests selected by header or sampling."""
+
+    def __init__(self, app: Any):
+        self.app = app
+        self._active = False
+        self._sequence = itertools.count(1)
+
+    def _selected(self, scope: dict) -> bool:
+        token = settings.PROFILE_TOKEN
+        if token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, token.encode())
+        return random.random() < settings.PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or self._active or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        timings = PhaseTimings()
+        response_started: Optional[float] = None
+
+        async def timed_send(message: dict) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = time.perf_counter()
+                server_timing = ", ".join(
+                    f"{name};dur={ms}" for name, ms in timings.summary(response_started, response_started).items()
+                    if name != "total"
+                )
+                message["headers"] = [*message.get("headers", []), (b"server-timing", server_timing.encode())]
+            await send(message)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger) owns the thread
+            await self.app(scope, receive, send)
+            return
+        self._active = True
+        token = _timings.set(timings)
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            profiler.disable()
+            _timings.reset(token)
+            self._active = False
+            phases = timings.summary(response_started, time.perf_counter())
+            name = self._file_name(scope)
+            await asyncio.get_running_loop().run_in_executor(None, write_profile, profiler, phases, scope, name)
+
+    def _file_name(self, scope: dict) -> str:
+        route = re.sub(r"[^A-Za-z0-9]+", "-", route_label(scope)).strip("-") or "root"
+        return f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{next(self._sequence)}-{route}"
+
+
+def write_profile(profiler: cProfile.Profile, phases: dict[str, float], scope: dict, name: str) -> Optional[Path]:
+    """Write the .prof and phase .json files; profiling never fails the request."""
+    directory = settings.LOGS_DIR / "profiles"
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(directory / f"{name}.prof")
+        record = {"method": scope["method"], "path": scope["path"], "route": route_label(scope), "phases_ms": phases}
+        (directory / f"{name}.json").write_text(json.dumps(record))
+    except OSError as e:
+        logger.error("Could not write request profile %s: %s", name, e)
+        return None
+    logger.info("Wrote request profile %s (%.3f ms)", directory / f"{name}.prof", phases["total"])
+    return directory / f"{name}.prof"
@@ -0,0 +1,136 @@
+"""
+    Structured (numeric) responses and the JSON encoder used to render them,
+    and HTTP caching helpers for the GET calculation routes.
+
+    Structured responses are plain dicts rendered straight to bytes by
+    FastJSONResponse, skipping FastAPI's response_model re-validation. orjson
+    is used when installed (pip install "cli-calculator[fast-json]"), otherwise
+    the standard library encoder with compact separators.
+"""
+import base64
+import hashlib
+import json
+from decimal import Decimal
+from typing import Any, Union
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from .cache import cache_key
+from .config.settings import settings
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+# Accept header value that selects the structured format on the legacy routes
+STRUCTURED_MEDIA_TYPE = "application/vnd.calculator.v2+json"
+
+
+def _encode_array(value: Any) -> Any:
+    # numpy arrays (grid responses); non-finite values become null, as with orjson
+    import numpy as np
+
+    if not isinstance(value, np.ndarray):
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    finite = np.isfinite(value)
+    return (value if finite.all() else np.where(finite, value, None)).tolist()
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_encode_array
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def wants_structured(request: Request) -> bool:
+    """True when the client asked for the structured format via the Accept header."""
+    return STRUCTURED_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+# Decimal results are emitted as JSON numbers: a value rounded to cents (or to 6
+# places for rates) with at most 15 significant digits converts to the float
+# whose shortest repr is exactly that decimal, so the text on the wire is exact
+
+def future_value_result(future_value: Union[float, Decimal], P: float, R: float, N: int, T: int, precision: str = "float") -> dict[str, Any]:
+    return {"future_value": float(future_value), "inputs": {"P": P, "R": R, "N": N, "T": T, "precision": precision}}
+
+
+def required_rate_result(rate: Union[float, Decimal], FV: float, P: float, N: int, T: int, precision: str = "float") -> dict[str, Any]:
+    return {"rate": float(rate), "inputs": {"FV": FV, "P": P, "N": N, "T": T, "precision": precision}}
+
+
+# Little-endian element types of base64-encoded grid arrays
+GRID_DTYPES = {"float64": "<f8", "float32": "<f4"}
+
+
+def encode_grid_array(values: Any, encoding: str, dtype: str = "float64") -> Any:
+    """A grid array as nested lists (rendered by dumps) or base64 of its little-endian values, row-major."""
+    if encoding == "base64":
+        return base64.b64encode(values.astype(GRID_DTYPES[dtype], copy=False).tobytes()).decode("ascii")
+    return values
+
+
+def grid_result(result: Any, dims: list[str], axes: dict[str, Any], encoding: str, dtype: str = "float64") -> dict[str, Any]:
+    """Response for a GridResult, with the grid's single-valued inputs dropped from its shape."""
+    import numpy as np
+
+    shape = [len(axes[name]) for name in dims]
+    content = {
+        "dims": dims,
+        "shape": shape,
+        "axes": axes,
+        "encoding": encoding,
+        "dtype": dtype,
+        "future_value": encode_grid_array(result.future_value.reshape(shape), encoding, dtype),
+        "overflow_cells": int(result.future_value.size - np.count_nonzero(np.isfinite(result.future_value))),
+    }
+    if result.dFV_dR is not None:
+        content["dFV_dR"] = encode_grid_array(result.dFV_dR.reshape(shape), encoding, dtype)
+        content["dFV_dT"] = encode_grid_array(result.dFV_dT.reshape(shape), encoding, dtype)
+    return content
+
+
+# Bump when a change to the formulas or response formats alters the body for the
+# same inputs, so cached responses are not revalidated as still current
+ETAG_VERSION = "1"
+
+
+def calculation_etag(*inputs: Any) -> str:
+    """Strong ETag of a calculation response, from its canonicalized inputs.
+
+    Equal inputs (10000 and 10000.0) share an ETag; include everything the body
+    depends on, such as the precision and the representation.
+    """
+    digest = hashlib.blake2b(repr((ETAG_VERSION, *cache_key(*inputs))).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match lists `etag` (weak comparison) or is "*"."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    """Validator and freshness headers for a response that never changes for its inputs."""
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.HTTP_CACHE_MAX_AGE_SECONDS}, immutable",
+        # The legacy routes switch representation on the Accept header
+        "Vary": "Accept",
+    }
@@ -1,15 +1,75 @@
+import asyncio
 import logging
 import time
-from fastapi import APIRouter, HTTPException
+from decimal import Decimal
+from typing import Annotated, Any, Callable, Union
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, Response
+from pydantic import BaseModel
+from .cache import LRUCache, cache_key, caches, get_cache, memoize
+from .coalescer import Coalescer
+from .config.logging_config import sample_success_log
+from .config.settings import settings
+from .executor import run_compute
+from .grid import GRID_AXES, calculate_future_value_grid, expand_axis
+from . import metrics
 from .models import (
+    BalanceScheduleRequest,
+    BalanceScheduleResponse,
+    BatchRowError,
+    FutureValueBatchRequest,
+    FutureValueBatchResponse,
+    FutureValueGridRequest,
+    FutureValueGridResponse,
     FutureValueRequest,
     FutureValueResponse,
+    FutureValueResult,
+    GoalSeekBatchRequest,
+    GoalSeekBatchResponse,
+    GoalSeekRequest,
+    GoalSeekResponse,
+    PercentileValue,
+    RateScheduleRequest,
+    RateScheduleResponse,
+    RequiredRateBatchRequest,
+    RequiredRateBatchResponse,
     RequiredRateRequest,
     RequiredRateResponse,
+    RequiredRateResult,
+    SimulationRequest,
+    SimulationResponse,
+    VariableRateRequest,
+    VariableRateResponse,
+)
+from .profiling import phase
+from .responses import (
+    STRUCTURED_MEDIA_TYPE,
+    FastJSONResponse,
+    cache_headers,
+    calculation_etag,
+    etag_matches,
+    future_value_result,
+    grid_result,
+    required_rate_result,
+    wants_structured,
 )
 from .services import (
+    calculate_balance_schedule,
+    calculate_balance_schedule_decimal,
     calculate_future_value,
+    calculate_future_value_batch,
+    calculate_future_value_decimal,
     calculate_required_rate,
+    calculate_required_rate_batch,
+    calculate_required_rate_decimal,
+    RateSchedule,
+)
+from .simulation import SimulationParams, run_simulation
+from .solver import solve, solve_batch
+from .streaming import (
+    STREAM_FORMATS,
+    FullDuplexStreamingResponse,
+    FutureValueStream,
 )
 
 # Get logger for this module
@@ -19,40 +79,493 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-@router.post("/future-value", response_model=FutureValueResponse)
-def future_value(request: FutureValueRequest) -> FutureValueResponse:
-    start_time = time.time()
-    logger.info(f"Received Future-value request: P={request.P}, R={request.R}, N={request.N}, T={request.T}")
+def future_value_amount(P: float, R: float, N: int, T: int, precision: str = "float") -> Union[float, Decimal]:
+    if precision == "decimal":
+        return calculate_future_value_decimal(P, R, N, T)
+    return calculate_future_value(P, R, N, T)
+
+def required_rate_amount(FV: float, P: float, N: int, T: int, precision: str = "float") -> Union[float, Decimal]:
+    if precision == "decimal":
+        return calculate_required_rate_decimal(FV, P, N, T)
+    return calculate_required_rate(FV, P, N, T)
+
+
+def format_future_value_message(future_value: Union[float, Decimal], P: float, R: float, N: int, T: int) -> str:
+    return f"Future Value of {round(future_value)} when starting with {round(P)} compounded at {R} interest rate, {N} times per year over {T} years"
+
+def format_required_rate_message(required_rate: Union[float, Decimal], FV: float, P: float, N: int, T: int) -> str:
+    return f"{round(required_rate * 100, 2)}% is the required interest rate to grow ${round(P)} to ${round(FV)} if compounding {N} times per year over {T} years."
+
+@memoize(get_cache("future_value"))
+def future_value_message(P: float, R: float, N: int, T: int, precision: str = "float") -> str:
+    return format_future_value_message(future_value_amount(P, R, N, T, precision), P, R, N, T)
+
+@memoize(get_cache("required_rate"))
+def required_rate_message(FV: float, P: float, N: int, T: int, precision: str = "float") -> str:
+    return format_required_rate_message(required_rate_amount(FV, P, N, T, precision), FV, P, N, T)
+
+
+# Concurrent float-precision calls are coalesced into batch calls when COALESCE_ENABLED
+future_value_coalescer = Coalescer("future-value", calculate_future_value_batch)
+required_rate_coalescer = Coalescer("required-rate", calculate_required_rate_batch)
+
+def coalesce(precision: str) -> bool:
+    return settings.COALESCE_ENABLED and precision == "float"
+
+async def coalesced_message(
+    memoized: Callable[..., str], coalescer: Coalescer, format_message: Callable[..., str], *args: Any
+) -> str:
+    """memoized(*args, "float"), with a cache miss computed through the coalescer."""
+    cache = getattr(memoized, "cache", None)
+    key = cache_key(*args, "float")
+    message = cache.get(key) if cache is not None else None
+    if message is None:
+        message = format_message(await coalescer.submit(*args), *args)
+        if cache is not None:
+            cache.set(key, message)
+    return message
+
 
+async def _future_value(request: FutureValueRequest, structured: bool, media_type: str) -> Union[FutureValueResponse, Response]:
+    start_time = time.perf_counter()
+    log_info = sample_success_log("future-value")
+    if log_info:
+        with phase("logging"):
+            logger.info("Received Future-value request: P=%s, R=%s, N=%s, T=%s", request.P, request.R, request.N, request.T)
+
+    try:
+        with phase("compute"):
+            if structured:
+                if coalesce(request.precision):
+                    amount = await future_value_coalescer.submit(request.P, request.R, request.N, request.T)
+                else:
+                    amount = future_value_amount(request.P, request.R, request.N, request.T, request.precision)
+                content = future_value_result(amount, request.P, request.R, request.N, request.T, request.precision)
+                response: Union[FutureValueResponse, Response] = FastJSONResponse(content, media_type=media_type)
+            else:
+                if coalesce(request.precision):
+                    message = await coalesced_message(
+                        future_value_message, future_value_coalescer, format_future_value_message,
+                        request.P, request.R, request.N, request.T,
+                    )
+                else:
+                    message = future_value_message(request.P, request.R, request.N, request.T, request.precision)
+                content = response = FutureValueResponse(message=message)
+        if settings.FUTURE_VALUE_DELAY_SECONDS > 0:
+            with phase("delay"):
+                await asyncio.sleep(settings.FUTURE_VALUE_DELAY_SECONDS)
+        if log_info:
+            with phase("logging"):
+                logger.info("Future-value calculation completed in %.4f seconds", time.perf_counter() - start_time)
+                logger.info("Future-value response: %s", content)
+        return response
+    except ValueError as e:
+        response_time = time.perf_counter() - start_time
+        metrics.service_errors.inc("/future-value")
+        logger.error("Future-value calculation failed after %.4f seconds: %s", response_time, e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _required_rate(request: RequiredRateRequest, structured: bool, media_type: str) -> Union[RequiredRateResponse, Response]:
+    start_time = time.perf_counter()
+    log_info = sample_success_log("required-rate")
+    if log_info:
+        with phase("logging"):
+            logger.info("Received Required-rate request: P=%s, FV=%s, N=%s, T=%s", request.P, request.FV, request.N, request.T)
+    
     try:
-        future_value = calculate_future_value(request.P, request.R, request.N, request.T)
-        response = FutureValueResponse(message=f"Future Value of {round(future_value)} when starting with {round(request.P)} compounded at {request.R} interest rate, {request.N} times per year over {request.T} years")
-        time.sleep(2)
-        response_time = time.time() - start_time
-        logger.info(f"Future-value calculation completed in {response_time:.4f} seconds")
+        with phase("compute"):
+            if structured:
+                if coalesce(request.precision):
+                    amount = await required_rate_coalescer.submit(request.FV, request.P, request.N, request.T)
+                else:
+                    amount = required_rate_amount(request.FV, request.P, request.N, request.T, request.precision)
+                content = required_rate_result(amount, request.FV, request.P, request.N, request.T, request.precision)
+                response: Union[RequiredRateResponse, Response] = FastJSONResponse(content, media_type=media_type)
+            else:
+                if coalesce(request.precision):
+                    message = await coalesced_message(
+                        required_rate_message, required_rate_coalescer, format_required_rate_message,
+                        request.FV, request.P, request.N, request.T,
+                    )
+                else:
+                    message = required_rate_message(request.FV, request.P, request.N, request.T, request.precision)
+                content = response = RequiredRateResponse(message=message)
 
-        logger.info(f"Future-value response: {response}")
+        if log_info:
+            with phase("logging"):
+                logger.info("Required-rate calculation completed in %.4f seconds", time.perf_counter() - start_time)
+                logger.info("Required-rate response: %s", content)
         return response
     except ValueError as e:
-        response_time = time.time() - start_time
-        logger.error(f"Future-value calculation failed after {response_time:.4f} seconds: {str(e)}")
+        response_time = time.perf_counter() - start_time
+        metrics.service_errors.inc("/required-rate")
+        logger.debug("Required-rate calculation failed after %.4f seconds: %s", response_time, e)
         raise HTTPException(status_code=400, detail=str(e))
 
+
+# Legacy routes return a human-readable message; clients that send
+# "Accept: application/vnd.calculator.v2+json" get the structured format instead.
+# The "handler" phase lets a profiled request split validation and serialization
+# time from the handler's own phases
+
+@router.post("/future-value", response_model=FutureValueResponse)
+async def future_value(request: FutureValueRequest, http_request: Request) -> Union[FutureValueResponse, Response]:
+    with phase("handler"):
+        return await _future_value(request, wants_structured(http_request), STRUCTURED_MEDIA_TYPE)
+
 @router.post("/required-rate", response_model=RequiredRateResponse)
-def required_rate(request: RequiredRateRequest) -> RequiredRateResponse:
-    start_time = time.time()
-    logger.info(f"Received Required-rate request: P={request.P}, FV={request.FV}, N={request.N}, T={request.T}")
-    
+async def required_rate(request: RequiredRateRequest, http_request: Request) -> Union[RequiredRateResponse, Response]:
+    with phase("handler"):
+        return await _required_rate(request, wants_structured(http_request), STRUCTURED_MEDIA_TYPE)
+
+
+# GET variants take the same inputs as query parameters. Their responses are
+# cacheable by shared caches, carry an ETag derived from the canonicalized inputs,
+# and a matching If-None-Match is answered with 304 before any calculation
+
+def with_cache_headers(result: Union[BaseModel, Response], response: Response, headers: dict[str, str]) -> Union[BaseModel, Response]:
+    (result if isinstance(result, Response) else response).headers.update(headers)
+    return result
+
+@router.get("/future-value", response_model=FutureValueResponse)
+async def future_value_get(
+    request: Annotated[FutureValueRequest, Query()], http_request: Request, response: Response
+) -> Union[FutureValueResponse, Response]:
+    structured = wants_structured(http_request)
+    headers = cache_headers(calculation_etag("future-value", structured, request.P, request.R, request.N, request.T, request.precision))
+    if etag_matches(http_request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    with phase("handler"):
+        result = await _future_value(request, structured, STRUCTURED_MEDIA_TYPE)
+    return with_cache_headers(result, response, headers)  # type: ignore[return-value]
+
+@router.get("/required-rate", response_model=RequiredRateResponse)
+async def required_rate_get(
+    request: Annotated[RequiredRateRequest, Query()], http_request: Request, response: Response
+) -> Union[RequiredRateResponse, Response]:
+    structured = wants_structured(http_request)
+    headers = cache_headers(calculation_etag("required-rate", structured, request.FV, request.P, request.N, request.T, request.precision))
+    if etag_matches(http_request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    with phase("handler"):
+        result = await _required_rate(request, structured, STRUCTURED_MEDIA_TYPE)
+    return with_cache_headers(result, response, headers)  # type: ignore[return-value]
+
+
+# v2 routes always return numeric fields, rendered directly (no response_model
+# re-validation) with the fast JSON encoder
+
+@router.post("/v2/future-value", response_model=FutureValueResult, response_class=FastJSONResponse)
+async def future_value_v2(request: FutureValueRequest) -> Union[FutureValueResponse, Response]:
+    with phase("handler"):
+        return await _future_value(request, True, "application/json")
+
+@router.post("/v2/required-rate", response_model=RequiredRateResult, response_class=FastJSONResponse)
+async def required_rate_v2(request: RequiredRateRequest) -> Union[RequiredRateResponse, Response]:
+    with phase("handler"):
+        return await _required_rate(request, True, "application/json")
+
+
+@router.post("/goal-seek", response_model=GoalSeekResponse)
+async def goal_seek(request: GoalSeekRequest) -> GoalSeekResponse:
+    start_time = time.perf_counter()
+    log_info = sample_success_log("goal-seek")
+    if log_info:
+        logger.info(
+            "Received Goal-seek request: solve_for=%s, FV=%s, P=%s, R=%s, N=%s, T=%s, PMT=%s",
+            request.solve_for, request.FV, request.P, request.R, request.N, request.T, request.PMT,
+        )
+
+    try:
+        solution = solve(request.solve_for, request.FV, request.P, request.R, request.N, request.T, request.PMT)
+        response = GoalSeekResponse(solve_for=request.solve_for, **solution._asdict())
+
+        if log_info:
+            logger.info("Goal-seek for %s completed in %.4f seconds (%s, %d iterations)", request.solve_for, time.perf_counter() - start_time, solution.status, solution.iterations)
+        return response
+    except ValueError as e:
+        response_time = time.perf_counter() - start_time
+        metrics.service_errors.inc("/goal-seek")
+        logger.error("Goal-seek for %s failed after %.4f seconds: %s", request.solve_for, response_time, e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/goal-seek/batch", response_model=GoalSeekBatchResponse)
+async def goal_seek_batch(request: GoalSeekBatchRequest) -> GoalSeekBatchResponse:
+    start_time = time.perf_counter()
+    log_info = sample_success_log("goal-seek/batch")
+    if log_info:
+        logger.info("Received Goal-seek batch request: solve_for=%s, rows=%d", request.solve_for, len(request.N))
+
+    try:
+        result = await run_compute(
+            solve_batch, request.solve_for,
+            FV=request.FV, P=request.P, R=request.R, N=request.N, T=request.T, PMT=request.PMT,
+        )
+        response = GoalSeekBatchResponse(
+            solve_for=request.solve_for,
+            values=result.values,
+            status=result.status,
+            iterations=result.iterations,
+            errors=[BatchRowError(index=i, detail=detail) for i, detail in result.errors.items()],
+        )
+
+        if log_info:
+            logger.info("Goal-seek batch of %d rows completed in %.4f seconds with %d unsolved rows", len(request.N), time.perf_counter() - start_time, len(result.errors))
+        return response
+    except ValueError as e:
+        response_time = time.perf_counter() - start_time
+        metrics.service_errors.inc("/goal-seek/batch")
+        logger.error("Goal-seek batch failed after %.4f seconds: %s", response_time, e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/cache/stats")
+async def cache_stats() -> dict:
+    return {
+        "enabled": settings.CACHE_ENABLED,
+        "caches": {name: cache.stats().as_dict() for name, cache in caches.items()},
+    }
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics() -> PlainTextResponse:
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@router.post("/future-value/batch", response_model=FutureValueBatchResponse)
+async def future_value_batch(request: FutureValueBatchRequest) -> FutureValueBatchResponse:
+    start_time = time.perf_counter()
+    log_info = sample_success_log("future-value/batch")
+    if log_info:
+        logger.info("Received Future-value batch request: rows=%d", len(request.P))
+
+    try:
+        result = await run_compute(calculate_future_value_batch, request.P, request.R, request.N, request.T)
+        response = FutureValueBatchResponse(
+            future_values=result.values,
+            errors=[BatchRowError(index=i, detail=detail) for i, detail in result.errors.items()],
+        )
+
+        if log_info:
+            logger.info("Future-value batch of %d rows completed in %.4f seconds with %d invalid rows", len(request.P), time.perf_counter() - start_time, len(result.errors))
+        return response
+    except ValueError as e:
+        response_time = time.perf_counter() - start_time
+        metrics.service_errors.inc("/future-value/batch")
+        logger.error("Future-value batch calculation failed after %.4f seconds: %s", response_time, e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/required-rate/batch", response_model=RequiredRateBatchResponse)
+async def required_rate_batch(request: RequiredRateBatchRequest) -> RequiredRateBatchResponse:
+    start_time = time.perf_counter()
+    log_info = sample_success_log("required-rate/batch")
+    if log_info:
+        logger.info("Received Required-rate batch request: rows=%d", len(request.FV))
+
+    try:
+        result = await run_compute(calculate_required_rate_batch, request.FV, request.P, request.N, request.T)
+        response = RequiredRateBatchResponse(
+            required_rates=result.values,
+            errors=[BatchRowError(index=i, detail=detail) for i, detail in result.errors.items()],
+        )
+
+        if log_info:
+            logger.info("Required-rate batch of %d rows completed in %.4f seconds with %d invalid rows", len(request.FV), time.perf_counter() - start_time, len(result.errors))
+        return response
+    except ValueError as e:
+        response_time = time.perf_counter() - start_time
+        metrics.service_errors.inc("/required-rate/batch")
+        logger.error("Required-rate batch calculation failed after %.4f seconds: %s", response_time, e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/future-value/stream", response_class=FullDuplexStreamingResponse)
+async def future_value_stream(request: Request) -> FullDuplexStreamingResponse:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    fmt = STREAM_FORMATS.get(content_type)
+    if fmt is None:
+        raise HTTPException(status_code=415, detail=f"Content-Type must be one of: {', '.join(STREAM_FORMATS)}")
+    if sample_success_log("future-value/stream"):
+        logger.info("Received Future-value stream request: format=%s", fmt)
+
+    try:
+        stream = await FutureValueStream(request.stream(), fmt, settings.STREAM_CHUNK_ROWS, settings.STREAM_MAX_LINE_BYTES).open()
+    except ValueError as e:
+        metrics.service_errors.inc("/future-value/stream")
+        logger.error("Future-value stream rejected: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    return FullDuplexStreamingResponse(stream, media_type=content_type)
+
+@router.post("/future-value/schedule", response_model=BalanceScheduleResponse)
+async def future_value_schedule(request: BalanceScheduleRequest) -> BalanceScheduleResponse:
+    start_time = time.perf_counter()
+    log_info = sample_success_log("future-value/schedule")
+    if log_info:
+        logger.info(
+            "Received Future-value schedule request: P=%s, R=%s, N=%s, T=%s, offset=%d, limit=%d, stride=%d",
+            request.P, request.R, request.N, request.T, request.offset, request.limit, request.stride,
+        )
+
     try:
-        required_rate = calculate_required_rate(request.FV, request.P, request.N, request.T)
-        response = RequiredRateResponse(message=f"{round(required_rate * 100, 2)}% is the required interest rate to grow ${round(request.P)} to ${round(request.FV)} if compounding {request.N} times per year over {request.T} years.")
+        schedule = await run_compute(
+            calculate_balance_schedule_decimal if request.precision == "decimal" else calculate_balance_schedule,
+            request.P, request.R, request.N, request.T,
+            offset=request.offset, limit=request.limit, stride=request.stride,
+        )
+        next_offset = request.offset + len(schedule.periods) * request.stride
+        response = BalanceScheduleResponse(
+            periods=schedule.periods,
+            balances=schedule.balances,
+            total_periods=schedule.total_periods,
+            next_offset=next_offset if next_offset <= schedule.total_periods else None,
+        )
 
-        response_time = time.time() - start_time
-        logger.info(f"Required-rate calculation completed in {response_time:.4f} seconds")
+        if log_info:
+            logger.info("Future-value schedule of %d points completed in %.4f seconds", len(schedule.periods), time.perf_counter() - start_time)
+        return response
+    except ValueError as e:
+        response_time = time.perf_counter() - start_time
+        metrics.service_errors.inc("/future-value/schedule")
+        logger.error("Future-value schedule failed after %.4f seconds: %s", response_time, e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/future-value/simulate", response_model=SimulationResponse)
+async def future_value_simulate(request: SimulationRequest) -> SimulationResponse:
+    start_time = time.perf_counter()
+    log_info = sample_success_log("future-value/simulate")
+    if log_info:
+        logger.info(
+            "Received Future-value simulation request: P=%s, R=%s, volatility=%s, N=%s, T=%s, PMT=%s, paths=%d, seed=%s",
+            request.P, request.R, request.volatility, request.N, request.T, request.PMT, request.paths, request.seed,
+        )
+
+    try:
+        params = SimulationParams(request.P, request.R, request.volatility, request.N, request.T, request.PMT)
+        result = await run_simulation(params, request.paths, request.seed, request.percentiles)
+        response = SimulationResponse(
+            paths=result.paths,
+            truncated=result.truncated,
+            seed=result.seed,
+            percentiles=[PercentileValue(percentile=q, value=v) for q, v in result.percentiles.items()],
+            mean=result.mean,
+            minimum=result.minimum,
+            maximum=result.maximum,
+        )
 
-        logger.info(f"Required-rate response: {response}")
+        if log_info:
+            elapsed = time.perf_counter() - start_time
+            logger.info("Future-value simulation of %d paths completed in %.4f seconds (%.0f paths/s)", result.paths, elapsed, result.paths / elapsed)
+        if result.truncated:
+            logger.warning("Future-value simulation stopped by the time budget after %d of %d paths", result.paths, request.paths)
         return response
     except ValueError as e:
-        response_time = time.time() - start_time
-        logger.debug(f"Required-rate calculation failed after {response_time:.4f} seconds: {str(e)}")
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        response_time = time.perf_counter() - start_time
+        metrics.service_errors.inc("/future-value/simulate")
+        logger.error("Future-value simulation failed after %.4f seconds: %s", response_time, e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def future_value_grid_response(request: FutureValueGridRequest) -> FastJSONResponse:
+    """Evaluate and render a grid; runs on the compute executor, rendering included."""
+    axes = {name: expand_axis(getattr(request, name)) for name in GRID_AXES}
+    result = calculate_future_value_grid(*axes.values(), sensitivities=request.sensitivities)
+    # Inputs sent as a list or range are dimensions, even with a single value
+    dims = [name for name in GRID_AXES if not isinstance(getattr(request, name), float)]
+    axes = {name: [float(v) for v in values] for name, values in axes.items()}
+    return FastJSONResponse(grid_result(result, dims, axes, request.encoding, request.dtype))
+
+@router.post("/future-value/grid", response_model=FutureValueGridResponse, response_class=FastJSONResponse)
+async def future_value_grid(request: FutureValueGridRequest) -> Response:
+    start_time = time.perf_counter()
+    log_info = sample_success_log("future-value/grid")
+    if log_info:
+        logger.info("Received Future-value grid request: sensitivities=%s, encoding=%s", request.sensitivities, request.encoding)
+
+    try:
+        response = await run_compute(future_value_grid_response, request)
+
+        if log_info:
+            logger.info("Future-value grid completed in %.4f seconds (%d bytes)", time.perf_counter() - start_time, len(response.body))
+        return response
+    except ValueError as e:
+        response_time = time.perf_counter() - start_time
+        metrics.service_errors.inc("/future-value/grid")
+        logger.error("Future-value grid failed after %.4f seconds: %s", response_time, e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# Built rate schedule indexes by ID. IDs encode the schedule, so any worker
+# rebuilds a schedule it has not seen (or has evicted) from the ID alone; the
+# cache only saves rebuilding the index, and is kept even when CACHE_ENABLED is off
+rate_schedules = caches["rate_schedules"] = LRUCache(settings.RATE_SCHEDULE_CACHE_SIZE)
+
+def register_rate_schedule(request: RateScheduleRequest) -> RateSchedule:
+    """Build a schedule's index, or reuse the registered copy of an equal schedule."""
+    schedule = RateSchedule(
+        [segment.rate for segment in request.segments],
+        [segment.years for segment in request.segments],
+        None if request.compounding == "continuous" else request.compounding,
+    )
+    registered = rate_schedules.get(schedule.id)
+    if registered is not None:
+        return registered
+    rate_schedules.set(schedule.id, schedule)
+    return schedule
+
+@router.post("/rate-schedules", response_model=RateScheduleResponse)
+async def create_rate_schedule(request: RateScheduleRequest) -> RateScheduleResponse:
+    start_time = time.perf_counter()
+    log_info = sample_success_log("rate-schedules")
+    if log_info:
+        logger.info("Received Rate-schedule request: segments=%d, compounding=%s", len(request.segments), request.compounding)
+
+    try:
+        schedule = register_rate_schedule(request)
+        response = RateScheduleResponse(
+            schedule_id=schedule.id,
+            segments=len(schedule.rates),
+            term=schedule.term,
+            growth=schedule.growth(0, schedule.term),
+        )
+
+        if log_info:
+            logger.info("Rate schedule %s registered in %.4f seconds", schedule.id, time.perf_counter() - start_time)
+        return response
+    except ValueError as e:
+        response_time = time.perf_counter() - start_time
+        metrics.service_errors.inc("/rate-schedules")
+        logger.error("Rate-schedule registration failed after %.4f seconds: %s", response_time, e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/future-value/variable-rate", response_model=VariableRateResponse)
+async def future_value_variable_rate(request: VariableRateRequest) -> VariableRateResponse:
+    start_time = time.perf_counter()
+    log_info = sample_success_log("future-value/variable-rate")
+    if log_info:
+        logger.info(
+            "Received Future-value variable-rate request: P=%s, schedule_id=%s, start=%s, horizons=%d",
+            request.P, request.schedule_id, request.start, len(request.horizons or ()),
+        )
+
+    try:
+        if request.schedule is not None:
+            schedule = register_rate_schedule(request.schedule)
+        else:
+            schedule = rate_schedules.get(request.schedule_id)
+            if schedule is None:
+                schedule = RateSchedule.from_id(request.schedule_id, settings.RATE_SCHEDULE_MAX_SEGMENTS)
+                rate_schedules.set(schedule.id, schedule)
+        horizons = request.horizons or [schedule.term]
+        future_values = await run_compute(schedule.future_values, request.P, request.start, horizons)
+        response = VariableRateResponse(
+            schedule_id=schedule.id, start=request.start, horizons=horizons, future_values=future_values
+        )
+
+        if log_info:
+            logger.info("Future-value variable-rate of %d horizons completed in %.4f seconds", len(horizons), time.perf_counter() - start_time)
+        return response
+    except ValueError as e:
+        response_time = time.perf_counter() - start_time
+        metrics.service_errors.inc("/future-value/variable-rate")
+        logger.error("Future-value variable-rate calculation failed after %.4f seconds: %s", response_time, e)
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,84 @@
+"""
+    Production server entry point: python -m app.server
+
+    Runs uvicorn with one worker process per available CPU (respecting cgroup
+    quotas and CPU affinity), worker recycling, and keep-alive/backlog tuned
+    from settings.
+"""
+import inspect
+import math
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+import uvicorn
+
+from .config.settings import settings
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def cgroup_cpu_quota(root: Path = CGROUP_ROOT) -> Optional[float]:
+    """CPU limit imposed by the container's cgroup, or None when unlimited."""
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        quota, period = (root / "cpu.max").read_text().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        # cgroup v1: quota is -1 when unlimited
+        quota = int((root / "cpu" / "cpu.cfs_quota_us").read_text())
+        period = int((root / "cpu" / "cpu.cfs_period_us").read_text())
+        return quota / period if quota > 0 and period > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus() -> float:
+    """CPUs this process may actually use: affinity mask capped by the cgroup quota."""
+    try:
+        cpus: float = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        cpus = os.cpu_count() or 1
+    quota = cgroup_cpu_quota()
+    return min(cpus, quota) if quota else cpus
+
+
+def worker_count() -> int:
+    """WEB_CONCURRENCY when set, otherwise one worker per whole available CPU."""
+    if settings.WEB_CONCURRENCY > 0:
+        return settings.WEB_CONCURRENCY
+    return max(1, math.floor(available_cpus()))
+
+
+def server_options() -> dict[str, Any]:
+    options: dict[str, Any] = {
+        "host": settings.HOST,
+        "port": settings.PORT,
+        "workers": worker_count(),
+        "backlog": settings.BACKLOG,
+        "timeout_keep_alive": settings.KEEP_ALIVE_TIMEOUT,
+        "limit_max_requests": settings.WORKER_MAX_REQUESTS or None,
+        "access_log": settings.ACCESS_LOG,
+        "proxy_headers": True,
+    }
+    # Jitter staggers recycling so workers do not all restart at once (newer uvicorn only)
+    if "limit_max_requests_jitter" in inspect.signature(uvicorn.Config).parameters:
+        options["limit_max_requests_jitter"] = settings.WORKER_MAX_REQUESTS_JITTER
+    return options
+
+
+def main() -> None:
+    options = server_options()
+    # Inherited by the worker processes, which size their simulation pools from it
+    os.environ["WEB_CONCURRENCY"] = str(options["workers"])
+    if options["workers"] > 1:
+        # Inherited by the worker processes: each writes its own log files
+        # (app.<slot>.log) instead of contending on (and rotating) the same ones
+        os.environ["LOG_FILE_PER_PROCESS"] = "true"
+    uvicorn.run("app.main:app", **options)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,53 @@
+from __future__ import annotations
+
+import array
+import base64
+import binascii
+import bisect
+import functools
+import itertools
+import math
+import struct
+import threading
+import zlib
+from decimal import ROUND_HALF_EVEN, ROUND_HALF_UP, Context, Decimal, DivisionByZero, InvalidOperation, Overflow, localcontext
+from typing import TYPE_CHECKING, NamedTuple, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .growth_index import GrowthFactorIndex
+
+# numpy is imported inside the vectorized functions so that importing this
+# module (and starting the app) does not pay for it until a batch is served
+
+# Precomputed growth factors keyed on (R, N, T), see set_growth_index
+_growth_factors: dict[tuple[float, int, int], float] = {}
+_growth_index: Optional["GrowthFactorIndex"] = None
+
+
+def set_growth_index(index: Optional["GrowthFactorIndex"]) -> None:
+    """Install (or remove, with None) the growth-factor index used for grid lookups."""
+    global _growth_factors, _growth_index
+    _growth_index = index
+    # Bind the plain dict so the hot path is a single dict lookup
+    _growth_factors = index.factors if index is not None else {}
+
+
+def get_growth_index() -> Optional["GrowthFactorIndex"]:
+    return _growth_index
+
 """
-    Compound interest formula: 
+    Compound interest formula:
     FV = P * (1 + R/N) ** (N * T)
+    The growth factor comes from the precomputed index when (R, N, T) is on its grid.
 """
 def calculate_future_value(P: float, R: float, N: int, T: int) -> float:
-    return round(P * (1 + R / N) ** (N * T), 2)
-    
+    factor = _growth_factors.get((R, N, T))
+    if factor is None:
+        factor = (1 + R / N) ** (N * T)
+    return round(P * factor, 2)
+
 """
     Rearranged compound interest formula:
     FV = P * (1 + R/N) ** (N * T)
@@ -13,9 +56,402 @@ def calculate_future_value(P: float, R: float, N: int, T: int) -> float:
 def calculate_required_rate(FV: float, P: float, N: int, T: int) -> float:
     if P <= 0 or FV <= 0 or N <= 0 or T <= 0:
         raise ValueError("Invalid input: P, FV, N, and T must be greater than 0")
-    
+
     base = (FV / P) ** (1 / (N * T))
     R = N * (base - 1)
-    
+
     return round(R, 6) # Keep precision for interest rate
 
+
+# Exact-decimal mode: inputs are taken as the decimal literals they were sent as,
+# growth factors are integer powers computed by repeated squaring under a fixed
+# context, and results are rounded half-up to cents (rates to 6 places)
+DECIMAL_PRECISION = 50
+DECIMAL_CONTEXT = Context(
+    prec=DECIMAL_PRECISION, rounding=ROUND_HALF_EVEN, traps=[InvalidOperation, DivisionByZero, Overflow]
+)
+CENTS = Decimal("0.01")
+RATE_QUANTUM = Decimal("0.000001")
+# Cached repeated squares of a base: base ** (2 ** k) for k = 0, 1, ...
+_DECIMAL_SQUARES_MAX = 4096
+_decimal_squares: dict[Decimal, tuple[Decimal, ...]] = {}
+_decimal_squares_lock = threading.Lock()
+
+
+def to_decimal(value: float) -> Decimal:
+    """The decimal literal a float was parsed from (its shortest round-tripping repr)."""
+    return Decimal(repr(value))
+
+
+def _squares(base: Decimal, count: int) -> tuple[Decimal, ...]:
+    """base ** (2 ** k) for k < count, extending the cached table as needed."""
+    squares = _decimal_squares.get(base, ())
+    if len(squares) < count:
+        extended = list(squares) or [+base]
+        with localcontext(DECIMAL_CONTEXT):
+            while len(extended) < count:
+                extended.append(extended[-1] * extended[-1])
+        squares = tuple(extended)
+        with _decimal_squares_lock:
+            if len(_decimal_squares) >= _DECIMAL_SQUARES_MAX:
+                _decimal_squares.clear()
+            _decimal_squares[base] = squares
+    return squares
+
+
+def decimal_power(base: Decimal, exponent: int) -> Decimal:
+    """base ** exponent for a non-negative integer exponent, by exponentiation by squaring."""
+    squares = _squares(base, exponent.bit_length())
+    result = Decimal(1)
+    with localcontext(DECIMAL_CONTEXT):
+        for k, square in enumerate(squares):
+            if exponent >> k & 1:
+                result *= square
+    return result
+
+
+@functools.lru_cache(maxsize=4096)
+def decimal_growth_factor(R: float, N: int, T: int) -> Decimal:
+    """(1 + R/N) ** (N*T) in DECIMAL_PRECISION significant digits."""
+    with localcontext(DECIMAL_CONTEXT):
+        base = 1 + to_decimal(R) / N
+    return decimal_power(base, N * T)
+
+
+def calculate_future_value_decimal(P: float, R: float, N: int, T: int) -> Decimal:
+    """Exact-decimal form of calculate_future_value, rounded half-up to cents."""
+    try:
+        with localcontext(DECIMAL_CONTEXT):
+            return (to_decimal(P) * decimal_growth_factor(R, N, T)).quantize(CENTS, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, Overflow) as e:
+        raise ValueError(f"Calculation overflow: {type(e).__name__}") from e
+
+
+def calculate_required_rate_decimal(FV: float, P: float, N: int, T: int) -> Decimal:
+    """Exact-decimal form of calculate_required_rate, rounded half-up to 6 places."""
+    if P <= 0 or FV <= 0 or N <= 0 or T <= 0:
+        raise ValueError("Invalid input: P, FV, N, and T must be greater than 0")
+
+    try:
+        with localcontext(DECIMAL_CONTEXT):
+            base = (to_decimal(FV) / to_decimal(P)) ** (Decimal(1) / (N * T))
+            return (N * (base - 1)).quantize(RATE_QUANTUM, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, Overflow) as e:
+        raise ValueError(f"Calculation overflow: {type(e).__name__}") from e
+
+
+class BatchResult(NamedTuple):
+    """Per-row results of a batch calculation; invalid rows are None in values."""
+    values: list[Optional[float]]
+    errors: dict[int, str]
+
+
+def _as_columns(**columns: Sequence[float]) -> dict[str, np.ndarray]:
+    import numpy as np
+
+    arrays = {name: np.asarray(col, dtype=np.float64) for name, col in columns.items()}
+    if len({a.shape for a in arrays.values()}) > 1 or any(a.ndim != 1 for a in arrays.values()):
+        raise ValueError(f"Invalid input: {', '.join(arrays)} must be 1-D arrays of the same length")
+    return arrays
+
+
+def _invalid_rows(columns: dict[str, np.ndarray]) -> tuple[np.ndarray, dict[int, str]]:
+    """Return the valid-row mask and an error message for every rejected row."""
+    import numpy as np
+
+    valid = np.ones(len(next(iter(columns.values()))), dtype=bool)
+    bad_fields: dict[int, list[str]] = {}
+    for name, col in columns.items():
+        # ~(col > 0) also rejects NaN
+        bad = ~(col > 0)
+        valid &= ~bad
+        for i in np.flatnonzero(bad).tolist():
+            bad_fields.setdefault(i, []).append(name)
+    errors = {
+        i: f"Invalid input: {', '.join(names)} must be greater than 0"
+        for i, names in bad_fields.items()
+    }
+    return valid, errors
+
+
+def _collect(raw: np.ndarray, valid: np.ndarray, errors: dict[int, str], ndigits: int) -> BatchResult:
+    import numpy as np
+
+    # Python's round() rather than np.round: np.round scales by 10**ndigits and
+    # can disagree with the scalar functions on ties.
+    finite = np.isfinite(raw)
+    for i in np.flatnonzero(valid & ~finite).tolist():
+        errors[i] = "Calculation overflow: result is not a finite number"
+    ok = (valid & finite).tolist()
+    values = [round(v, ndigits) if keep else None for v, keep in zip(raw.tolist(), ok)]
+    return BatchResult(values, dict(sorted(errors.items())))
+
+
+def _float_pow(base: float, exponent: float) -> float:
+    try:
+        return base ** exponent
+    except OverflowError:
+        return math.inf
+
+
+def growth_array(base: np.ndarray, exponent: np.ndarray) -> np.ndarray:
+    """Elementwise base ** exponent with Python's float power, as the scalar functions use.
+
+    numpy's power can differ from the C library's pow in the last bit, which is
+    enough to land on the other side of a half-cent tie once results are rounded.
+    """
+    import numpy as np
+
+    base, exponent = np.broadcast_arrays(base, exponent)
+    growth = np.fromiter(map(_float_pow, base.ravel().tolist(), exponent.ravel().tolist()), np.float64, base.size)
+    return growth.reshape(base.shape)
+
+
+def future_value_array(P: np.ndarray, R: np.ndarray, N: np.ndarray, T: np.ndarray) -> np.ndarray:
+    """Vectorized, unrounded form of calculate_future_value, bit-identical to it."""
+    return P * growth_array(1 + R / N, N * T)
+
+
+def calculate_future_value_batch(
+    P: Sequence[float], R: Sequence[float], N: Sequence[int], T: Sequence[int]
+) -> BatchResult:
+    """Evaluate calculate_future_value over columnar inputs in one vectorized pass."""
+    import numpy as np
+
+    columns = _as_columns(P=P, R=R, N=N, T=T)
+    valid, errors = _invalid_rows(columns)
+    # Substitute 1 for rejected rows so they cannot raise warnings or poison the pass
+    safe = {name: np.where(valid, col, 1.0) for name, col in columns.items()}
+    with np.errstate(over="ignore", invalid="ignore"):
+        raw = future_value_array(safe["P"], safe["R"], safe["N"], safe["T"])
+    return _collect(raw, valid, errors, 2)
+
+
+def calculate_required_rate_batch(
+    FV: Sequence[float], P: Sequence[float], N: Sequence[int], T: Sequence[int]
+) -> BatchResult:
+    """Evaluate calculate_required_rate over columnar inputs in one vectorized pass."""
+    import numpy as np
+
+    columns = _as_columns(FV=FV, P=P, N=N, T=T)
+    valid, errors = _invalid_rows(columns)
+    safe = {name: np.where(valid, col, 1.0) for name, col in columns.items()}
+    with np.errstate(over="ignore", invalid="ignore"):
+        base = growth_array(safe["FV"] / safe["P"], 1 / (safe["N"] * safe["T"]))
+        raw = safe["N"] * (base - 1)
+    return _collect(raw, valid, errors, 6)
+
+
+# Points per cumulative-product block in calculate_balance_schedule; each block is
+# re-anchored on an exact power so rounding drift cannot accumulate across long horizons
+SCHEDULE_BLOCK = 256
+
+
+class BalanceSchedule(NamedTuple):
+    periods: list[int]
+    balances: list[float]
+    total_periods: int
+
+
+def calculate_balance_schedule(
+    P: float, R: float, N: int, T: int, offset: int = 0, limit: int = 1000, stride: int = 1
+) -> BalanceSchedule:
+    """Balance after every `stride`-th compounding period, starting at period `offset`.
+
+    Period 0 is the principal and period N*T the future value. At most `limit`
+    points are returned; the window is evaluated as blocked cumulative products.
+    """
+    import numpy as np
+
+    if P <= 0 or R < 0 or N <= 0 or T <= 0:
+        raise ValueError("Invalid input: P, N, and T must be greater than 0 and R must not be negative")
+    if offset < 0 or limit <= 0 or stride <= 0:
+        raise ValueError("Invalid input: offset must not be negative, limit and stride must be greater than 0")
+
+    total = N * T
+    count = min(limit, (total - offset) // stride + 1) if offset <= total else 0
+    if count <= 0:
+        return BalanceSchedule([], [], total)
+
+    base = 1 + R / N
+    blocks = -(-count // SCHEDULE_BLOCK)
+    with np.errstate(over="ignore", invalid="ignore"):
+        # Exact anchor at the first period of every block...
+        anchor_periods = offset + np.arange(blocks) * (SCHEDULE_BLOCK * stride)
+        anchors = P * np.power(base, anchor_periods.astype(np.float64))
+        # ...then a cumulative product of the per-point growth within each block
+        steps = np.full((blocks, SCHEDULE_BLOCK), base ** stride)
+        steps[:, 0] = 1.0
+        balances = (anchors[:, None] * np.cumprod(steps, axis=1)).ravel()[:count]
+    if not np.isfinite(balances).all():
+        raise ValueError("Calculation overflow: balance is not a finite number")
+
+    periods = range(offset, offset + count * stride, stride)
+    return BalanceSchedule(list(periods), [round(v, 2) for v in balances.tolist()], total)
+
+
+def calculate_balance_schedule_decimal(
+    P: float, R: float, N: int, T: int, offset: int = 0, limit: int = 1000, stride: int = 1
+) -> BalanceSchedule:
+    """Exact-decimal form of calculate_balance_schedule, balances rounded half-up to cents."""
+    if P <= 0 or R < 0 or N <= 0 or T <= 0:
+        raise ValueError("Invalid input: P, N, and T must be greater than 0 and R must not be negative")
+    if offset < 0 or limit <= 0 or stride <= 0:
+        raise ValueError("Invalid input: offset must not be negative, limit and stride must be greater than 0")
+
+    total = N * T
+    count = min(limit, (total - offset) // stride + 1) if offset <= total else 0
+    if count <= 0:
+        return BalanceSchedule([], [], total)
+
+    try:
+        with localcontext(DECIMAL_CONTEXT):
+            base = 1 + to_decimal(R) / N
+            step = decimal_power(base, stride)
+            balance = to_decimal(P) * decimal_power(base, offset)
+            balances = []
+            for _ in range(count):
+                balances.append(float(balance.quantize(CENTS, rounding=ROUND_HALF_UP)))
+                balance *= step
+    except (InvalidOperation, Overflow) as e:
+        raise ValueError(f"Calculation overflow: {type(e).__name__}") from e
+
+    periods = range(offset, offset + count * stride, stride)
+    return BalanceSchedule(list(periods), balances, total)
+
+
+# Relative slack allowed for times past the end of a rate schedule
+TERM_TOLERANCE = 1e-9
+# Prefix of rate schedule IDs, versioning their encoding
+SCHEDULE_ID_PREFIX = "rs1."
+
+
+class RateSchedule:
+    """Piecewise-constant annual rates, compounded N times a year or continuously (N=None).
+
+    Segment i runs for years[i] at rates[i]. The index holds the cumulative log
+    growth at every segment boundary, so the growth over the whole segments
+    between two times is exp of a difference of two index entries, found with a
+    binary search instead of a product over every period. The partial segments
+    at either end grow by (1 + r/N) ** periods, the same power as
+    calculate_future_value, so a query within one segment matches it exactly.
+    Times inside a compounding period accrue the fractional power, as
+    (1 + R/N) ** (N*T) does for a fractional T.
+
+    The ID encodes the schedule itself (N, then the rates and years as
+    float64, deflated and base64url-encoded), so any process can rebuild the
+    index from it with from_id and equal schedules share an ID.
+    """
+
+    def __init__(self, rates: Sequence[float], years: Sequence[float], N: Optional[int] = None):
+        if not rates or len(rates) != len(years):
+            raise ValueError("Invalid input: a rate schedule needs one or more segments, each with a rate and years")
+        if N is not None and N <= 0:
+            raise ValueError("Invalid input: N must be greater than 0")
+        if any(not math.isfinite(r) or r < 0 for r in rates):
+            raise ValueError("Invalid input: schedule rates must be finite and not negative")
+        if any(not math.isfinite(y) or y <= 0 for y in years):
+            raise ValueError("Invalid input: schedule segment years must be finite and greater than 0")
+
+        # + 0.0 turns -0.0 into 0.0, so equal schedules share an ID
+        self.rates = tuple(float(r) + 0.0 for r in rates)
+        self.years = tuple(float(y) for y in years)
+        self.N = N
+        # Growth per compounding period of each segment
+        self.bases = tuple(1.0 if N is None else 1 + r / N for r in self.rates)
+        # Log growth per year of each segment
+        self.log_rates = tuple(r if N is None else N * math.log1p(r / N) for r in self.rates)
+        self.bounds = (0.0, *itertools.accumulate(self.years))
+        self.log_index = (0.0, *itertools.accumulate(g * y for g, y in zip(self.log_rates, self.years)))
+        packed = struct.pack("<I", N or 0) + array.array("d", self.rates + self.years).tobytes()
+        deflate = zlib.compressobj(9, zlib.DEFLATED, -15)
+        encoded = base64.urlsafe_b64encode(deflate.compress(packed) + deflate.flush()).rstrip(b"=")
+        self.id = SCHEDULE_ID_PREFIX + encoded.decode()
+
+    @classmethod
+    def from_id(cls, schedule_id: str, max_segments: int) -> "RateSchedule":
+        """Rebuild the schedule an ID was issued for."""
+        invalid = ValueError("Invalid input: schedule_id is not a rate schedule ID")
+        if not schedule_id.startswith(SCHEDULE_ID_PREFIX):
+            raise invalid
+        encoded = schedule_id[len(SCHEDULE_ID_PREFIX):]
+        limit = 4 + 16 * max_segments
+        try:
+            inflate = zlib.decompressobj(-15)
+            packed = inflate.decompress(base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)), limit)
+        except (binascii.Error, ValueError, zlib.error):
+            raise invalid from None
+        # Longer than the largest allowed schedule, truncated, or not a whole number of segments
+        if inflate.unconsumed_tail or not inflate.eof or len(packed) < 20 or (len(packed) - 4) % 16:
+            raise invalid
+        (N,) = struct.unpack_from("<I", packed)
+        values = array.array("d", packed[4:]).tolist()
+        count = len(values) // 2
+        schedule = cls(values[:count], values[count:], N or None)
+        if schedule.id != schedule_id:
+            # Not the canonical encoding (e.g. -0.0 rates)
+            raise invalid
+        return schedule
+
+    @property
+    def term(self) -> float:
+        """Total length of the schedule in years."""
+        return self.bounds[-1]
+
+    def _segment_growth(self, i: int, years: float) -> float:
+        """Growth over `years` within segment i."""
+        if self.N is None:
+            return math.exp(self.rates[i] * years)
+        periods = self.N * years
+        # Boundaries are sums of floats; snap to the whole number of periods they stand for
+        whole = round(periods)
+        if abs(periods - whole) <= TERM_TOLERANCE * max(1.0, periods):
+            return self.bases[i] ** whole
+        return self.bases[i] ** periods
+
+    def growths(self, start: float, horizons: Sequence[float]) -> list[float]:
+        """Growth factor over [start, horizon] for every horizon."""
+        import numpy as np
+
+        ends = np.asarray(horizons, dtype=np.float64)
+        # Segment years rarely add up to exactly the term (12 * 1/12 != 1), so allow a hair past it
+        limit = self.term * (1 + TERM_TOLERANCE)
+        # ~(ends >= start) also rejects NaN
+        if not 0 <= start <= limit or (~(ends >= start)).any() or (ends > limit).any():
+            raise ValueError(f"Invalid input: start and horizons must satisfy 0 <= start <= horizon <= {self.term:g} (the schedule term)")
+        start, ends = min(start, self.term), np.minimum(ends, self.term)
+
+        last = len(self.rates) - 1
+        first = min(bisect.bisect_right(self.bounds, start), len(self.rates)) - 1
+        segments = np.minimum(np.searchsorted(np.asarray(self.bounds), ends, side="right") - 1, last)
+        bounds, log_index = self.bounds, self.log_index
+        try:
+            # From start to the end of its segment
+            head = self._segment_growth(first, bounds[first + 1] - start)
+            growths = [
+                self._segment_growth(i, end - start) if i == first
+                else head * math.exp(log_index[i] - log_index[first + 1]) * self._segment_growth(i, end - bounds[i])
+                for i, end in zip(segments.tolist(), ends.tolist())
+            ]
+        except OverflowError:
+            growths = [math.inf]
+        if not all(map(math.isfinite, growths)):
+            raise ValueError("Calculation overflow: growth is not a finite number")
+        return growths
+
+    def growth(self, start: float, end: float) -> float:
+        """Growth factor over [start, end]."""
+        return self.growths(start, [end])[0]
+
+    def future_value(self, P: float, start: float, end: float) -> float:
+        """Value at `end` of P invested at `start`, rounded to cents."""
+        return self.future_values(P, start, [end])[0]
+
+    def future_values(self, P: float, start: float, horizons: Sequence[float]) -> list[float]:
+        """Value of P invested at `start` at every horizon, rounded to cents."""
+        if P <= 0:
+            raise ValueError("Invalid input: P must be greater than 0")
+        values = [P * growth for growth in self.growths(start, horizons)]
+        if not all(map(math.isfinite, values)):
+            raise ValueError("Calculation overflow: future value is not a finite number")
+        return [round(v, 2) for v in values]
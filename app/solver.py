@@ -0,0 +1,328 @@
+"""
+    Goal seek: solve the compound-interest equation for any one of its variables.
+
+    FV = P * (1 + i) ** n + PMT * ((1 + i) ** n - 1) / i,   i = R / N,  n = N * T
+
+    PMT is a contribution added at the end of every compounding period. FV, P,
+    PMT and T have closed forms; so does R when there are no contributions.
+    R with contributions is found by Newton's method on the per-period rate,
+    using the analytic derivative and safeguarded by a bisection bracket.
+"""
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, NamedTuple, Optional, Sequence
+
+from .services import _as_columns, _invalid_rows, get_growth_index, growth_array
+
+if TYPE_CHECKING:
+    import numpy as np
+
+SOLVABLE = ("FV", "P", "R", "T", "PMT")
+
+# Per-row status values, in the order of their numeric codes in solve_batch
+STATUSES = ("closed_form", "converged", "not_converged", "no_solution", "invalid")
+CLOSED_FORM, CONVERGED, NOT_CONVERGED, NO_SOLUTION, INVALID = STATUSES
+
+# Decimal places each solved variable is rounded to
+DECIMALS = {"FV": 2, "P": 2, "PMT": 2, "R": 6, "T": 6}
+
+MAX_ITERATIONS = 100
+# Relative step size on the per-period rate at which Newton iteration stops
+TOLERANCE = 1e-12
+# Below this per-period rate the annuity factor uses its series expansion
+SMALL_RATE = 1e-8
+# Search interval for the per-period rate; the upper end is doubled until it brackets the root
+LOWER_RATE = -1 + 1e-9
+UPPER_RATE = 1.0
+MAX_BRACKET_DOUBLINGS = 64
+
+
+class Solution(NamedTuple):
+    value: Optional[float]
+    status: str
+    iterations: int
+
+
+class BatchSolution(NamedTuple):
+    """Per-row results of solve_batch; rows listed in errors have value None."""
+    values: list[Optional[float]]
+    status: list[str]
+    iterations: list[int]
+    errors: dict[int, str]
+
+
+def _no_solution(target: str) -> str:
+    return f"No solution: no {target} reaches FV with these inputs"
+
+
+def _required(target: str, **inputs: Optional[float]) -> None:
+    missing = [name for name, value in inputs.items() if name != target and value is None]
+    if missing:
+        raise ValueError(f"Invalid input: {', '.join(missing)} must be provided when solving for {target}")
+
+
+# Scalar
+
+def _growth(i: float, n: float) -> float:
+    try:
+        return (1 + i) ** n
+    except OverflowError:
+        return math.inf
+
+
+def _objective(i: float, FV: float, P: float, PMT: float, n: float) -> tuple[float, float]:
+    """FV(i) - FV and its derivative with respect to the per-period rate i."""
+    g = _growth(i, n)
+    dg = n * g / (1 + i)
+    if abs(i) < SMALL_RATE:
+        annuity = n + n * (n - 1) / 2 * i
+        d_annuity = n * (n - 1) / 2
+    else:
+        annuity = (g - 1) / i
+        d_annuity = (dg - annuity) / i
+    return P * g + PMT * annuity - FV, P * dg + PMT * d_annuity
+
+
+def _rate_guess(FV: float, P: float, PMT: float, N: int, T: float) -> float:
+    """Per-period starting rate, treating contributions as invested for half the term."""
+    n = N * T
+    growth = FV / (P + PMT * n / 2)
+    index = get_growth_index()
+    if index is not None and float(T).is_integer():
+        R = index.nearest_rate(growth, N, int(T))
+        if R is not None:
+            return R / N
+    return growth ** (1 / n) - 1
+
+
+def _newton_rate(FV: float, P: float, PMT: float, n: float, guess: float) -> tuple[Optional[float], str, int]:
+    lo, hi = LOWER_RATE, UPPER_RATE
+    if _objective(lo, FV, P, PMT, n)[0] >= 0:
+        return None, NO_SOLUTION, 0
+    for _ in range(MAX_BRACKET_DOUBLINGS):
+        if _objective(hi, FV, P, PMT, n)[0] > 0:
+            break
+        lo, hi = hi, hi * 2
+    else:
+        return None, NO_SOLUTION, 0
+
+    x = guess if lo < guess < hi else (lo + hi) / 2
+    for iteration in range(1, MAX_ITERATIONS + 1):
+        fx, dfx = _objective(x, FV, P, PMT, n)
+        if fx == 0:
+            return x, CONVERGED, iteration
+        if fx < 0:
+            lo = x
+        else:
+            hi = x
+        # Newton step, falling back to bisection when it leaves the bracket
+        step_ok = math.isfinite(fx) and math.isfinite(dfx) and dfx > 0
+        x_new = x - fx / dfx if step_ok else (lo + hi) / 2
+        if abs(x_new - x) <= TOLERANCE * (1 + abs(x_new)):
+            return x_new, CONVERGED, iteration
+        x = x_new if lo < x_new < hi else (lo + hi) / 2
+    return x, NOT_CONVERGED, MAX_ITERATIONS
+
+
+def solve(
+    target: str,
+    FV: Optional[float] = None,
+    P: Optional[float] = None,
+    R: Optional[float] = None,
+    N: int = 1,
+    T: Optional[float] = None,
+    PMT: float = 0.0,
+) -> Solution:
+    """Solve for `target` given the other variables (the target's own value is ignored).
+
+    Raises ValueError on invalid input or when no value of `target` reaches FV.
+    """
+    if target not in SOLVABLE:
+        raise ValueError(f"Invalid input: can only solve for one of {', '.join(SOLVABLE)}")
+    _required(target, FV=FV, P=P, R=R, T=T)
+    positive = {"FV": FV, "P": P, "N": N, "T": T}
+    bad = [name for name, value in positive.items() if name != target and not value > 0]
+    if bad:
+        raise ValueError(f"Invalid input: {', '.join(bad)} must be greater than 0")
+    bad = [name for name, value in {"R": R, "PMT": PMT}.items() if name != target and not value >= 0]
+    if bad:
+        raise ValueError(f"Invalid input: {', '.join(bad)} must not be negative")
+
+    status, iterations = CLOSED_FORM, 0
+    if target == "R":
+        n = N * T
+        if PMT == 0:
+            value: Optional[float] = N * ((FV / P) ** (1 / n) - 1)
+        else:
+            i, status, iterations = _newton_rate(FV, P, PMT, n, _rate_guess(FV, P, PMT, N, T))
+            value = None if i is None else i * N
+    elif target == "T":
+        i = R / N
+        if i > 0:
+            ratio = (FV * i + PMT) / (P * i + PMT)
+            value = math.log(ratio) / math.log1p(i) / N if ratio > 0 else None
+        else:
+            value = (FV - P) / PMT / N if PMT > 0 else None
+        if value is not None and value <= 0:
+            value = None
+    else:
+        i, n = R / N, N * T
+        g = _growth(i, n)
+        annuity = n if i == 0 else (g - 1) / i
+        if target == "FV":
+            value = P * g + PMT * annuity
+        elif target == "P":
+            value = (FV - PMT * annuity) / g
+        else:
+            value = (FV - P * g) / annuity
+        if target != "FV" and not value > 0:
+            value = None
+
+    if value is None:
+        raise ValueError(_no_solution(target))
+    if not math.isfinite(value):
+        raise ValueError("Calculation overflow: result is not a finite number")
+    return Solution(round(value, DECIMALS[target]), status, iterations)
+
+
+# Vectorized
+
+def _objective_array(i: np.ndarray, FV: np.ndarray, P: np.ndarray, PMT: np.ndarray, n: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    import numpy as np
+
+    g = (1 + i) ** n
+    dg = n * g / (1 + i)
+    small = np.abs(i) < SMALL_RATE
+    annuity = np.where(small, n + n * (n - 1) / 2 * i, (g - 1) / i)
+    d_annuity = np.where(small, n * (n - 1) / 2, (dg - annuity) / i)
+    return P * g + PMT * annuity - FV, P * dg + PMT * d_annuity
+
+
+def _newton_rate_array(
+    FV: np.ndarray, P: np.ndarray, PMT: np.ndarray, n: np.ndarray, guess: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized _newton_rate: returns (per-period rate, status code, iterations) per row."""
+    import numpy as np
+
+    lo = np.full(len(FV), LOWER_RATE)
+    hi = np.full(len(FV), UPPER_RATE)
+    status = np.full(len(FV), STATUSES.index(NOT_CONVERGED))
+    iterations = np.zeros(len(FV), dtype=np.int64)
+
+    solvable = _objective_array(lo, FV, P, PMT, n)[0] < 0
+    for _ in range(MAX_BRACKET_DOUBLINGS):
+        below = solvable & (_objective_array(hi, FV, P, PMT, n)[0] <= 0)
+        if not below.any():
+            break
+        lo = np.where(below, hi, lo)
+        hi = np.where(below, hi * 2, hi)
+    else:
+        solvable &= _objective_array(hi, FV, P, PMT, n)[0] > 0
+    status[~solvable] = STATUSES.index(NO_SOLUTION)
+
+    x = np.where((lo < guess) & (guess < hi), guess, (lo + hi) / 2)
+    active = solvable.copy()
+    for iteration in range(1, MAX_ITERATIONS + 1):
+        if not active.any():
+            break
+        fx, dfx = _objective_array(x, FV, P, PMT, n)
+        lo = np.where(active & (fx < 0), x, lo)
+        hi = np.where(active & (fx > 0), x, hi)
+        step_ok = np.isfinite(fx) & np.isfinite(dfx) & (dfx > 0)
+        x_new = np.where(step_ok, x - fx / np.where(step_ok, dfx, 1.0), (lo + hi) / 2)
+        done = active & ((fx == 0) | (np.abs(x_new - x) <= TOLERANCE * (1 + np.abs(x_new))))
+        x_new = np.where(done | ((lo < x_new) & (x_new < hi)), x_new, (lo + hi) / 2)
+        x = np.where(active & (fx != 0), x_new, x)
+        iterations[active] = iteration
+        status[done] = STATUSES.index(CONVERGED)
+        active &= ~done
+    return x, status, iterations
+
+
+def solve_batch(
+    target: str,
+    FV: Optional[Sequence[float]] = None,
+    P: Optional[Sequence[float]] = None,
+    R: Optional[Sequence[float]] = None,
+    N: Optional[Sequence[int]] = None,
+    T: Optional[Sequence[float]] = None,
+    PMT: Optional[Sequence[float]] = None,
+) -> BatchSolution:
+    """Solve many goal-seek problems for the same target in one vectorized pass.
+
+    Columns other than the target are required, except PMT which defaults to 0.
+    Every row reports its status and Newton iteration count (0 for closed forms).
+    """
+    import numpy as np
+
+    if target not in SOLVABLE:
+        raise ValueError(f"Invalid input: can only solve for one of {', '.join(SOLVABLE)}")
+    _required(target, FV=FV, P=P, R=R, N=N, T=T)
+    given = {"FV": FV, "P": P, "R": R, "N": N, "T": T, "PMT": PMT}
+    if PMT is None and target != "PMT":
+        given["PMT"] = [0.0] * len(N)
+    columns = _as_columns(**{name: col for name, col in given.items() if name != target})
+    rows = len(columns["N"])
+
+    valid, errors = _invalid_rows({name: columns[name] for name in ("FV", "P", "N", "T") if name in columns})
+    for name in ("R", "PMT"):
+        if name in columns:
+            negative = ~(columns[name] >= 0)
+            valid &= ~negative
+            for i in np.flatnonzero(negative).tolist():
+                errors[i] = f"{errors[i]}; " if i in errors else ""
+                errors[i] += f"Invalid input: {name} must not be negative"
+    # Substitute harmless values for rejected rows so they cannot poison the pass
+    c = {name: np.where(valid, col, 1.0) for name, col in columns.items()}
+    status = np.where(valid, STATUSES.index(CLOSED_FORM), STATUSES.index(INVALID))
+    iterations = np.zeros(rows, dtype=np.int64)
+
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        if target == "R":
+            n = c["N"] * c["T"]
+            raw = c["N"] * ((c["FV"] / c["P"]) ** (1 / n) - 1)
+            newton = valid & (c["PMT"] > 0)
+            if newton.any():
+                FV_, P_, PMT_, n_ = (a[newton] for a in (c["FV"], c["P"], c["PMT"], n))
+                guess = (FV_ / (P_ + PMT_ * n_ / 2)) ** (1 / n_) - 1
+                rate, row_status, row_iterations = _newton_rate_array(FV_, P_, PMT_, n_, guess)
+                raw[newton] = rate * c["N"][newton]
+                status[newton] = row_status
+                iterations[newton] = row_iterations
+        elif target == "T":
+            i = c["R"] / c["N"]
+            periods = np.where(
+                i > 0,
+                np.log((c["FV"] * i + c["PMT"]) / (c["P"] * i + c["PMT"])) / np.log1p(i),
+                (c["FV"] - c["P"]) / c["PMT"],
+            )
+            raw = periods / c["N"]
+            status[valid & ~((raw > 0) & np.isfinite(raw))] = STATUSES.index(NO_SOLUTION)
+        else:
+            i, n = c["R"] / c["N"], c["N"] * c["T"]
+            # The scalar power, so that closed forms round exactly like solve()
+            g = growth_array(1 + i, n)
+            annuity = np.where(i == 0, n, (g - 1) / i)
+            if target == "FV":
+                raw = c["P"] * g + c["PMT"] * annuity
+            else:
+                raw = (c["FV"] - c["PMT"] * annuity) / g if target == "P" else (c["FV"] - c["P"] * g) / annuity
+                status[valid & ~(raw > 0)] = STATUSES.index(NO_SOLUTION)
+
+    no_solution = status == STATUSES.index(NO_SOLUTION)
+    for i in np.flatnonzero(no_solution).tolist():
+        errors[i] = _no_solution(target)
+    overflow = ~no_solution & valid & ~np.isfinite(raw)
+    for i in np.flatnonzero(overflow).tolist():
+        errors[i] = "Calculation overflow: result is not a finite number"
+    status[overflow] = STATUSES.index(NO_SOLUTION)
+
+    ok = (valid & ~no_solution & ~overflow).tolist()
+    values = [round(v, DECIMALS[target]) if keep else None for v, keep in zip(raw.tolist(), ok)]
+    return BatchSolution(
+        values,
+        [STATUSES[code] for code in status.tolist()],
+        iterations.tolist(),
+        dict(sorted(errors.items())),
+    )
@@ -0,0 +1,200 @@
+import csv
+import json
+from typing import AsyncIterator, Callable, Optional
+
+from starlette.responses import StreamingResponse
+
+from .executor import run_compute
+from .services import calculate_future_value_batch
+
+# Request content types accepted by the streaming endpoints
+STREAM_FORMATS = {
+    "application/x-ndjson": "ndjson",
+    "text/csv": "csv",
+}
+
+FUTURE_VALUE_COLUMNS = ("P", "R", "N", "T")
+REQUIRED_RATE_COLUMNS = ("FV", "P", "N", "T")
+
+Row = tuple[float, float, int, int]
+
+
+class FullDuplexStreamingResponse(StreamingResponse):
+    """StreamingResponse that may stream while the request body is still being read.
+
+    Starlette's StreamingResponse polls receive() for disconnects on ASGI < 2.4
+    servers, which would swallow request body chunks the generator has not
+    consumed yet. Disconnects still surface through the body stream.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:  # type: ignore[no-untyped-def]
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+# Stands in for a line longer than the limit; blank lines are never yielded, so
+# an empty line is unambiguous
+OVERSIZED_LINE = b""
+
+
+async def iter_line_batches(body: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[list[bytes]]:
+    """Re-chunk a byte stream into lists of complete, non-blank lines.
+
+    A line longer than max_line_bytes comes out as OVERSIZED_LINE and its bytes
+    are dropped as they arrive, so a body without newlines cannot grow the
+    buffer without bound.
+    """
+    pending = b""
+    skipping = False
+    async for chunk in body:
+        if not chunk:
+            continue
+        *lines, pending = (pending + chunk).split(b"\n")
+        batch = []
+        if skipping and lines:
+            # The first line ends the over-long line being skipped
+            batch.append(OVERSIZED_LINE)
+            lines, skipping = lines[1:], False
+        batch += [line if len(line) <= max_line_bytes else OVERSIZED_LINE for line in lines if line.strip()]
+        if len(pending) > max_line_bytes:
+            pending, skipping = b"", True
+        if batch:
+            yield batch
+    if skipping:
+        yield [OVERSIZED_LINE]
+    elif pending.strip():
+        yield [pending]
+
+
+_decode_json = json.JSONDecoder().decode
+
+
+def _to_int(value: float) -> int:
+    number = int(value)
+    if number != value:
+        raise ValueError(f"expected an integer, got {value!r}")
+    return number
+
+
+def _row(a: object, b: object, N: object, T: object) -> Row:
+    # (P, R, N, T) or (FV, P, N, T). Non-positive, NaN and infinite values are
+    # left for the batch validation, which reports them per row like the batch
+    # endpoints do.
+    return float(a), float(b), _to_int(float(N)), _to_int(float(T))  # type: ignore[arg-type]
+
+
+def parse_ndjson_row(line: bytes, columns: tuple[str, ...] = FUTURE_VALUE_COLUMNS) -> Row:
+    record = _decode_json(line.decode())
+    if type(record) is not dict:
+        raise ValueError("expected a JSON object")
+    try:
+        values = [record[column] for column in columns]
+    except KeyError as e:
+        raise ValueError(f"missing field {e.args[0]}")
+    for value in values:
+        if type(value) is not float and type(value) is not int:
+            raise ValueError(f"expected a number, got {value!r}")
+    return _row(*values)
+
+
+def csv_row_parser(header: bytes, columns: tuple[str, ...] = FUTURE_VALUE_COLUMNS) -> Callable[[bytes], Row]:
+    """Build a CSV row parser from the header line; columns may come in any order."""
+    names = [name.strip() for name in next(csv.reader([header.decode()]))]
+    missing = [column for column in columns if column not in names]
+    if missing:
+        raise ValueError(f"Invalid input: CSV header is missing column(s) {', '.join(missing)}")
+    positions = [names.index(column) for column in columns]
+    width = len(names)
+
+    def parse(line: bytes) -> Row:
+        fields = next(csv.reader([line.decode()]))
+        if len(fields) != width:
+            raise ValueError(f"expected {width} fields, got {len(fields)}")
+        return _row(*(fields[i] for i in positions))
+
+    return parse
+
+
+def _format_ndjson(row: int, value: Optional[float], error: Optional[str]) -> str:
+    if error is not None:
+        return f'{{"row":{row},"error":{json.dumps(error)}}}\n'
+    # repr of a finite float is valid JSON
+    return f'{{"row":{row},"future_value":{value!r}}}\n'
+
+
+def _format_csv(row: int, value: Optional[float], error: Optional[str]) -> str:
+    if error is not None:
+        return f'{row},,"{error.replace(chr(34), chr(34) * 2)}"\n'
+    return f"{row},{value!r},\n"
+
+
+class FutureValueStream:
+    """Incremental pipeline: byte stream -> lines -> parsed rows -> vectorized chunks -> output lines.
+
+    Only one chunk of rows is held in memory at a time, so memory stays flat
+    regardless of input size.
+    """
+
+    def __init__(self, body: AsyncIterator[bytes], fmt: str, chunk_rows: int, max_line_bytes: int):
+        self.fmt = fmt
+        self.chunk_rows = chunk_rows
+        self.max_line_bytes = max_line_bytes
+        self._batches = iter_line_batches(body, max_line_bytes)
+        self._first: list[bytes] = []
+        self._parse: Callable[[bytes], Row] = parse_ndjson_row
+        self._format = _format_ndjson if fmt == "ndjson" else _format_csv
+
+    async def open(self) -> "FutureValueStream":
+        """Read far enough to validate the CSV header before any response is sent."""
+        if self.fmt == "csv":
+            async for lines in self._batches:
+                self._parse = csv_row_parser(lines[0])
+                self._first = lines[1:]
+                break
+            else:
+                raise ValueError("Invalid input: CSV body is empty")
+        return self
+
+    async def _lines(self) -> AsyncIterator[list[bytes]]:
+        if self._first:
+            yield self._first
+        async for lines in self._batches:
+            yield lines
+
+    async def _flush(self, start: int, columns: list[list], parse_errors: dict[int, str]) -> str:
+        result = await run_compute(calculate_future_value_batch, *columns)
+        values = iter(result.values)
+        errors = iter(result.errors.get(i) for i in range(len(result.values)))
+        out = []
+        for offset in range(len(result.values) + len(parse_errors)):
+            row = start + offset
+            if row in parse_errors:
+                out.append(self._format(row, None, parse_errors[row]))
+            else:
+                out.append(self._format(row, next(values), next(errors)))
+        return "".join(out)
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        if self.fmt == "csv":
+            yield "row,future_value,error\n"
+        start = row = 0
+        columns: list[list] = [[], [], [], []]
+        parse_errors: dict[int, str] = {}
+        async for lines in self._lines():
+            for line in lines:
+                try:
+                    if line is OVERSIZED_LINE:
+                        raise ValueError(f"line is longer than {self.max_line_bytes} bytes")
+                    parsed = self._parse(line)
+                except (ValueError, OverflowError) as e:
+                    parse_errors[row] = f"Invalid row: {e}"
+                else:
+                    for column, value in zip(columns, parsed):
+                        column.append(value)
+                row += 1
+                if row - start >= self.chunk_rows:
+                    yield await self._flush(start, columns, parse_errors)
+                    start, columns, parse_errors = row, [[], [], [], []], {}
+        if row > start:
+            yield await self._flush(start, columns, parse_errors)
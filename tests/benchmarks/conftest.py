@@ -0,0 +1,79 @@
+"""Shared fixture for the benchmark suite.
+
+Every measurement made through the ``bench`` fixture is written to
+BENCH_RESULTS_FILE (default: bench_results.json in the repo root) and compared
+with tests/benchmarks/baseline.json. A benchmark fails when it is more than
+BENCH_REGRESSION_THRESHOLD (default 0.25, i.e. 25%) slower than its baseline.
+Run with BENCH_UPDATE_BASELINE=1 to record the current timings as the new
+baseline instead; baselines are machine specific, so refresh them on the host
+that runs the comparison.
+"""
+import json
+import os
+import platform
+import timeit
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+BASELINE_FILE = Path(__file__).parent / "baseline.json"
+RESULTS_FILE = Path(os.getenv("BENCH_RESULTS_FILE", Path(__file__).parents[2] / "bench_results.json"))
+THRESHOLD = float(os.getenv("BENCH_REGRESSION_THRESHOLD", "0.25"))
+UPDATE_BASELINE = os.getenv("BENCH_UPDATE_BASELINE", "").lower() in ("1", "true", "yes")
+
+_results: dict[str, dict[str, Any]] = {}
+
+
+def _load_baseline() -> dict[str, float]:
+    if BASELINE_FILE.exists():
+        return json.loads(BASELINE_FILE.read_text())["results"]
+    return {}
+
+
+@pytest.fixture(scope="session")
+def baseline() -> dict[str, float]:
+    return _load_baseline()
+
+
+@pytest.fixture
+def bench(baseline: dict[str, float]) -> Callable[..., float]:
+    """Time `func` and check it against the stored baseline.
+
+    Returns the best-of-`repeat` seconds per call. `number` calls are made per
+    repeat; pass `calls_per_op` when one `func` call performs several operations.
+    """
+
+    def run(name: str, func: Callable[[], Any], number: int = 1000, repeat: int = 5, calls_per_op: int = 1) -> float:
+        func()  # warm up caches, lazy imports and JIT-free first-call costs
+        timings = timeit.repeat(func, number=number, repeat=repeat)
+        seconds = min(timings) / (number * calls_per_op)
+        reference = baseline.get(name)
+        ratio = seconds / reference if reference else None
+        _results[name] = {"seconds_per_op": seconds, "baseline": reference, "ratio": ratio}
+
+        shown = f"{seconds * 1e6:10.2f} us/op"
+        if ratio is not None:
+            shown += f"  ({ratio:.2f}x baseline)"
+        print(f"\n{name:<40} {shown}")
+
+        if ratio is not None and not UPDATE_BASELINE and ratio > 1 + THRESHOLD:
+            pytest.fail(
+                f"{name} regressed: {seconds * 1e6:.2f} us/op vs baseline {reference * 1e6:.2f} us/op "
+                f"(+{(ratio - 1) * 100:.0f}%, threshold {THRESHOLD * 100:.0f}%)"
+            )
+        return seconds
+
+    return run
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    if not _results:
+        return
+    environment = {"python": platform.python_version(), "machine": platform.machine(), "system": platform.system()}
+    RESULTS_FILE.write_text(json.dumps({"environment": environment, "results": _results}, indent=2) + "\n")
+    if UPDATE_BASELINE:
+        merged = {**_load_baseline(), **{name: r["seconds_per_op"] for name, r in _results.items()}}
+        BASELINE_FILE.write_text(
+            json.dumps({"environment": environment, "results": dict(sorted(merged.items()))}, indent=2) + "\n"
+        )
@@ -0,0 +1,103 @@
+"""In-process load generator for the ASGI app (no network, no server process)."""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+import httpx
+
+
+@dataclass
+class LoadResult:
+    requests: int
+    errors: int
+    seconds: float
+    latencies: list[float]
+    # Status code of each request, in the order of `latencies`
+    statuses: list[int] = field(default_factory=list)
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.seconds
+
+    def accepted(self, status: int = 200) -> "LoadResult":
+        """The requests that got `status`, e.g. those admitted under load shedding."""
+        latencies = [latency for latency, code in zip(self.latencies, self.statuses) if code == status]
+        return LoadResult(requests=len(latencies), errors=0, seconds=self.seconds, latencies=latencies, statuses=[status] * len(latencies))
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+    def summary(self, label: str) -> str:
+        return (
+            f"{label:<28} {self.requests:>6} req  {self.rps:>9.1f} req/s  "
+            f"p50 {self.percentile(50) * 1000:>8.2f} ms  p99 {self.percentile(99) * 1000:>8.2f} ms  "
+            f"errors {self.errors}"
+        )
+
+
+async def run_load(
+    app: Any,
+    path: str,
+    payload: Any,
+    total: int,
+    concurrency: int,
+    make_payload: Optional[Callable[[int], Any]] = None,
+    expected_status: int = 200,
+) -> LoadResult:
+    """POST `total` requests to `path` with `concurrency` clients in flight."""
+    transport = httpx.ASGITransport(app=app)
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker() -> None:
+            nonlocal errors
+            for i in counter:
+                body = make_payload(i) if make_payload else payload
+                started = time.perf_counter()
+                response = await client.post(path, json=body)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != expected_status:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return LoadResult(requests=total, errors=errors, seconds=elapsed, latencies=latencies)
+
+
+async def run_open_loop(app: Any, path: str, payload: Any, rate: float, seconds: float) -> LoadResult:
+    """POST at a fixed arrival rate for `seconds`, whether or not earlier requests finished.
+
+    Unlike run_load, arrivals do not slow down when the server does, so a rate
+    above capacity builds a backlog the way real traffic would. Latencies are
+    measured from each request's scheduled arrival time.
+    """
+    transport = httpx.ASGITransport(app=app)
+    latencies: list[float] = []
+    statuses: list[int] = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def one(arrival: float) -> None:
+            response = await client.post(path, json=payload)
+            latencies.append(time.perf_counter() - arrival)
+            statuses.append(response.status_code)
+
+        total = int(rate * seconds)
+        tasks = []
+        started = time.perf_counter()
+        for i in range(total):
+            arrival = started + i / rate
+            delay = arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(one(arrival)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    errors = sum(status != 200 for status in statuses)
+    return LoadResult(requests=total, errors=errors, seconds=elapsed, latencies=latencies, statuses=statuses)
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+
+import pytest
+
+import app.routers
+from app.config.settings import settings
+from app.main import create_app
+from tests.benchmarks.loadgen import run_open_loop
+
+# A backend with fixed capacity (say, a connection pool): SLOTS concurrent calls of SERVICE_SECONDS each
+SLOTS = 4
+SERVICE_SECONDS = 0.02
+CAPACITY = SLOTS / SERVICE_SECONDS
+SECONDS = 3.0
+PAYLOAD = {"P": 10000, "R": 0.040753, "N": 4, "T": 10}
+
+
+def _overload(monkeypatch, limits: str):
+    """Offer twice the backend's capacity for SECONDS."""
+    original = app.routers._future_value
+
+    async def constrained(*args):
+        async with backend:
+            await asyncio.sleep(SERVICE_SECONDS)
+        return await original(*args)
+
+    async def run():
+        nonlocal backend
+        backend = asyncio.Semaphore(SLOTS)
+        return await run_open_loop(create_app(), "/future-value", PAYLOAD, 2 * CAPACITY, SECONDS)
+
+    backend = None
+    monkeypatch.setattr(app.routers, "_future_value", constrained)
+    monkeypatch.setattr(settings, "ADMISSION_LIMITS", limits)
+    try:
+        return asyncio.run(run())
+    finally:
+        monkeypatch.setattr(app.routers, "_future_value", original)
+
+
+@pytest.mark.slow
+def test_admission_keeps_p99_bounded_under_2x_overload(monkeypatch):
+    """Open-loop arrivals at twice capacity, without and with admission control."""
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_SIZE", 64)
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_TIMEOUT_SECONDS", 0.1)
+    logging.disable(logging.INFO)
+    try:
+        unprotected = _overload(monkeypatch, "")
+        protected = _overload(monkeypatch, f"future-value={SLOTS}")
+    finally:
+        logging.disable(logging.NOTSET)
+
+    admitted = protected.accepted()
+    print()
+    print(f"capacity {CAPACITY:.0f} req/s, offered {2 * CAPACITY:.0f} req/s for {SECONDS:.0f}s")
+    print(unprotected.summary("no admission control"))
+    print(protected.summary("admission: all"))
+    print(admitted.summary("admission: admitted"))
+
+    assert unprotected.errors == 0
+    assert set(protected.statuses) <= {200, settings.ADMISSION_REJECT_STATUS}
+    # About capacity worth of requests still gets through
+    assert admitted.requests > 0.8 * CAPACITY * SECONDS
+    # Without shedding the backlog (and p99) grows for as long as the overload lasts;
+    # with it, admitted requests wait at most the queue timeout plus their service time
+    assert unprotected.percentile(99) > SECONDS / 4
+    assert admitted.percentile(99) < 0.1 + 5 * SERVICE_SECONDS
+    assert protected.percentile(99) < 0.1 + 5 * SERVICE_SECONDS
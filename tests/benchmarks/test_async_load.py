@@ -0,0 +1,56 @@
+import asyncio
+import logging
+import time
+
+import pytest
+from fastapi import FastAPI
+
+from app.config.settings import settings
+from app.main import app
+from app.models import FutureValueRequest, FutureValueResponse
+from app.services import calculate_future_value
+from tests.benchmarks.loadgen import run_load
+
+DELAY = 0.05
+PAYLOAD = {"P": 10000, "R": 0.040753, "N": 4, "T": 10}
+
+
+def legacy_app(delay: float) -> FastAPI:
+    """The pre-async handler shape: a sync def that blocks a threadpool worker while sleeping."""
+    legacy = FastAPI()
+
+    @legacy.post("/future-value", response_model=FutureValueResponse)
+    def future_value(request: FutureValueRequest) -> FutureValueResponse:
+        value = calculate_future_value(request.P, request.R, request.N, request.T)
+        time.sleep(delay)
+        return FutureValueResponse(message=f"Future Value of {round(value)}")
+
+    return legacy
+
+
+@pytest.mark.slow
+def test_async_handlers_are_not_capped_by_threadpool(monkeypatch):
+    """Compare throughput and p99 of the blocking sleep against the asyncio delay."""
+    logging.disable(logging.INFO)
+    try:
+        total, concurrency = 2000, 200
+
+        before = asyncio.run(run_load(legacy_app(DELAY), "/future-value", PAYLOAD, total, concurrency))
+
+        monkeypatch.setattr(settings, "FUTURE_VALUE_DELAY_SECONDS", DELAY)
+        after_delay = asyncio.run(run_load(app, "/future-value", PAYLOAD, total, concurrency))
+
+        monkeypatch.setattr(settings, "FUTURE_VALUE_DELAY_SECONDS", 0.0)
+        after_no_delay = asyncio.run(run_load(app, "/future-value", PAYLOAD, total, concurrency))
+    finally:
+        logging.disable(logging.NOTSET)
+
+    print()
+    print(before.summary(f"before: sync sleep {DELAY}s"))
+    print(after_delay.summary(f"after: asyncio {DELAY}s"))
+    print(after_no_delay.summary("after: delay off"))
+
+    assert before.errors == after_delay.errors == after_no_delay.errors == 0
+    # The blocking version is capped at threadpool_size / DELAY requests per second
+    assert after_delay.rps > 1.5 * before.rps
+    assert after_delay.percentile(99) < before.percentile(99)
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+
+import httpx
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.main import app
+from app.models import FutureValueGridRequest, FutureValueRequest, FutureValueResponse, RequiredRateRequest
+from app.responses import FastJSONResponse, future_value_result
+from app.routers import future_value_grid_response, future_value_message
+from app import services
+from app.services import (
+    calculate_future_value,
+    calculate_future_value_batch,
+    calculate_future_value_decimal,
+    calculate_required_rate,
+    RateSchedule,
+)
+from app.solver import solve, solve_batch
+
+pytestmark = pytest.mark.slow
+
+FUTURE_VALUE = {"P": 10000, "R": 0.040753, "N": 4, "T": 10}
+REQUIRED_RATE = {"FV": 15000, "P": 10000, "N": 4, "T": 10}
+BATCH_ROWS = 10_000
+
+
+@pytest.fixture
+def quiet_logs():
+    logging.disable(logging.INFO)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+# Services
+
+def test_bench_calculate_future_value(bench):
+    bench("services.calculate_future_value", lambda: calculate_future_value(10000.0, 0.040753, 4, 10), number=100_000)
+
+
+def test_bench_calculate_future_value_daily(bench):
+    bench("services.calculate_future_value_daily_40y", lambda: calculate_future_value(10000.0, 0.05, 365, 40), number=100_000)
+
+
+def test_bench_calculate_future_value_decimal_daily(bench):
+    # Repeated (R, N, T): the growth factor comes from the cache
+    bench("services.calculate_future_value_decimal_daily_40y", lambda: calculate_future_value_decimal(10000.0, 0.05, 365, 40), number=50_000)
+
+
+def test_bench_calculate_future_value_decimal_daily_uncached(bench):
+    def uncached() -> None:
+        services.decimal_growth_factor.cache_clear()
+        services._decimal_squares.clear()
+        calculate_future_value_decimal(10000.0, 0.05, 365, 40)
+
+    bench("services.calculate_future_value_decimal_daily_40y_uncached", uncached, number=5_000)
+
+
+def test_bench_calculate_required_rate(bench):
+    bench("services.calculate_required_rate", lambda: calculate_required_rate(15000.0, 10000.0, 4, 10), number=100_000)
+
+
+def test_bench_calculate_future_value_batch(bench):
+    P, R, N, T = [10000.0] * BATCH_ROWS, [0.040753] * BATCH_ROWS, [4] * BATCH_ROWS, [10] * BATCH_ROWS
+    bench(
+        "services.calculate_future_value_batch_row",
+        lambda: calculate_future_value_batch(P, R, N, T),
+        number=20,
+        calls_per_op=BATCH_ROWS,
+    )
+
+
+def test_bench_solve_rate_with_contributions(bench):
+    bench("solver.solve_rate_newton", lambda: solve("R", FV=34581.90, P=10000.0, N=12, T=10, PMT=100.0), number=10_000)
+
+
+def test_bench_solve_batch_rate_with_contributions(bench):
+    FV, P, N, T, PMT = [34581.90] * BATCH_ROWS, [10000.0] * BATCH_ROWS, [12] * BATCH_ROWS, [10] * BATCH_ROWS, [100.0] * BATCH_ROWS
+    bench(
+        "solver.solve_batch_rate_newton_row",
+        lambda: solve_batch("R", FV=FV, P=P, N=N, T=T, PMT=PMT),
+        number=5,
+        calls_per_op=BATCH_ROWS,
+    )
+
+
+# 5 principals x 1000 rates x 4 compounding frequencies x 50 terms = 10^6 cells
+GRID = {
+    "P": [1000, 5000, 10000, 50000, 100000],
+    "R": {"start": 0.001, "stop": 0.2, "num": 1000},
+    "N": [1, 4, 12, 365],
+    "T": {"start": 1, "stop": 50, "num": 50},
+}
+
+
+@pytest.mark.parametrize("encoding", ["json", "base64"])
+def test_bench_future_value_grid(bench, encoding):
+    """Evaluate and render a 10^6-cell grid, the work done per /future-value/grid request."""
+    request = FutureValueGridRequest(**GRID, encoding=encoding)
+    seconds = bench(f"grid.future_value_1m_cells_{encoding}", lambda: future_value_grid_response(request), number=3)
+    assert seconds < 0.1
+
+
+# Monthly rate resets over 100 years, compounded daily
+SCHEDULE_RATES = [0.01 + 0.04 * (month % 12) / 11 for month in range(1200)]
+SCHEDULE_YEARS = [1 / 12] * 1200
+HORIZONS = [100 * k / 10_000 for k in range(1, 10_001)]
+
+
+def test_bench_rate_schedule(bench):
+    """Build the index once, then value P at many horizons: a binary search per horizon, not a product per period."""
+    bench("services.rate_schedule_build_1200_segments", lambda: RateSchedule(SCHEDULE_RATES, SCHEDULE_YEARS, 365), number=200)
+    schedule = RateSchedule(SCHEDULE_RATES, SCHEDULE_YEARS, 365)
+    seconds = bench(
+        "services.rate_schedule_horizon",
+        lambda: schedule.future_values(10000.0, 0.0, HORIZONS),
+        number=20,
+        calls_per_op=len(HORIZONS),
+    )
+    # Multiplying out 100 years of daily periods takes milliseconds per horizon
+    assert seconds < 2e-6
+
+
+# Validation
+
+def test_bench_validate_future_value_request(bench):
+    bench("models.FutureValueRequest", lambda: FutureValueRequest.model_validate(FUTURE_VALUE), number=100_000)
+
+
+def test_bench_validate_required_rate_request(bench):
+    bench("models.RequiredRateRequest", lambda: RequiredRateRequest.model_validate(REQUIRED_RATE), number=100_000)
+
+
+# Response serialization
+
+def test_bench_serialize_message_response(bench):
+    # What the legacy route pays: message formatting, response_model
+    # re-validation and FastAPI's generic JSON rendering
+    # Uncached so the message formatting is measured too
+    format_message = getattr(future_value_message, "__wrapped__", future_value_message)
+
+    def serialize() -> bytes:
+        response = FutureValueResponse(message=format_message(10000.0, 0.040753, 4, 10))
+        validated = FutureValueResponse.model_validate(response.model_dump())
+        return JSONResponse(jsonable_encoder(validated)).body
+
+    bench("serialize.future_value_message", serialize, number=50_000)
+
+
+def test_bench_serialize_structured_response(bench):
+    def serialize() -> bytes:
+        value = calculate_future_value(10000.0, 0.040753, 4, 10)
+        return FastJSONResponse(future_value_result(value, 10000.0, 0.040753, 4, 10)).body
+
+    bench("serialize.future_value_structured", serialize, number=50_000)
+
+
+# End-to-end through the ASGI app, in process
+
+def _asgi_requests(path: str, payload: dict, count: int):
+    async def run() -> None:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for _ in range(count):
+                response = await client.post(path, json=payload)
+                assert response.status_code == 200
+
+    return lambda: asyncio.run(run())
+
+
+def test_bench_http_future_value(bench, quiet_logs):
+    bench("http.post_future_value", _asgi_requests("/future-value", FUTURE_VALUE, 200), number=1, calls_per_op=200)
+
+
+def test_bench_http_required_rate(bench, quiet_logs):
+    bench("http.post_required_rate", _asgi_requests("/required-rate", REQUIRED_RATE, 200), number=1, calls_per_op=200)
+
+
+def test_bench_http_future_value_v2(bench, quiet_logs):
+    bench("http.post_future_value_v2", _asgi_requests("/v2/future-value", FUTURE_VALUE, 200), number=1, calls_per_op=200)
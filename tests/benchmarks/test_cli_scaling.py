@@ -0,0 +1,44 @@
+import io
+import random
+import time
+
+import pytest
+
+from app.cli import calculate_file
+from app.server import available_cpus
+
+ROWS = 1_000_000
+
+
+@pytest.fixture(scope="module")
+def scenarios(tmp_path_factory):
+    rng = random.Random(0)
+    path = tmp_path_factory.mktemp("cli") / "scenarios.csv"
+    with path.open("w") as f:
+        f.write("P,R,N,T\n")
+        for _ in range(ROWS):
+            f.write(f"{rng.randint(100, 100000)},{rng.randint(1, 150) / 1000},{rng.choice((1, 4, 12, 365))},{rng.randint(1, 40)}\n")
+    return path
+
+
+def _rows_per_second(path, workers: int) -> float:
+    started = time.perf_counter()
+    with path.open("rb") as source:
+        progress = calculate_file("future-value", source, io.BytesIO(), "csv", "csv", workers)
+    elapsed = time.perf_counter() - started
+    assert progress.rows == ROWS and progress.errors == 0
+    return ROWS / elapsed
+
+
+@pytest.mark.slow
+def test_cli_throughput_scales_with_workers(scenarios):
+    """End-to-end rows/sec (read, parse, evaluate, write in order) for 1..N worker processes."""
+    cpus = int(available_cpus())
+    counts = [w for w in (1, 2, 4, 8, 16) if w <= cpus]
+    results = {w: _rows_per_second(scenarios, w) for w in counts}
+
+    print()
+    for w, rate in results.items():
+        print(f"workers {w:>2}: {rate:>10.0f} rows/s  scaling efficiency {rate / (w * results[1]):.2f}")
+    for w, rate in results.items():
+        assert rate / (w * results[1]) > 0.7, f"{w} workers scaled poorly"
@@ -0,0 +1,56 @@
+import asyncio
+import logging
+
+import pytest
+
+from app import metrics
+from app.config.settings import settings
+from app.main import app
+from tests.benchmarks.loadgen import LoadResult, run_load
+
+TOTAL = 2000
+
+
+def _distinct(i: int) -> dict:
+    return {"P": 10000 + i, "R": 0.05, "N": 12, "T": 10}
+
+
+def _run(monkeypatch: pytest.MonkeyPatch, enabled: bool, concurrency: int, identical: bool) -> LoadResult:
+    monkeypatch.setattr(settings, "COALESCE_ENABLED", enabled)
+    # Structured route, so the message cache does not hide the calculation
+    payload = _distinct(0) if identical else None
+    return asyncio.run(run_load(
+        app, "/v2/future-value", payload, TOTAL, concurrency, make_payload=None if identical else _distinct,
+    ))
+
+
+@pytest.mark.slow
+def test_coalescing_latency_throughput_tradeoff(monkeypatch):
+    """Throughput and latency with coalescing off/on, at low and high concurrency."""
+    logging.disable(logging.INFO)
+    results = {}
+    try:
+        for concurrency in (1, 200):
+            for identical in (False, True):
+                for enabled in (False, True):
+                    batches_before = metrics.coalesced_batch_size.count("future-value")
+                    result = _run(monkeypatch, enabled, concurrency, identical)
+                    batches = metrics.coalesced_batch_size.count("future-value") - batches_before
+                    results[(concurrency, identical, enabled)] = (result, batches)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    print()
+    for (concurrency, identical, enabled), (result, batches) in results.items():
+        label = f"c={concurrency} {'identical' if identical else 'distinct'} {'on' if enabled else 'off'}"
+        print(result.summary(label) + (f"  batches {batches}" if enabled else ""))
+
+    for result, _ in results.values():
+        assert result.errors == 0
+    # Under concurrency, distinct requests are evaluated many rows per batch...
+    assert results[(200, False, True)][1] < TOTAL / 10
+    # ...and identical ones mostly share an in-flight result
+    assert results[(200, True, True)][1] < TOTAL / 10
+    # Serial requests pay at most the window (plus scheduling) in added latency
+    added = results[(1, False, True)][0].percentile(50) - results[(1, False, False)][0].percentile(50)
+    assert added < settings.COALESCE_WINDOW_SECONDS + 0.002
@@ -0,0 +1,69 @@
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parents[2]
+BUDGET = float(os.getenv("COLD_START_BUDGET_SECONDS", "2.0"))
+BODY = b'{"P": 10000, "R": 0.05, "N": 4, "T": 1}'
+REQUEST = (
+    b"POST /future-value HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+    b"Content-Length: %d\r\nConnection: close\r\n\r\n%s" % (len(BODY), BODY)
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _try_request(port: int) -> bool:
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=1) as sock:
+            sock.sendall(REQUEST)
+            return sock.recv(64).startswith(b"HTTP/1.1 200")
+    except OSError:
+        return False
+
+
+def _import_report(tmp_path: Path) -> list[tuple[int, str]]:
+    """Top cumulative import times (us) for building the app, from -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main; app.main.app"],
+        cwd=tmp_path, env={**os.environ, "PYTHONPATH": str(ROOT)}, capture_output=True, text=True, check=True,
+    )
+    rows = re.findall(r"import time:\s+\d+ \|\s+(\d+) \| (\s*\S+)", result.stderr)
+    top_level = [(int(us), name.strip()) for us, name in rows if not name.startswith("  ")]
+    return sorted(top_level, reverse=True)[:8]
+
+
+@pytest.mark.slow
+def test_time_to_first_request_within_budget(tmp_path):
+    """Wall time from spawning uvicorn to the first successful /future-value response."""
+    port = _free_port()
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "LOGS_DIR": str(tmp_path / "logs"), "ENVIRONMENT": "production"}
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=tmp_path, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while not _try_request(port):
+            assert server.poll() is None, "server exited during startup"
+            assert time.perf_counter() - started < 30, "server did not start"
+            time.sleep(0.005)
+        elapsed = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    print(f"\ntime to first served request: {elapsed * 1000:.0f} ms (budget {BUDGET * 1000:.0f} ms)")
+    for us, name in _import_report(tmp_path):
+        print(f"  import {name:<40} {us / 1000:8.1f} ms")
+    assert elapsed < BUDGET
@@ -0,0 +1,30 @@
+import timeit
+
+import pytest
+
+from app import services
+from app.growth_index import load_growth_index
+from app.services import calculate_future_value
+
+NUMBER = 200_000
+
+
+def _per_call_ns(R: float, N: int, T: int) -> float:
+    timer = timeit.Timer(lambda: calculate_future_value(10000.0, R, N, T))
+    return min(timer.repeat(repeat=5, number=NUMBER)) / NUMBER * 1e9
+
+
+@pytest.mark.slow
+def test_grid_lookup_vs_direct_compute():
+    services.set_growth_index(None)
+    compute = _per_call_ns(0.05, 12, 30)
+    services.set_growth_index(load_growth_index())
+    try:
+        lookup = _per_call_ns(0.05, 12, 30)
+        miss = _per_call_ns(0.050001, 12, 30)
+    finally:
+        services.set_growth_index(None)
+
+    print(f"\ncompute {compute:.0f} ns/call  lookup {lookup:.0f} ns/call  off-grid miss {miss:.0f} ns/call")
+    # Timings at this scale are noisy; guard against the lookup becoming a slowdown
+    assert lookup < compute * 1.1
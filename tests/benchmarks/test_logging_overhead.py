@@ -0,0 +1,67 @@
+import logging
+import logging.handlers
+import time
+
+import pytest
+
+from app.config import logging_config
+from app.config.logging_config import MirosecondFormatter, install_queue_handlers, sample_success_log
+from app.config.settings import settings
+from app.models import FutureValueResponse
+
+REQUESTS = 20_000
+RESPONSE = FutureValueResponse(message="Future Value of 15000 when starting with 10000 compounded at 0.040753 interest rate, 4 times per year over 10 years")
+
+
+def _file_logger(name: str, path) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = logging.handlers.RotatingFileHandler(path, maxBytes=1_048_576, backupCount=2)
+    handler.setFormatter(MirosecondFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s", "%Y-%m-%d %H:%M:%S"))
+    logger.addHandler(handler)
+    return logger
+
+
+def _eager(logger: logging.Logger) -> float:
+    """The previous request logging: eager f-strings written synchronously."""
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        logger.info(f"Received Future-value request: P={10000.0}, R={0.040753}, N={4}, T={10}")
+        logger.info(f"Future-value calculation completed in {0.000123:.4f} seconds")
+        logger.info(f"Future-value response: {RESPONSE}")
+    return (time.perf_counter() - started) / REQUESTS
+
+
+def _lazy(logger: logging.Logger) -> float:
+    """The current request logging: sampled, lazily formatted records."""
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        if sample_success_log("future-value"):
+            logger.info("Received Future-value request: P=%s, R=%s, N=%s, T=%s", 10000.0, 0.040753, 4, 10)
+            logger.info("Future-value calculation completed in %.4f seconds", 0.000123)
+            logger.info("Future-value response: %s", RESPONSE)
+    return (time.perf_counter() - started) / REQUESTS
+
+
+@pytest.mark.slow
+def test_logging_overhead_per_request(tmp_path, monkeypatch):
+    before = _eager(_file_logger("bench.sync", tmp_path / "sync.log"))
+
+    logger = _file_logger("bench.queued", tmp_path / "queued.log")
+    (listener,) = install_queue_handlers([logger])
+    try:
+        queued = _lazy(logger)
+        monkeypatch.setattr(settings, "LOG_SAMPLE_RATES", "future-value=0.1")
+        sampled = _lazy(logger)
+    finally:
+        listener.stop()
+        logging_config._listeners.remove(listener)
+
+    print(
+        f"\nlogging per request: sync file {before * 1e6:.1f} us  "
+        f"queued {queued * 1e6:.1f} us  queued + 10% sampling {sampled * 1e6:.1f} us"
+    )
+    assert queued < before
+    assert sampled < queued
@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+import pytest
+
+from app.metrics import Counter, Histogram, MetricsMiddleware
+
+REQUESTS = 100_000
+
+
+class _Route:
+    path = "/future-value"
+
+
+async def _endpoint(scope, receive, send):
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _noop_send(message):
+    pass
+
+
+async def _per_request(app) -> float:
+    scope = {"type": "http", "method": "POST"}
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        await app(dict(scope), None, _noop_send)
+    return (time.perf_counter() - started) / REQUESTS
+
+
+@pytest.mark.slow
+def test_metrics_recording_overhead(monkeypatch):
+    """Middleware cost per request = timed request through middleware - bare endpoint."""
+    # Fresh metrics so the benchmark does not touch the process-wide registry
+    monkeypatch.setattr("app.metrics.http_requests", Counter("r", "r", ("method", "route", "status")))
+    monkeypatch.setattr("app.metrics.http_request_duration", Histogram("d", "d", ("method", "route")))
+
+    bare = min(asyncio.run(_per_request(_endpoint)) for _ in range(3))
+    wrapped = min(asyncio.run(_per_request(MetricsMiddleware(_endpoint))) for _ in range(3))
+    overhead_us = (wrapped - bare) * 1e6
+
+    print(f"\nmetrics middleware overhead: {overhead_us:.2f} us/request (bare endpoint {bare * 1e6:.2f} us)")
+    assert overhead_us < 5
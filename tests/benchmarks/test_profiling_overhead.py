@@ -0,0 +1,53 @@
+import asyncio
+import time
+
+import pytest
+
+from app.config.settings import settings
+from app.profiling import ProfilingMiddleware, phase
+
+REQUESTS = 100_000
+
+
+async def _endpoint(scope, receive, send):
+    with phase("handler"):
+        with phase("compute"):
+            pass
+        with phase("logging"):
+            pass
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _bare_endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _noop_send(message):
+    pass
+
+
+async def _per_request(app) -> float:
+    scope = {"type": "http", "method": "POST", "path": "/future-value", "headers": [(b"content-type", b"application/json")]}
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        await app(scope, None, _noop_send)
+    return (time.perf_counter() - started) / REQUESTS
+
+
+@pytest.mark.slow
+def test_unprofiled_request_overhead(monkeypatch):
+    """Cost of phase markers, and of the installed middleware on requests it does not pick."""
+    monkeypatch.setattr(settings, "PROFILE_TOKEN", "s3cret")
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+
+    bare = min(asyncio.run(_per_request(_bare_endpoint)) for _ in range(3))
+    markers = min(asyncio.run(_per_request(_endpoint)) for _ in range(3))
+    middleware = min(asyncio.run(_per_request(ProfilingMiddleware(_endpoint))) for _ in range(3))
+    markers_us = (markers - bare) * 1e6
+    middleware_us = (middleware - markers) * 1e6
+
+    print(f"\nphase markers: {markers_us:.2f} us/request, idle profiling middleware: {middleware_us:.2f} us/request")
+    assert markers_us < 1
+    assert middleware_us < 2
@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+import pytest
+
+from app.config.settings import settings
+from app.executor import shutdown_executor
+from app.server import available_cpus
+from app.simulation import SimulationParams, run_simulation
+
+PARAMS = SimulationParams(P=10000, R=0.06, volatility=0.15, N=12, T=30, PMT=100)
+PATHS = 400_000
+
+
+def _paths_per_second(workers: int, monkeypatch: pytest.MonkeyPatch) -> float:
+    monkeypatch.setattr(settings, "SIMULATION_WORKERS", workers)
+    monkeypatch.setattr(settings, "SIMULATION_PARALLEL_MIN_PATHS", 1)
+    monkeypatch.setattr(settings, "SIMULATION_TIME_BUDGET_SECONDS", 600)
+    try:
+        # Warm-up run starts the worker processes (spawn + numpy import)
+        asyncio.run(run_simulation(PARAMS, workers * settings.SIMULATION_CHUNK_PATHS, 0, [50]))
+        started = time.perf_counter()
+        result = asyncio.run(run_simulation(PARAMS, PATHS, 1, [10, 50, 90]))
+        elapsed = time.perf_counter() - started
+    finally:
+        shutdown_executor()
+    assert result.paths == PATHS
+    return PATHS / elapsed
+
+
+@pytest.mark.slow
+def test_simulation_throughput_scales_with_workers(monkeypatch):
+    """Simulated paths/sec (monthly compounding over 30 years) for 1..N worker processes."""
+    cpus = int(available_cpus())
+    counts = [w for w in (1, 2, 4, 8, 16) if w <= cpus]
+    results = {w: _paths_per_second(w, monkeypatch) for w in counts}
+
+    print()
+    for w, rate in results.items():
+        print(f"workers {w:>2}: {rate:>10.0f} paths/s  scaling efficiency {rate / (w * results[1]):.2f}")
+    for w, rate in results.items():
+        assert rate / (w * results[1]) > 0.7, f"{w} workers scaled poorly"
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import resource
+import sys
+import time
+
+import pytest
+
+from app.main import app
+
+ROW = b'{"P": 10000, "R": 0.040753, "N": 4, "T": 10}\n'
+ROWS_PER_CHUNK = 2000
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def _drive(rows: int) -> tuple[int, int]:
+    """Push `rows` NDJSON rows through the ASGI app, discarding output as it arrives."""
+    chunk = ROW * ROWS_PER_CHUNK
+    remaining = rows // ROWS_PER_CHUNK
+    out_bytes = out_lines = 0
+    status = 0
+
+    async def receive():
+        nonlocal remaining
+        remaining -= 1
+        return {"type": "http.request", "body": chunk, "more_body": remaining > 0}
+
+    async def send(message):
+        nonlocal out_bytes, out_lines, status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            out_bytes += len(body)
+            out_lines += body.count(b"\n")
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/future-value/stream",
+        "raw_path": b"/future-value/stream",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/x-ndjson")],
+        "client": ("bench", 0),
+        "server": ("bench", 80),
+    }
+    await app(scope, receive, send)
+    assert status == 200
+    return out_lines, out_bytes
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("rows", [1_000_000, 10_000_000])
+def test_streaming_memory_stays_flat(rows):
+    """Report rows/sec and peak RSS; peak RSS must not grow with input size."""
+    logging.disable(logging.INFO)
+    try:
+        asyncio.run(_drive(ROWS_PER_CHUNK * 10))  # warm up imports and the executor
+        rss_before = _peak_rss_mb()
+        started = time.perf_counter()
+        out_lines, out_bytes = asyncio.run(_drive(rows))
+        elapsed = time.perf_counter() - started
+        rss_after = _peak_rss_mb()
+    finally:
+        logging.disable(logging.NOTSET)
+
+    print(
+        f"\n{rows:>11,} rows  {rows / elapsed:>10,.0f} rows/s  "
+        f"in {len(ROW) * rows / 2**20:,.0f} MiB  out {out_bytes / 2**20:,.0f} MiB  "
+        f"peak RSS {rss_after:,.1f} MiB (+{rss_after - rss_before:,.1f} MiB)"
+    )
+    assert out_lines == rows
+    assert rss_after - rss_before < 64
@@ -0,0 +1,91 @@
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from app.server import available_cpus
+
+ROOT = Path(__file__).parents[2]
+DURATION = 5.0
+BODY = json.dumps({"P": 10000, "R": 0.040753, "N": 4, "T": 10})
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _client(port: int, duration: float) -> int:
+    """One keep-alive connection issuing requests back to back; returns completed requests."""
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    headers = {"Content-Type": "application/json"}
+    done = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        connection.request("POST", "/future-value", BODY, headers)
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 200
+        done += 1
+    connection.close()
+    return done
+
+
+def _wait_until_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/metrics")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError("server did not start")
+
+
+def _throughput(workers: int, tmp_path: Path) -> float:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT),
+        "ENVIRONMENT": "production",
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+        "WEB_CONCURRENCY": str(workers),
+        "LOG_SAMPLE_RATES": "future-value=0",
+        "LOGS_DIR": str(tmp_path / "logs"),
+    }
+    server = subprocess.Popen([sys.executable, "-m", "app.server"], cwd=tmp_path, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_until_ready(port)
+        clients = 2 * workers
+        with multiprocessing.get_context("spawn").Pool(clients) as pool:
+            counts = pool.starmap(_client, [(port, DURATION)] * clients)
+        return sum(counts) / DURATION
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+@pytest.mark.slow
+def test_throughput_scales_with_workers(tmp_path):
+    """Requests/sec for 1..N workers; N is limited so clients (2 per worker) have cores too."""
+    cpus = int(available_cpus())
+    counts = [w for w in (1, 2, 4, 8, 16) if w == 1 or 3 * w <= cpus]
+    results = {w: _throughput(w, tmp_path) for w in counts}
+
+    print()
+    for w, rps in results.items():
+        print(f"workers {w:>2}: {rps:>9.0f} req/s  scaling efficiency {rps / (w * results[1]):.2f}")
+    for w, rps in results.items():
+        assert rps / (w * results[1]) > 0.7, f"{w} workers scaled poorly"
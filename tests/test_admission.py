@@ -0,0 +1,121 @@
+import asyncio
+
+import httpx
+
+from app import metrics
+from app.admission import AdmissionLimiter, AdmissionMiddleware, parse_limits, worker_share
+from app.config.settings import settings
+from app.main import create_app
+
+BODY = {"P": 10000, "R": 0.05, "N": 12, "T": 10}
+
+
+def test_parse_limits_normalizes_paths_and_skips_zero():
+    assert parse_limits(" /future-value=4, required-rate=2,grid=0,") == {"future-value": 4, "required-rate": 2}
+
+
+def test_limits_are_split_across_workers(monkeypatch):
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 3)
+    monkeypatch.setattr(settings, "ADMISSION_LIMITS", "future-value=64,required-rate=2")
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_SIZE", 128)
+    limiters = AdmissionMiddleware(None).limiters
+    assert limiters["/future-value"].limit == 21 and limiters["/future-value"].queue_size == 42
+    # Every worker admits at least one request; a queue of 0 stays disabled
+    assert limiters["/required-rate"].limit == worker_share(2) == 1
+    assert worker_share(0) == 0
+
+
+def test_admission_is_not_installed_unless_configured(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_LIMITS", "")
+    app = create_app()
+    assert AdmissionMiddleware not in [middleware.cls for middleware in app.user_middleware]
+
+
+def test_released_slots_go_to_waiters_in_arrival_order():
+    async def scenario():
+        limiter = AdmissionLimiter("test-fifo", limit=1, queue_size=2, timeout=1.0)
+        assert await limiter.acquire() is None
+        order = []
+
+        async def wait(name):
+            order.append((name, await limiter.acquire()))
+
+        waiters = [asyncio.create_task(wait(name)) for name in ("a", "b")]
+        await asyncio.sleep(0)
+        # The queue is full
+        assert await limiter.acquire() == "queue_full"
+        assert metrics.admission_queue_depth.value("test-fifo") == 2
+
+        limiter.release(0.01)
+        limiter.release(0.01)
+        await asyncio.gather(*waiters)
+        assert order == [("a", None), ("b", None)]
+        assert limiter.in_flight == 1 and metrics.admission_queue_depth.value("test-fifo") == 0
+        limiter.release(0.01)
+        assert limiter.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_requests_that_would_miss_the_deadline_are_shed_without_waiting():
+    async def scenario():
+        limiter = AdmissionLimiter("test-deadline", limit=2, queue_size=10, timeout=0.05)
+        limiter.service_time = 0.2
+        assert await limiter.acquire() is None
+        assert await limiter.acquire() is None
+        # One slot frees up in about 0.2 / 2 seconds, after the deadline
+        assert await limiter.acquire() == "deadline"
+        assert limiter.retry_after() == 1
+
+        limiter.service_time = 0.0
+        assert await limiter.acquire() == "timeout"
+        assert limiter.in_flight == 2 and metrics.admission_queue_depth.value("test-deadline") == 0
+
+    asyncio.run(scenario())
+
+
+def test_slot_handed_over_as_the_timeout_fires_is_kept(monkeypatch):
+    limiter = AdmissionLimiter("test-handover", limit=1, queue_size=2, timeout=0.05)
+
+    async def hand_over_then_time_out(waiter, timeout):
+        # release() and the timeout land in the same loop iteration
+        limiter.release(0.01)
+        raise asyncio.TimeoutError
+
+    async def scenario():
+        assert await limiter.acquire() is None
+        monkeypatch.setattr(asyncio, "wait_for", hand_over_then_time_out)
+        assert await limiter.acquire() is None
+        assert limiter.in_flight == 1 and metrics.admission_queue_depth.value("test-handover") == 0
+        limiter.release(0.01)
+        assert limiter.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_overload_is_rejected_with_retry_after(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_LIMITS", "future-value=1")
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_SIZE", 0)
+    monkeypatch.setattr(settings, "ADMISSION_REJECT_STATUS", 429)
+    monkeypatch.setattr(settings, "FUTURE_VALUE_DELAY_SECONDS", 0.1)
+    shed_before = metrics.admission_shed.value("future-value", "queue_full")
+    rejected_before = metrics.http_requests.value("POST", "/future-value", "429")
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=create_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.post("/future-value", json=BODY) for _ in range(3)))
+
+    responses = asyncio.run(scenario())
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200, 429, 429]
+    rejected = next(response for response in responses if response.status_code == 429)
+    assert int(rejected.headers["retry-after"]) >= 1
+    assert rejected.json() == {"detail": "Server is overloaded, retry later"}
+    assert metrics.admission_shed.value("future-value", "queue_full") == shed_before + 2
+    assert metrics.http_requests.value("POST", "/future-value", "429") == rejected_before + 2
+
+
+def test_only_configured_endpoints_are_limited(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_LIMITS", "future-value=1")
+    assert set(AdmissionMiddleware(None).limiters) == {"/future-value"}
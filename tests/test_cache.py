@@ -0,0 +1,67 @@
+import threading
+
+from app.cache import LRUCache, memoize
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_eviction_order():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (3, 1, 1, 2)
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = LRUCache(max_size=10, ttl_seconds=5, clock=clock)
+    cache.set("a", 1)
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert cache.stats().expirations == 1
+
+
+def test_memoize_canonicalizes_numeric_arguments():
+    calls = []
+
+    @memoize(LRUCache(max_size=10))
+    def add(a, b):
+        calls.append((a, b))
+        return a + b
+
+    assert add(10000, 0.05) == add(10000.0, 0.05) == add(10000, 0.05)
+    assert calls == [(10000, 0.05)]
+    assert add.cache.stats().hit_rate == 2 / 3
+
+
+def test_memoize_is_thread_safe():
+    cache = LRUCache(max_size=50)
+    square = memoize(cache)(lambda x: x * x)
+
+    def hammer():
+        for i in range(2000):
+            assert square(i % 100) == (i % 100) ** 2
+
+    threads = [threading.Thread(target=hammer) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert stats.hits + stats.misses == 16000
+    assert stats.size == 50
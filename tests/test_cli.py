@@ -0,0 +1,73 @@
+import io
+import json
+
+import pytest
+
+from app.cli import main, read_chunks
+from app.services import calculate_future_value, calculate_required_rate
+
+
+def test_chunks_end_on_line_boundaries_and_carry_line_numbers():
+    data = b"aaaa\nbb\n\ncccccccccccc\nd"
+    chunks = list(read_chunks(io.BytesIO(data), 5, line=2))
+    assert b"".join(chunk.data for chunk in chunks) == data
+    assert all(chunk.data.endswith(b"\n") for chunk in chunks[:-1])
+    # A line longer than the chunk size is kept whole
+    assert [(chunk.line, chunk.data) for chunk in chunks] == [
+        (2, b"aaaa\n"), (3, b"bb\n\n"), (5, b"cccccccccccc\n"), (6, b"d")
+    ]
+
+
+def test_csv_rows_are_reported_by_line_number(tmp_path, capsys):
+    source = tmp_path / "scenarios.csv"
+    source.write_text("T,N,R,P\n10,12,0.05,10000\n\n1,1,x,1\r\n10,12,0.05,-5\n30,4,0.07,2500")
+    output = tmp_path / "results.csv"
+
+    assert main(["future-value", str(source), "-o", str(output), "-w", "0"]) == 0
+    assert output.read_text().splitlines() == [
+        "line,future_value,error",
+        f"2,{calculate_future_value(10000, 0.05, 12, 10)!r},",
+        "4,,\"Invalid row: could not convert string to float: 'x'\"",
+        '5,,"Invalid input: P must be greater than 0"',
+        f"6,{calculate_future_value(2500, 0.07, 4, 30)!r},",
+    ]
+    assert "4 rows (2 errors)" in capsys.readouterr().err
+
+
+def test_future_value_rounds_half_cent_ties_like_the_api(tmp_path):
+    source = tmp_path / "scenarios.ndjson"
+    source.write_text('{"P": 1000, "R": 0.175, "N": 1, "T": 2}\n')
+    output = tmp_path / "results.ndjson"
+
+    assert main(["future-value", str(source), "-o", str(output), "-w", "0", "-q"]) == 0
+    assert json.loads(output.read_text())["future_value"] == calculate_future_value(1000, 0.175, 1, 2) == 1380.63
+
+
+def test_worker_pool_writes_results_in_input_order(tmp_path):
+    rows = [{"FV": 20000 + 97 * i, "P": 10000, "N": 12, "T": 1 + i % 30} for i in range(2000)]
+    source = tmp_path / "scenarios.ndjson"
+    source.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    inline, pooled = tmp_path / "inline.ndjson", tmp_path / "pooled.ndjson"
+
+    main(["required-rate", str(source), "-o", str(inline), "-w", "0", "-q"])
+    main(["required-rate", str(source), "-o", str(pooled), "-w", "2", "--chunk-bytes", "4096", "-q"])
+    assert pooled.read_bytes() == inline.read_bytes()
+    results = [json.loads(line) for line in pooled.read_text().splitlines()]
+    assert [r["line"] for r in results] == list(range(1, len(rows) + 1))
+    assert results[-1]["rate"] == calculate_required_rate(**rows[-1])
+
+
+def test_invalid_csv_header_fails_before_any_work(tmp_path, capsys):
+    source = tmp_path / "scenarios.csv"
+    source.write_text("P,R\n1,2\n")
+    with pytest.raises(SystemExit) as exc:
+        main(["future-value", str(source), "-o", str(tmp_path / "out.csv"), "-w", "0"])
+    assert exc.value.code == 1
+    assert "missing column(s) N, T" in capsys.readouterr().err
+
+
+def test_format_is_required_when_the_file_name_does_not_tell(capsys):
+    with pytest.raises(SystemExit) as exc:
+        main(["future-value", "-"])
+    assert exc.value.code == 2
+    assert "--format" in capsys.readouterr().err
@@ -0,0 +1,60 @@
+import asyncio
+
+from app.coalescer import Coalescer
+from app.config.settings import settings
+from app.services import BatchResult, calculate_future_value, calculate_future_value_batch
+
+
+def recording(calls: list):
+    def batch(P, R, N, T):
+        calls.append(list(P))
+        return calculate_future_value_batch(P, R, N, T)
+    return batch
+
+
+def test_distinct_calls_share_one_batch():
+    calls: list = []
+    coalescer = Coalescer("test", recording(calls))
+
+    async def run():
+        return await asyncio.gather(*(coalescer.submit(1000 + i, 0.05, 12, 10) for i in range(20)))
+
+    values = asyncio.run(run())
+    assert calls == [[1000 + i for i in range(20)]]
+    assert values == [calculate_future_value(1000 + i, 0.05, 12, 10) for i in range(20)]
+
+
+def test_identical_calls_are_computed_once():
+    calls: list = []
+    coalescer = Coalescer("test", recording(calls))
+
+    async def run():
+        # 10000 and 10000.0 canonicalize to the same key
+        return await asyncio.gather(*(coalescer.submit(10000 if i % 2 else 10000.0, 0.05, 12, 10) for i in range(50)))
+
+    assert len(set(asyncio.run(run()))) == 1
+    assert calls == [[10000]]
+
+
+def test_max_batch_dispatches_without_waiting(monkeypatch):
+    monkeypatch.setattr(settings, "COALESCE_MAX_BATCH", 4)
+    monkeypatch.setattr(settings, "COALESCE_WINDOW_SECONDS", 60)
+    calls: list = []
+    coalescer = Coalescer("test", recording(calls))
+
+    async def run():
+        return await asyncio.wait_for(asyncio.gather(*(coalescer.submit(i + 1, 0.05, 1, 1) for i in range(8))), 5)
+
+    asyncio.run(run())
+    assert [len(rows) for rows in calls] == [4, 4]
+
+
+def test_row_errors_only_fail_their_caller():
+    coalescer = Coalescer("test", lambda P: BatchResult([1.0, None], {1: "Invalid input: P must be greater than 0"}))
+
+    async def run():
+        return await asyncio.gather(coalescer.submit(1), coalescer.submit(-1), return_exceptions=True)
+
+    ok, error = asyncio.run(run())
+    assert ok == 1.0
+    assert isinstance(error, ValueError) and "P must be greater than 0" in str(error)
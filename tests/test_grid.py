@@ -0,0 +1,52 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.grid import calculate_future_value_grid, round_like_builtin
+from app.services import calculate_future_value
+
+
+def test_cells_match_the_scalar_formula():
+    P, R, N, T = [2500.5, 10000], [0.01, 0.040753, 0.2], [1, 12, 365], [1, 10, 40]
+    result = calculate_future_value_grid(P, R, N, T)
+    assert result.future_value.shape == (2, 3, 3, 3)
+    assert result.dFV_dR is None and result.dFV_dT is None
+    for i, p in enumerate(P):
+        for j, r in enumerate(R):
+            for k, n in enumerate(N):
+                for m, t in enumerate(T):
+                    assert result.future_value[i, j, k, m] == calculate_future_value(p, r, n, t)
+
+
+def test_half_cent_ties_round_like_the_scalar():
+    # numpy's power puts 1000 * 1.175 ** 2 just below the tie that the scalar rounds up
+    result = calculate_future_value_grid([1000, 2000], [0.175], [1], [2], sensitivities=True)
+    assert result.future_value.ravel().tolist() == [calculate_future_value(P, 0.175, 1, 2) for P in (1000, 2000)]
+    assert result.future_value[0, 0, 0, 0] == 1380.63
+
+
+def test_sensitivities_match_finite_differences():
+    result = calculate_future_value_grid([10000], [0.05], [12], [10], sensitivities=True)
+
+    def fv(r: float, t: float) -> float:
+        return 10000 * (1 + r / 12) ** (12 * t)
+
+    h = 1e-6
+    assert result.dFV_dR[0, 0, 0, 0] == pytest.approx((fv(0.05 + h, 10) - fv(0.05 - h, 10)) / (2 * h), rel=1e-6)
+    assert result.dFV_dT[0, 0, 0, 0] == pytest.approx((fv(0.05, 10 + h) - fv(0.05, 10 - h)) / (2 * h), rel=1e-6)
+
+
+def test_round_like_builtin_agrees_on_ties_and_large_values():
+    values = np.array([2.675, 0.125, 884.625, 1.005, 4.5e13 + 0.125, 2.0**53 + 2, 1e300, math.inf, 12345.678])
+    assert round_like_builtin(values, 2).tolist() == [round(v, 2) for v in values.tolist()]
+
+
+@pytest.mark.parametrize("axes, message", [
+    (([10000], [0.05, -0.01], [12], [10]), "R values must be finite and greater than 0"),
+    (([10000], [0.05], [12.5], [10]), "N values must be whole numbers"),
+    (([10000], [], [12], [10]), "R must be a non-empty list"),
+])
+def test_invalid_axes(axes, message):
+    with pytest.raises(ValueError, match=message):
+        calculate_future_value_grid(*axes)
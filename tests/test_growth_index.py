@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from app import services
+from app.growth_index import GrowthFactorIndex, parse_grid
+from app.services import calculate_future_value, calculate_required_rate
+
+
+@pytest.fixture
+def index():
+    index = GrowthFactorIndex.build(parse_grid("0.0025:0.2:0.0025"), [1, 4, 12, 365], parse_grid("1:40", int))
+    services.set_growth_index(index)
+    yield index
+    services.set_growth_index(None)
+
+
+def test_parse_grid():
+    assert parse_grid("0.01:0.05:0.01") == [0.01, 0.02, 0.03, 0.04, 0.05]
+    assert parse_grid("1:4", int) == [1, 2, 3, 4]
+    assert parse_grid("1,4,12", int) == [1, 4, 12]
+
+
+def test_grid_hits_match_direct_formula(index):
+    rng = random.Random(7)
+    for _ in range(5000):
+        P = rng.uniform(1, 1e7)
+        R = round(0.0025 * rng.randint(1, 80), 6)
+        N = rng.choice([1, 4, 12, 365])
+        T = rng.randint(1, 40)
+        assert index.growth_factor(R, N, T) is not None
+        assert calculate_future_value(P, R, N, T) == round(P * (1 + R / N) ** (N * T), 2)
+
+
+def test_off_grid_inputs_fall_back_to_formula(index):
+    assert index.growth_factor(0.040753, 4, 10) is None
+    assert index.growth_factor(0.05, 7, 10) is None
+    assert calculate_future_value(10000, 0.040753, 4, 10) == 15000.04
+
+
+def test_nearest_rate_brackets_closed_form(index):
+    FV, P, N, T = 15000, 10000, 4, 10
+    guess = index.nearest_rate(FV / P, N, T)
+    assert abs(guess - calculate_required_rate(FV, P, N, T)) <= 0.0025 / 2
+    assert index.nearest_rate(FV / P, 7, T) is None
+
+
+def test_save_and_load_round_trip(index, tmp_path):
+    path = tmp_path / "growth.json"
+    index.save(path)
+    loaded = GrowthFactorIndex.load(path)
+    assert len(loaded) == len(index)
+    assert loaded.growth_factor(0.05, 12, 30) == index.growth_factor(0.05, 12, 30)
@@ -0,0 +1,70 @@
+import fcntl
+import logging
+import logging.handlers
+import threading
+
+from app.config import logging_config
+from app.config.logging_config import install_queue_handlers, parse_sample_rates, sample_success_log
+from app.config.settings import settings
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+        self.emit_threads: list[str] = []
+
+    def emit(self, record):
+        self.records.append(record)
+        self.emit_threads.append(threading.current_thread().name)
+
+
+def test_handlers_run_on_listener_thread():
+    logger = logging.getLogger("tests.queue")
+    logger.propagate = False
+    target = ListHandler()
+    logger.addHandler(target)
+
+    (listener,) = install_queue_handlers([logger])
+    try:
+        assert [type(h) for h in logger.handlers] == [logging.handlers.QueueHandler]
+        logger.warning("lazy %s formatting", "argument")
+    finally:
+        listener.stop()
+        logging_config._listeners.remove(listener)
+        logger.handlers.clear()
+
+    assert [r.getMessage() for r in target.records] == ["lazy argument formatting"]
+    # The record was created on the calling thread but emitted by the listener's thread
+    assert target.records[0].threadName == threading.current_thread().name
+    assert target.emit_threads != [threading.current_thread().name]
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates("future-value=0.1, required-rate=2,bogus") == {
+        "future-value": 0.1,
+        "required-rate": 1.0,
+    }
+
+
+def test_sample_success_log(monkeypatch):
+    monkeypatch.setattr(settings, "LOG_SAMPLE_RATES", "future-value=0")
+    assert not any(sample_success_log("future-value") for _ in range(100))
+    assert all(sample_success_log("required-rate") for _ in range(100))
+
+
+def test_log_slots_are_reused_after_their_holder_exits(monkeypatch, tmp_path):
+    monkeypatch.setattr(logging_config, "_slot", None)
+    monkeypatch.setattr(logging_config, "_slot_lock", None)
+    monkeypatch.setattr(settings, "LOG_FILE_PER_PROCESS", True)
+    # Another live worker holds slot 0
+    with open(tmp_path / ".slot-0.lock", "w") as other:
+        fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        assert logging_config.log_file(tmp_path, "app") == tmp_path / "app.1.log"
+        assert logging_config.worker_slot(tmp_path) == 1
+    logging_config._slot_lock.close()
+
+    # Both holders are gone: the next worker takes slot 0 again
+    monkeypatch.setattr(logging_config, "_slot", None)
+    assert logging_config.worker_slot(tmp_path) == 0
+    logging_config._slot_lock.close()
@@ -0,0 +1,47 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.config.settings import settings
+from app.main import create_app
+
+ROOT = Path(__file__).parents[1]
+
+IMPORT_PROBE = """
+import json, logging, sys
+import app.main
+print(json.dumps({
+    "modules": sorted(m for m in ("fastapi", "numpy", "app.routers") if m in sys.modules),
+    "app_handlers": len(logging.getLogger("app").handlers),
+}))
+"""
+
+
+def test_import_has_no_side_effects(tmp_path):
+    logs_dir = tmp_path / "logs"
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=tmp_path,
+        env={"PYTHONPATH": str(ROOT), "LOGS_DIR": str(logs_dir)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Nothing printed besides the probe, nothing heavy imported, no logging or files set up
+    assert json.loads(result.stdout) == {"modules": [], "app_handlers": 0}
+    assert not logs_dir.exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_lifespan_configures_logging(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "LOGS_DIR", tmp_path / "logs")
+    app = create_app()
+    assert not (tmp_path / "logs").exists()
+
+    with TestClient(app) as client:
+        assert (tmp_path / "logs").is_dir()
+        response = client.post("/future-value", json={"P": 10000, "R": 0.040753, "N": 4, "T": 10})
+        assert response.status_code == 200
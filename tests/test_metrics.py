@@ -0,0 +1,47 @@
+import os
+
+from app.config.settings import settings
+from app.metrics import Counter, Histogram, MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value, "/a")
+
+    assert histogram.render() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 2.65',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_counter_escapes_label_values():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("errors_total", "Errors", ("route",)))
+    counter.inc('/a"b')
+    counter.inc('/a"b', amount=2)
+
+    assert registry.render().splitlines()[-1] == 'errors_total{route="/a\\"b"} 3'
+
+
+def test_samples_are_labelled_by_worker_when_there_are_several(monkeypatch):
+    registry = MetricsRegistry()
+    registry.register(Counter("requests_total", "Requests")).inc()
+    registry.register(Counter("errors_total", "Errors", ("route",))).inc("/a b")
+    assert registry.render().splitlines()[2] == "requests_total 1"
+
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 2)
+    worker = f'worker="{os.getpid()}"'
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        f"requests_total{{{worker}}} 1",
+        "# HELP errors_total Errors",
+        "# TYPE errors_total counter",
+        f'errors_total{{{worker},route="/a b"}} 1',
+    ]
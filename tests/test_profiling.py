@@ -0,0 +1,72 @@
+import json
+import pstats
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config.settings import settings
+from app.main import create_app
+from app.profiling import PhaseTimings, ProfilingMiddleware, _timings, phase
+
+BODY = {"P": 10000, "R": 0.05, "N": 12, "T": 10}
+
+
+@pytest.fixture
+def profiled(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "LOGS_DIR", tmp_path)
+    monkeypatch.setattr(settings, "PROFILE_TOKEN", "s3cret")
+    return tmp_path / "profiles"
+
+
+def test_profiling_is_not_installed_unless_configured(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_TOKEN", "")
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+    app = create_app()
+    assert ProfilingMiddleware not in [middleware.cls for middleware in app.user_middleware]
+
+
+def test_phase_is_a_no_op_outside_a_profiled_request():
+    with phase("compute"):
+        pass
+    assert _timings.get() is None
+
+
+def test_header_writes_profile_and_phase_timings(profiled):
+    client = TestClient(create_app())
+    response = client.post("/future-value", json=BODY, headers={"X-Profile": "s3cret"})
+
+    assert response.status_code == 200
+    timing = dict(part.split(";dur=") for part in response.headers["server-timing"].split(", "))
+    assert {"validation", "compute", "serialization"} <= set(timing)
+
+    [prof] = profiled.glob("*-future-value.prof")
+    stats = pstats.Stats(str(prof))
+    assert any(name == "_future_value" for _, _, name in stats.stats)  # type: ignore[attr-defined]
+    record = json.loads(prof.with_suffix(".json").read_text())
+    assert record["route"] == "/future-value"
+    assert record["phases_ms"]["total"] >= record["phases_ms"]["compute"]
+
+
+def test_wrong_or_missing_token_is_not_profiled(profiled):
+    client = TestClient(create_app())
+    assert "server-timing" not in client.post("/future-value", json=BODY, headers={"X-Profile": "guess"}).headers
+    assert "server-timing" not in client.post("/future-value", json=BODY).headers
+    assert not profiled.exists()
+
+
+def test_sampled_requests_are_profiled(profiled, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_TOKEN", "")
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 1.0)
+    client = TestClient(create_app())
+    assert client.post("/v2/required-rate", json={"FV": 20000, "P": 10000, "N": 12, "T": 10}).status_code == 200
+    assert len(list(profiled.glob("*-v2-required-rate.prof"))) == 1
+
+
+def test_validation_and_serialization_are_derived_from_the_handler_span():
+    timings = PhaseTimings()
+    timings.started = 0.0
+    timings.add("handler", 1.0, 3.0)
+    timings.add("compute", 1.5, 2.0)
+    assert timings.summary(response_started=3.5, finished=4.0) == {
+        "compute": 500.0, "validation": 1000.0, "serialization": 500.0, "total": 4000.0
+    }
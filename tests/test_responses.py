@@ -0,0 +1,19 @@
+import json
+
+from app import responses
+
+
+def test_dumps_without_orjson_matches_orjson_output(monkeypatch):
+    content = responses.future_value_result(15000.04, 10000.0, 0.040753, 4, 10)
+    fast = responses.dumps(content)
+    monkeypatch.setattr(responses, "orjson", None)
+    assert responses.dumps(content) == fast == json.dumps(content, separators=(",", ":")).encode()
+
+
+def test_dumps_renders_arrays_with_non_finite_values_as_null(monkeypatch):
+    import numpy as np
+
+    content = {"values": np.array([[1.5, np.inf], [np.nan, 2.25]])}
+    fast = responses.dumps(content)
+    monkeypatch.setattr(responses, "orjson", None)
+    assert responses.dumps(content) == fast == b'{"values":[[1.5,null],[null,2.25]]}'
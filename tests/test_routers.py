@@ -1,3 +1,9 @@
+import json
+
+import pytest
+
+from app.config.settings import settings
+
 def test_future_value(client):
     payload = {"P": 10000, "R": 0.040753, "N": 4, "T": 10}
     response = client.post("/future-value", json=payload)
@@ -9,4 +15,322 @@ def test_required_rate(client):
     response = client.post("/required-rate", json=payload)
     assert response.status_code == 200
     assert response.json() == {"message": "4.08% is the required interest rate to grow $10000 to $15000 if compounding 4 times per year over 10 years."}
-    
\ No newline at end of file
+    
+def test_future_value_batch(client):
+    payload = {"P": [10000, -1, 1000], "R": [0.040753, 0.05, 0.05], "N": [4, 1, 0], "T": [10, 1, 1]}
+    response = client.post("/future-value/batch", json=payload)
+    assert response.status_code == 200
+    assert response.json() == {
+        "future_values": [15000.04, None, None],
+        "errors": [
+            {"index": 1, "detail": "Invalid input: P must be greater than 0"},
+            {"index": 2, "detail": "Invalid input: N must be greater than 0"},
+        ],
+    }
+
+def test_future_value_batch_length_mismatch(client):
+    payload = {"P": [10000], "R": [0.04, 0.05], "N": [4], "T": [10]}
+    response = client.post("/future-value/batch", json=payload)
+    assert response.status_code == 400
+
+def test_required_rate_batch(client):
+    payload = {"FV": [15000, 2000], "P": [10000, 0], "N": [4, 1], "T": [10, 1]}
+    response = client.post("/required-rate/batch", json=payload)
+    assert response.status_code == 200
+    assert response.json() == {
+        "required_rates": [0.040753, None],
+        "errors": [{"index": 1, "detail": "Invalid input: P must be greater than 0"}],
+    }
+
+def test_future_value_delay_is_configurable(client, monkeypatch):
+    monkeypatch.setattr(settings, "FUTURE_VALUE_DELAY_SECONDS", 0.01)
+    payload = {"P": 10000, "R": 0.040753, "N": 4, "T": 10}
+    response = client.post("/future-value", json=payload)
+    assert response.status_code == 200
+
+def test_batch_runs_inline_without_executor(client, monkeypatch):
+    monkeypatch.setattr(settings, "COMPUTE_EXECUTOR_WORKERS", 0)
+    payload = {"FV": [15000], "P": [10000], "N": [4], "T": [10]}
+    response = client.post("/required-rate/batch", json=payload)
+    assert response.json()["required_rates"] == [0.040753]
+
+def test_future_value_stream_ndjson(client, monkeypatch):
+    monkeypatch.setattr(settings, "STREAM_CHUNK_ROWS", 2)
+    body = (
+        b'{"P": 10000, "R": 0.040753, "N": 4, "T": 10}\n'
+        b'{"P": -1, "R": 0.05, "N": 4, "T": 1}\n'
+        b'not json\n'
+        b'{"P": 1000, "R": 0.05, "N": 1, "T": 1}\n'
+    )
+    response = client.post("/future-value/stream", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0] == {"row": 0, "future_value": 15000.04}
+    assert lines[1] == {"row": 1, "error": "Invalid input: P must be greater than 0"}
+    assert lines[2]["row"] == 2 and lines[2]["error"].startswith("Invalid row")
+    assert lines[3] == {"row": 3, "future_value": 1050.0}
+
+def test_future_value_stream_reports_over_long_lines(client, monkeypatch):
+    monkeypatch.setattr(settings, "STREAM_MAX_LINE_BYTES", 64)
+    body = b'{"P": 1000, "R": 0.175, "N": 1, "T": 2}\n' + b" " * 100 + b'{"P": 1}\n{"P": 1000, "R": 0.05, "N": 1, "T": 1}\n'
+    response = client.post("/future-value/stream", content=body, headers={"Content-Type": "application/x-ndjson"})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [
+        {"row": 0, "future_value": 1380.63},
+        {"row": 1, "error": "Invalid row: line is longer than 64 bytes"},
+        {"row": 2, "future_value": 1050.0},
+    ]
+
+def test_future_value_stream_csv(client):
+    body = b"T,N,R,P\n10,4,0.040753,10000\n1,1,0.05,1000\n"
+    response = client.post("/future-value/stream", content=body, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    assert response.text == "row,future_value,error\n0,15000.04,\n1,1050.0,\n"
+
+def test_future_value_stream_rejects_bad_header_and_content_type(client):
+    response = client.post("/future-value/stream", content=b"A,B\n1,2\n", headers={"Content-Type": "text/csv"})
+    assert response.status_code == 400
+    response = client.post("/future-value/stream", content=b"{}", headers={"Content-Type": "application/json"})
+    assert response.status_code == 415
+
+@pytest.mark.skipif(not settings.CACHE_ENABLED, reason="result cache disabled")
+def test_cache_stats_counts_repeat_requests(client):
+    payload = {"FV": 12345, "P": 10000, "N": 12, "T": 3}
+    before = client.get("/cache/stats").json()["caches"]["required_rate"]
+    first = client.post("/required-rate", json=payload).json()
+    second = client.post("/required-rate", json=payload).json()
+    after = client.get("/cache/stats").json()["caches"]["required_rate"]
+
+    assert first == second
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+
+def test_future_value_schedule_pagination(client):
+    payload = {"P": 10000, "R": 0.040753, "N": 4, "T": 10, "limit": 30}
+    first = client.post("/future-value/schedule", json=payload).json()
+    assert first["periods"][:2] == [0, 1]
+    assert first["balances"][0] == 10000.0
+    assert first["total_periods"] == 40
+    assert first["next_offset"] == 30
+
+    second = client.post("/future-value/schedule", json={**payload, "offset": first["next_offset"]}).json()
+    assert second["periods"] == list(range(30, 41))
+    assert second["balances"][-1] == 15000.04
+    assert second["next_offset"] is None
+
+def test_future_value_schedule_stride(client):
+    payload = {"P": 10000, "R": 0.040753, "N": 4, "T": 10, "stride": 4}
+    response = client.post("/future-value/schedule", json=payload).json()
+    assert response["periods"] == list(range(0, 41, 4))
+    assert response["next_offset"] is None
+
+def test_metrics_endpoint(client):
+    client.post("/future-value", json={"P": 10000, "R": 0.040753, "N": 4, "T": 10})
+    client.post("/future-value", json={"P": -1, "R": 0.040753, "N": 4, "T": 10})
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert any(line.startswith('http_requests_total{method="POST",route="/future-value",status="200"}') for line in lines)
+    assert any(line.startswith('http_requests_total{method="POST",route="/future-value",status="400"}') for line in lines)
+    assert any(line.startswith('http_request_duration_seconds_bucket{method="POST",route="/future-value",le="+Inf"}') for line in lines)
+    assert any(line.startswith('validation_failures_total{route="/future-value"}') for line in lines)
+
+def test_future_value_v2(client):
+    payload = {"P": 10000, "R": 0.040753, "N": 4, "T": 10}
+    response = client.post("/v2/future-value", json=payload)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"future_value": 15000.04, "inputs": {"P": 10000, "R": 0.040753, "N": 4, "T": 10, "precision": "float"}}
+
+def test_required_rate_v2(client):
+    payload = {"FV": 15000, "P": 10000, "N": 4, "T": 10}
+    response = client.post("/v2/required-rate", json=payload)
+    assert response.status_code == 200
+    assert response.json() == {"rate": 0.040753, "inputs": {"FV": 15000, "P": 10000, "N": 4, "T": 10, "precision": "float"}}
+
+def test_structured_format_selected_by_accept_header(client):
+    payload = {"P": 10000, "R": 0.040753, "N": 4, "T": 10}
+    response = client.post("/future-value", json=payload, headers={"Accept": "application/vnd.calculator.v2+json"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.calculator.v2+json"
+    assert response.json()["future_value"] == 15000.04
+
+def test_v2_invalid_input(client):
+    response = client.post("/v2/required-rate", json={"FV": 15000, "P": -1, "N": 4, "T": 10})
+    assert response.status_code == 400
+
+def test_goal_seek(client):
+    payload = {"solve_for": "R", "FV": 34581.90, "P": 10000, "N": 12, "T": 10, "PMT": 100}
+    response = client.post("/goal-seek", json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["solve_for"] == "R" and body["status"] == "converged"
+    assert body["value"] == pytest.approx(0.06, abs=1e-6)
+
+def test_goal_seek_missing_input(client):
+    response = client.post("/goal-seek", json={"solve_for": "T", "FV": 20000, "P": 10000, "N": 1})
+    assert response.status_code == 400
+
+def test_goal_seek_batch(client):
+    payload = {"solve_for": "T", "FV": [20000, 5000], "P": [10000, 10000], "R": [0.05, 0.05], "N": [1, 1]}
+    response = client.post("/goal-seek/batch", json=payload)
+    assert response.status_code == 200
+    assert response.json() == {
+        "solve_for": "T",
+        "values": [14.206699, None],
+        "status": ["closed_form", "no_solution"],
+        "iterations": [0, 0],
+        "errors": [{"index": 1, "detail": "No solution: no T reaches FV with these inputs"}],
+    }
+
+def test_future_value_simulate(client):
+    payload = {"P": 10000, "R": 0.06, "volatility": 0.15, "N": 12, "T": 10, "paths": 2000, "seed": 7}
+    response = client.post("/future-value/simulate", json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["paths"] == 2000 and body["seed"] == 7 and body["truncated"] is False
+    assert [p["percentile"] for p in body["percentiles"]] == [10, 50, 90]
+    assert client.post("/future-value/simulate", json=payload).json() == body
+
+def test_future_value_simulate_limits_periods(client, monkeypatch):
+    monkeypatch.setattr(settings, "SIMULATION_MAX_PERIODS", 1000)
+    payload = {"P": 10000, "R": 0.06, "volatility": 0.15, "N": 365, "T": 10, "paths": 10}
+    response = client.post("/future-value/simulate", json=payload)
+    assert response.status_code == 400
+    assert client.post("/future-value/simulate", json={**payload, "N": 12}).status_code == 200
+
+def test_future_value_simulate_invalid_percentile(client):
+    payload = {"P": 10000, "R": 0.06, "volatility": 0.15, "N": 12, "T": 10, "percentiles": [150]}
+    response = client.post("/future-value/simulate", json=payload)
+    assert response.status_code == 400
+
+def test_future_value_decimal_precision(client):
+    payload = {"P": 842.5, "R": 0.05, "N": 1, "T": 1, "precision": "decimal"}
+    assert client.post("/v2/future-value", json=payload).json()["future_value"] == 884.63
+    assert client.post("/v2/future-value", json={**payload, "precision": "float"}).json()["future_value"] == 884.62
+
+def test_required_rate_decimal_overflow_is_a_client_error(client):
+    payload = {"FV": 1e45, "P": 1, "N": 1, "T": 1}
+    assert client.post("/required-rate", json=payload).status_code == 200
+    response = client.post("/required-rate", json={**payload, "precision": "decimal"})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Calculation overflow")
+
+def test_future_value_coalesced(client, monkeypatch):
+    monkeypatch.setattr(settings, "COALESCE_ENABLED", True)
+    payload = {"P": 10000, "R": 0.040753, "N": 4, "T": 10}
+    assert client.post("/v2/future-value", json=payload).json()["future_value"] == 15000.04
+    response = client.post("/required-rate", json={"FV": 15000, "P": 10000, "N": 4, "T": 11})
+    assert response.status_code == 200
+    assert response.json()["message"].startswith("3.7% is the required interest rate")
+
+@pytest.mark.parametrize("enabled", [False, True])
+def test_coalescing_does_not_change_half_cent_ties(client, monkeypatch, enabled):
+    monkeypatch.setattr(settings, "COALESCE_ENABLED", enabled)
+    payload = {"P": 1000, "R": 0.175, "N": 1, "T": 2}
+    assert client.post("/v2/future-value", json=payload).json()["future_value"] == 1380.63
+
+def test_future_value_get_is_cacheable(client):
+    params = {"P": 10000, "R": 0.040753, "N": 4, "T": 10}
+    response = client.get("/future-value", params=params)
+    assert response.status_code == 200
+    assert response.json() == client.post("/future-value", json=params).json()
+    assert response.headers["cache-control"] == f"public, max-age={settings.HTTP_CACHE_MAX_AGE_SECONDS}, immutable"
+    assert response.headers["vary"] == "Accept"
+    # Equal inputs share an ETag; another representation gets its own
+    assert client.get("/future-value", params={**params, "P": "10000.0"}).headers["etag"] == response.headers["etag"]
+    structured = client.get("/future-value", params=params, headers={"Accept": "application/vnd.calculator.v2+json"})
+    assert structured.json()["future_value"] == 15000.04
+    assert structured.headers["etag"] != response.headers["etag"]
+
+def test_conditional_get_skips_the_calculation(client, monkeypatch):
+    params = {"FV": 20000, "P": 10000, "N": 12, "T": 10}
+    etag = client.get("/required-rate", params=params).headers["etag"]
+
+    def fail(*args):
+        raise AssertionError("calculation reached on a cache hit")
+
+    monkeypatch.setattr("app.routers._required_rate", fail)
+    response = client.get("/required-rate", params=params, headers={"If-None-Match": f'"other", W/{etag}'})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+def test_get_invalid_query(client):
+    response = client.get("/required-rate", params={"FV": 20000, "P": -1, "N": 12})
+    assert response.status_code == 400
+    assert "etag" not in response.headers
+
+def test_future_value_grid(client):
+    response = client.post("/future-value/grid", json={
+        "P": 10000, "R": {"start": 0.01, "stop": 0.03, "num": 3}, "N": [12], "T": [1, 10], "sensitivities": True,
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["dims"] == ["R", "N", "T"]
+    assert body["shape"] == [3, 1, 2]
+    assert body["axes"]["R"] == pytest.approx([0.01, 0.02, 0.03])
+    scalar = client.post("/v2/future-value", json={"P": 10000, "R": body["axes"]["R"][1], "N": 12, "T": 10})
+    assert body["future_value"][1][0][1] == scalar.json()["future_value"]
+    assert body["dFV_dR"][1][0][1] > 0 and body["dFV_dT"][1][0][1] > 0
+
+def test_future_value_grid_base64(client):
+    import base64
+
+    import numpy as np
+
+    payload = {"P": [1000, 2000], "R": 0.05, "N": 4, "T": {"start": 1, "stop": 30, "num": 30}}
+    as_json = client.post("/future-value/grid", json=payload).json()
+    for dtype, code in (("float64", "<f8"), ("float32", "<f4")):
+        body = client.post("/future-value/grid", json={**payload, "encoding": "base64", "dtype": dtype}).json()
+        values = np.frombuffer(base64.b64decode(body["future_value"]), dtype=code).reshape(body["shape"])
+        assert values.tolist() == np.asarray(as_json["future_value"], dtype=code).tolist()
+
+def test_future_value_grid_rejects_oversized_and_invalid_grids(client, monkeypatch):
+    big = {"P": 10000, "R": {"start": 0.01, "stop": 0.2, "num": 1000}, "N": 12, "T": {"start": 1, "stop": 50, "num": 50}}
+    monkeypatch.setattr(settings, "GRID_MAX_CELLS", 10_000)
+    assert client.post("/future-value/grid", json=big).status_code == 400
+    response = client.post("/future-value/grid", json={"P": 10000, "R": [0.05], "N": [12.5], "T": 10})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid input: N values must be whole numbers"
+
+def test_rate_schedule_is_reused_by_id(client):
+    schedule = {"segments": [{"rate": 0.01, "years": 0.5}, {"rate": 0.05, "years": 4.5}], "compounding": 12}
+    registered = client.post("/rate-schedules", json=schedule).json()
+    assert registered["term"] == 5 and registered["segments"] == 2
+    assert client.post("/rate-schedules", json=schedule).json()["schedule_id"] == registered["schedule_id"]
+
+    response = client.post("/future-value/variable-rate", json={
+        "P": 10000, "schedule_id": registered["schedule_id"], "start": 0.5, "horizons": [1, 5],
+    })
+    assert response.status_code == 200
+    body = response.json()
+    # Invested after the teaser segment, so only the 5% segment applies
+    assert body["future_values"] == [round(10000 * (1 + 0.05 / 12) ** k, 2) for k in (6, 54)]
+    inline = client.post("/future-value/variable-rate", json={"P": 10000, "schedule": schedule}).json()
+    assert inline["schedule_id"] == registered["schedule_id"]
+    assert inline["future_values"] == [round(10000 * registered["growth"], 2)]
+
+def test_rate_schedule_id_works_in_a_process_that_never_saw_it(client):
+    from app.routers import rate_schedules
+
+    schedule = {"segments": [{"rate": 0.02, "years": 1}, {"rate": 0.04, "years": 2}], "compounding": 4}
+    schedule_id = client.post("/rate-schedules", json=schedule).json()["schedule_id"]
+    expected = client.post("/future-value/variable-rate", json={"P": 5000, "schedule_id": schedule_id}).json()
+    # Like another worker, or this one after a restart
+    rate_schedules.clear()
+    response = client.post("/future-value/variable-rate", json={"P": 5000, "schedule_id": schedule_id})
+    assert response.status_code == 200
+    assert response.json() == expected
+
+def test_variable_rate_errors(client):
+    schedule = {"segments": [{"rate": 0.05, "years": 10}], "compounding": "continuous"}
+    response = client.post("/future-value/variable-rate", json={"P": 1000, "schedule_id": "unknown"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid input: schedule_id is not a rate schedule ID"
+    assert client.post("/future-value/variable-rate", json={"P": 1000}).status_code == 400
+    response = client.post("/future-value/variable-rate", json={"P": 1000, "schedule": schedule, "horizons": [11]})
+    assert response.status_code == 400
+    assert "schedule term" in response.json()["detail"]
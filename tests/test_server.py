@@ -0,0 +1,55 @@
+from app import executor, server
+from app.config.settings import settings
+
+
+def test_cgroup_v2_quota(tmp_path):
+    (tmp_path / "cpu.max").write_text("250000 100000\n")
+    assert server.cgroup_cpu_quota(tmp_path) == 2.5
+
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert server.cgroup_cpu_quota(tmp_path) is None
+
+
+def test_cgroup_v1_quota(tmp_path):
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("150000\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    assert server.cgroup_cpu_quota(tmp_path) == 1.5
+
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+    assert server.cgroup_cpu_quota(tmp_path) is None
+
+
+def test_worker_count_follows_cpu_quota(monkeypatch):
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 0)
+    monkeypatch.setattr(server, "available_cpus", lambda: 3.5)
+    assert server.worker_count() == 3
+    monkeypatch.setattr(server, "available_cpus", lambda: 0.5)
+    assert server.worker_count() == 1
+
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 6)
+    assert server.worker_count() == 6
+
+
+def test_server_options_come_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 2)
+    monkeypatch.setattr(settings, "WORKER_MAX_REQUESTS", 0)
+    options = server.server_options()
+    assert options["workers"] == 2
+    assert options["limit_max_requests"] is None
+    assert options["backlog"] == settings.BACKLOG
+    assert options["timeout_keep_alive"] == settings.KEEP_ALIVE_TIMEOUT
+
+
+def test_simulation_workers_share_the_cpus_among_server_workers(monkeypatch):
+    monkeypatch.setattr(server, "available_cpus", lambda: 8.0)
+    monkeypatch.setattr(settings, "SIMULATION_WORKERS", -1)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 0)
+    assert executor.simulation_workers() == 8
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 3)
+    assert executor.simulation_workers() == 2
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 16)
+    assert executor.simulation_workers() == 1
+
+    monkeypatch.setattr(settings, "SIMULATION_WORKERS", 0)
+    assert executor.simulation_workers() == 0
@@ -1,4 +1,21 @@
-from app.services import calculate_future_value, calculate_required_rate
+import math
+import random
+from decimal import ROUND_HALF_UP, Decimal, localcontext
+
+import pytest
+
+from app.services import (
+    calculate_balance_schedule,
+    calculate_balance_schedule_decimal,
+    calculate_future_value,
+    calculate_future_value_batch,
+    calculate_future_value_decimal,
+    calculate_required_rate,
+    calculate_required_rate_batch,
+    calculate_required_rate_decimal,
+    decimal_power,
+    RateSchedule,
+)
 
 class TestServices:
     """ Test class for service calculations. """
@@ -265,4 +282,142 @@ class TestServices:
         print(f"DEBUG: Original FV: {FV}")
         print(f"DEBUG: FV Match: {abs(FV - FV_verification) < 0.01}")
         
-        assert abs(FV - FV_verification) < 0.01
\ No newline at end of file
+        assert abs(FV - FV_verification) < 0.01
+
+    def test_batch_matches_scalar_functions(self):
+        """Batch results must round exactly like the scalar functions."""
+        rng = random.Random(42)
+        rows = [
+            (rng.uniform(1, 1e6), rng.uniform(0.0001, 0.3), rng.choice([1, 4, 12, 365]), rng.randint(1, 50))
+            for _ in range(5000)
+        ]
+        P, R, N, T = (list(col) for col in zip(*rows))
+
+        future_values = calculate_future_value_batch(P, R, N, T)
+        assert future_values.errors == {}
+        assert future_values.values == [calculate_future_value(*row) for row in rows]
+
+        FV = future_values.values
+        rates = calculate_required_rate_batch(FV, P, N, T)
+        assert rates.errors == {}
+        assert rates.values == [calculate_required_rate(fv, p, n, t) for fv, p, n, t in zip(FV, P, N, T)]
+
+    def test_batch_rounds_half_cent_ties_like_the_scalar(self):
+        """numpy's array power lands 1000 * 1.175 ** 2 just below the tie that the scalar rounds up."""
+        assert calculate_future_value(1000, 0.175, 1, 2) == 1380.63
+        assert calculate_future_value_batch([1000], [0.175], [1], [2]).values == [1380.63]
+
+    def test_batch_per_row_errors(self):
+        """Invalid rows are reported individually without failing the batch."""
+        result = calculate_required_rate_batch([1000, -5, 1000], [1000, 1000, 0], [1, 1, 0], [1, 1, 1])
+        print(f"DEBUG: Result: {result}")
+
+        assert result.values == [0.0, None, None]
+        assert result.errors == {
+            1: "Invalid input: FV must be greater than 0",
+            2: "Invalid input: P, N must be greater than 0",
+        }
+
+    def test_batch_length_mismatch(self):
+        """Columns of different lengths are rejected as a whole."""
+        with pytest.raises(ValueError, match="Invalid input"):
+            calculate_future_value_batch([1, 2], [0.05], [1], [1])
+
+
+    def test_balance_schedule_matches_direct_powers(self):
+        """Blocked cumulative products stay cent-exact over long daily horizons."""
+        P, R, N, T = 25000, 0.0425, 365, 40
+        schedule = calculate_balance_schedule(P, R, N, T, limit=N * T + 1)
+        print(f"DEBUG: {len(schedule.periods)} points, last balance {schedule.balances[-1]}")
+
+        assert schedule.periods == list(range(N * T + 1))
+        assert schedule.balances[-1] == calculate_future_value(P, R, N, T)
+        for period in range(0, N * T + 1, 137):
+            assert schedule.balances[period] == round(P * (1 + R / N) ** period, 2)
+
+    def test_decimal_future_value_is_cent_exact(self):
+        """Exponentiation by squaring matches a much higher precision reference."""
+        cases = [(10000, 0.040753, 4, 10), (10000, 0.05, 365, 40), (123456.78, 0.0725, 12, 30), (842.5, 0.05, 1, 1)]
+        for P, R, N, T in cases:
+            with localcontext() as ctx:
+                ctx.prec = 200
+                reference = (Decimal(repr(P)) * (1 + Decimal(repr(R)) / N) ** (N * T)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+            result = calculate_future_value_decimal(P, R, N, T)
+            print(f"DEBUG: {P}, {R}, {N}, {T} -> {result} (reference {reference})")
+            assert result == reference
+
+        # 842.5 * 1.05 is exactly 884.625: decimal rounds half-up, the float path
+        # lands just below the tie in binary and rounds down
+        assert calculate_future_value_decimal(842.5, 0.05, 1, 1) == Decimal("884.63")
+        assert calculate_future_value(842.5, 0.05, 1, 1) == 884.62
+
+    def test_decimal_power(self):
+        """Repeated squaring agrees with integer powers."""
+        for exponent in (0, 1, 2, 7, 20):
+            assert decimal_power(Decimal("1.5"), exponent) == Decimal("1.5") ** exponent
+
+    def test_decimal_required_rate(self):
+        """Decimal required rate agrees with the float path to 6 places."""
+        assert calculate_required_rate_decimal(15000, 10000, 4, 10) == Decimal("0.040753")
+        assert float(calculate_required_rate_decimal(15000, 10000, 4, 10)) == calculate_required_rate(15000, 10000, 4, 10)
+
+    def test_decimal_balance_schedule(self):
+        """Decimal schedule ends on the decimal future value."""
+        P, R, N, T = 25000, 0.0425, 365, 40
+        schedule = calculate_balance_schedule_decimal(P, R, N, T, offset=N * T - 10, limit=100, stride=5)
+        assert schedule.periods == [N * T - 10, N * T - 5, N * T]
+        assert schedule.balances[-1] == float(calculate_future_value_decimal(P, R, N, T))
+
+    def test_rate_schedule_matches_period_by_period_compounding(self):
+        """Index queries agree with multiplying out every period, over any sub-interval."""
+        rates, years, N = [0.01, 0.045, 0.05, 0.055], [0.5, 1.5, 3, 5], 12
+        schedule = RateSchedule(rates, years, N)
+        per_period = [r for r, y in zip(rates, years) for _ in range(round(y * N))]
+
+        def reference(P, first, last):
+            value = P
+            for r in per_period[first:last]:
+                value *= 1 + r / N
+            return round(value, 2)
+
+        assert schedule.term == 10
+        for first, last in [(0, 120), (0, 6), (6, 24), (3, 100), (50, 50)]:
+            assert schedule.future_value(10000, first / N, last / N) == reference(10000, first, last)
+        horizons = [k / N for k in range(6, 121, 7)]
+        assert schedule.future_values(10000, 0.5, horizons) == [reference(10000, 6, round(h * N)) for h in horizons]
+        # A single segment is the closed-form formula
+        assert RateSchedule([0.05], [10], N).future_value(10000, 0, 10) == calculate_future_value(10000, 0.05, N, 10)
+        # Twelve 1/12-year segments add up to a hair under one year; year 1 is still the end
+        assert RateSchedule([0.05] * 12, [1 / 12] * 12, N).future_value(10000, 0, 1) == calculate_future_value(10000, 0.05, N, 1)
+
+    def test_rate_schedule_single_segment_is_cent_exact(self):
+        """Within one segment a query is the closed-form power, so it agrees to the cent."""
+        rng = random.Random(7)
+        for _ in range(2000):
+            P, R = rng.randint(100, 10**7) / 100, rng.randint(1, 200) / 1000
+            N, T = rng.choice((1, 2, 4, 12, 52, 365)), rng.randint(1, 60)
+            assert RateSchedule([R], [T], N).future_value(P, 0, T) == calculate_future_value(P, R, N, T)
+
+    def test_rate_schedule_continuous_compounding_and_errors(self):
+        """Continuous compounding grows by exp(rate * years); bad inputs are rejected."""
+        schedule = RateSchedule([0.02, 0.06], [2, 3])
+        assert schedule.growth(0, 5) == pytest.approx(math.exp(0.02 * 2 + 0.06 * 3))
+        assert schedule.future_value(1000, 1, 3) == round(1000 * math.exp(0.02 + 0.06), 2)
+        assert schedule.id == RateSchedule([0.02, 0.06], [2.0, 3.0]).id != RateSchedule([0.02, 0.06], [2, 3], 12).id
+        rebuilt = RateSchedule.from_id(schedule.id, max_segments=2)
+        assert (rebuilt.rates, rebuilt.years, rebuilt.N) == (schedule.rates, schedule.years, None)
+        for bad_id in ["unknown", schedule.id[:-2], schedule.id + "A"]:
+            with pytest.raises(ValueError, match="not a rate schedule ID"):
+                RateSchedule.from_id(bad_id, max_segments=2)
+        with pytest.raises(ValueError, match="not a rate schedule ID"):
+            RateSchedule.from_id(schedule.id, max_segments=1)
+
+        for args in [([], []), ([0.05], [0]), ([-0.01], [1]), ([0.05, 0.05], [1])]:
+            with pytest.raises(ValueError, match="Invalid input"):
+                RateSchedule(*args)
+        with pytest.raises(ValueError, match="schedule term"):
+            schedule.future_values(1000, 2, [1])
+        with pytest.raises(ValueError, match="schedule term"):
+            schedule.future_values(1000, 0, [5.5])
+        with pytest.raises(ValueError, match="Calculation overflow"):
+            RateSchedule([50.0], [100]).future_value(1000, 0, 100)
@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from app.config.settings import settings
+from app.simulation import OutcomeHistogram, SimulationParams, histogram_range, run_simulation, simulate_chunk
+from app.solver import solve
+
+PARAMS = SimulationParams(P=10000, R=0.06, volatility=0.15, N=12, T=10, PMT=100)
+
+
+def test_histogram_percentiles_match_exact():
+    values = np.random.default_rng(0).lognormal(mean=10, sigma=0.5, size=100_000)
+    histogram = OutcomeHistogram(8.0, 12.0)
+    for chunk in np.array_split(values, 7):
+        part = OutcomeHistogram(8.0, 12.0)
+        part.add(chunk)
+        histogram.merge(part)
+    assert histogram.count == len(values)
+    assert histogram.mean() == pytest.approx(values.mean(), rel=1e-12)
+    for q in (1, 10, 50, 90, 99):
+        assert histogram.percentile(q) == pytest.approx(np.percentile(values, q), rel=1e-3)
+    assert histogram.percentile(0) == values.min() and histogram.percentile(100) == values.max()
+
+
+def test_seeded_simulation_is_reproducible():
+    first = asyncio.run(run_simulation(PARAMS, 25_000, 42, [10, 50, 90]))
+    second = asyncio.run(run_simulation(PARAMS, 25_000, 42, [10, 50, 90]))
+    assert first == second
+    assert first.paths == 25_000 and not first.truncated
+    p10, p50, p90 = first.percentiles.values()
+    assert p10 < p50 < p90
+    assert asyncio.run(run_simulation(PARAMS, 25_000, 43, [50])).percentiles[50] != p50
+
+
+def test_zero_volatility_matches_deterministic_future_value():
+    params = PARAMS._replace(volatility=0.0)
+    result = asyncio.run(run_simulation(params, 1000, 1, [10, 90]))
+    expected = solve("FV", P=10000, R=0.06, N=12, T=10, PMT=100).value
+    assert result.percentiles == {10: pytest.approx(expected, abs=0.01), 90: pytest.approx(expected, abs=0.01)}
+
+
+def test_time_budget_truncates(monkeypatch):
+    monkeypatch.setattr(settings, "SIMULATION_TIME_BUDGET_SECONDS", 0)
+    with pytest.raises(ValueError, match="time budget"):
+        asyncio.run(run_simulation(PARAMS, 1000, 1, [50]))
+
+
+def test_chunk_stops_at_the_deadline():
+    lo, hi = histogram_range(PARAMS)
+    seed = np.random.SeedSequence(0)
+    assert simulate_chunk(PARAMS, seed, 100, lo, hi, deadline=time.time() - 1).count == 0
+    assert simulate_chunk(PARAMS, seed, 100, lo, hi, deadline=time.time() + 60).count == 100
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from app.growth_index import GrowthFactorIndex
+from app.services import calculate_required_rate, set_growth_index
+from app.solver import solve, solve_batch
+
+# FV of 10000 plus 100 per month for 10 years at 6% compounded monthly
+CASE = {"FV": 34581.90, "P": 10000.0, "R": 0.06, "N": 12, "T": 10, "PMT": 100.0}
+
+
+@pytest.mark.parametrize("target", ["FV", "P", "T", "PMT"])
+def test_closed_forms_round_trip(target):
+    inputs = {name: value for name, value in CASE.items() if name != target}
+    solution = solve(target, **inputs)
+    assert solution.status == "closed_form"
+    assert solution.iterations == 0
+    assert solution.value == pytest.approx(CASE[target], rel=1e-5)
+
+
+def test_rate_without_contributions_matches_required_rate():
+    solution = solve("R", FV=15000, P=10000, N=4, T=10)
+    assert solution == (calculate_required_rate(15000, 10000, 4, 10), "closed_form", 0)
+
+
+def test_rate_with_contributions_uses_newton():
+    inputs = {name: value for name, value in CASE.items() if name != "R"}
+    solution = solve("R", **inputs)
+    assert solution.status == "converged"
+    assert 0 < solution.iterations <= 10
+    assert solution.value == pytest.approx(0.06, abs=1e-6)
+
+
+def test_rate_warm_start_from_growth_index():
+    set_growth_index(GrowthFactorIndex.build([0.05, 0.06, 0.07], [12], [10]))
+    try:
+        inputs = {name: value for name, value in CASE.items() if name != "R"}
+        assert solve("R", **inputs).value == pytest.approx(0.06, abs=1e-6)
+    finally:
+        set_growth_index(None)
+
+
+def test_unreachable_goal_raises():
+    # Contributions alone already exceed the target
+    with pytest.raises(ValueError, match="No solution"):
+        solve("P", FV=50, R=0.05, N=1, T=5, PMT=100)
+    with pytest.raises(ValueError, match="must be provided"):
+        solve("T", FV=200, P=100, N=1)
+
+
+def test_batch_matches_scalar_with_per_row_status():
+    result = solve_batch(
+        "R",
+        FV=[34581.90, 15000, 40, 100],
+        P=[10000, 10000, 100, -1],
+        N=[12, 4, 12, 1],
+        T=[10, 10, 1, 1],
+        PMT=[100, 0, 50, 0],
+    )
+    assert result.values[:2] == [solve("R", 34581.90, 10000, None, 12, 10, 100).value, 0.040753]
+    assert result.values[2:] == [None, None]
+    assert result.status == ["converged", "closed_form", "no_solution", "invalid"]
+    assert result.iterations[0] > 0 and result.iterations[1:] == [0, 0, 0]
+    assert result.errors == {
+        2: "No solution: no R reaches FV with these inputs",
+        3: "Invalid input: P must be greater than 0",
+    }
+
+
+@pytest.mark.parametrize("target", ["FV", "P", "PMT"])
+def test_batch_closed_forms_round_exactly_like_scalar(target):
+    rng = random.Random(7)
+    rows = [
+        {"FV": round(rng.uniform(1e4, 1e7), 2), "P": round(rng.uniform(1, 1e5), 2), "R": round(rng.uniform(0.001, 0.3), 4),
+         "N": rng.choice([1, 4, 12, 365]), "T": rng.randint(1, 40), "PMT": round(rng.uniform(0, 500), 2)}
+        for _ in range(2000)
+    ]
+    # A daily-compounding row where exp(n * log1p(i)) lands a cent away from the scalar power
+    rows.append({"FV": 1.0, "P": 58253.28, "R": 0.1999, "N": 365, "T": 36, "PMT": 0.0})
+    columns = {name: [row[name] for row in rows] for name in rows[0] if name != target}
+    result = solve_batch(target, **columns)
+
+    expected = []
+    for row in rows:
+        try:
+            expected.append(solve(target, **{name: value for name, value in row.items() if name != target}).value)
+        except ValueError:
+            expected.append(None)
+    assert result.values == expected
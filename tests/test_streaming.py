@@ -0,0 +1,25 @@
+import asyncio
+
+from app.streaming import OVERSIZED_LINE, iter_line_batches
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def _collect(*parts: bytes, max_line_bytes: int = 1024) -> list[bytes]:
+    lines: list[bytes] = []
+    async for batch in iter_line_batches(_chunks(*parts), max_line_bytes):
+        lines.extend(batch)
+    return lines
+
+
+def test_lines_split_across_chunks_are_reassembled():
+    lines = asyncio.run(_collect(b'{"P": 1', b'0}\n{"P"', b": 2}\n\n", b'{"P": 3}'))
+    assert lines == [b'{"P": 10}', b'{"P": 2}', b'{"P": 3}']
+
+
+def test_over_long_lines_are_replaced_without_buffering_them():
+    lines = asyncio.run(_collect(b"12345678", b"9\nshort\n", b"x" * 20 + b"\nok\n", b"unterminated-and-long", max_line_bytes=8))
+    assert lines == [OVERSIZED_LINE, b"short", OVERSIZED_LINE, b"ok", OVERSIZED_LINE]